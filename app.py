@@ -1,14 +1,26 @@
+import importlib
 import streamlit as st
 
 from core.state import init_state, UserConfig, set_config, reset_workspace, restore_workspace
 from core.pack import build_pack, dumps_pack, loads_pack, validate_pack
-from modules.topic_picker import render_topic_picker
-from modules.plan_builder import render_plan_builder
-from modules.dataset_helper import render_dataset_helper
-from modules.writing_studio import render_writing_studio
-from modules.paper_analyzer import render_paper_analyzer
+from llm.gemini_client import (
+    warm_up, reset_client, client_stats, cache_stats, clear_response_cache, limiter_stats, flight_stats,
+)
+from llm.telemetry import summary_by_family, recent_calls
+from utils.ui_render import collect_finished_jobs
 
 APP_NAME = "DraftWise"
+WARMUP_TTL_S = 600  # re-check the LLM connection at most this often (a failed check is not kept)
+
+# Workspace tabs: label -> (module, render function). Modules are imported on first use,
+# and only the active one runs on a rerun.
+WORKSPACE_TABS = {
+    "Topic Picker": ("modules.topic_picker", "render_topic_picker"),
+    "Plan Builder": ("modules.plan_builder", "render_plan_builder"),
+    "Dataset Helper": ("modules.dataset_helper", "render_dataset_helper"),
+    "Writing Studio": ("modules.writing_studio", "render_writing_studio"),
+    "Paper Analyzer": ("modules.paper_analyzer", "render_paper_analyzer"),
+}
 
 DISCLAIMER = (
     "Ethics notice: DraftWise is meant to guide beginners and reduce overwhelm. "
@@ -18,7 +30,21 @@ DISCLAIMER = (
 
 st.set_page_config(page_title=APP_NAME, layout="wide")
 
+
+@st.cache_resource(show_spinner=False, ttl=WARMUP_TTL_S)
+def _warm_llm_client():
+    # Shared by all sessions: builds the Gemini client and opens its connection.
+    return warm_up()
+
+
 init_state()
+llm_health = _warm_llm_client()
+if not llm_health.get("ok"):
+    # Shown on this run, retried on the next one instead of staying failed for the cache's lifetime.
+    _warm_llm_client.clear()
+if st.session_state.configured:
+    # Only the active tab renders, so results of jobs started in other tabs are stored here first.
+    collect_finished_jobs()
 
 # ----- ONE place only: Disclaimer in SIDEBAR (st.info) -----
 st.sidebar.markdown(f"## {APP_NAME}")
@@ -75,6 +101,49 @@ done("Paper/section analyzed", paper_ok)
 
 st.sidebar.caption(f"Completed: {sum([topic_ok, plan_ok, dataset_ok, writing_ok, paper_ok])}/5")
 
+with st.sidebar.expander("LLM connection", expanded=False):
+    if llm_health.get("ok"):
+        st.write(f"✅ {llm_health['model']} via `{llm_health['provider']}` reachable ({llm_health['latency_ms']} ms warm-up)")
+    else:
+        st.write(f"⚠️ Warm-up failed: {llm_health.get('error', 'unknown error')}")
+    if st.button("Reconnect", key="llm_reconnect"):
+        reset_client()
+        _warm_llm_client.clear()
+        st.rerun()
+    cs = client_stats()
+    st.caption(f"Clients created: {cs['clients_created']} · Requests on current client: {cs['requests']}")
+    rc = cache_stats()
+    if rc:
+        st.caption(
+            f"Response cache: {rc['hits']} hits / {rc['misses']} misses · "
+            f"{rc['entries']} entries, {rc['bytes'] // 1024} KB of {rc['max_bytes'] // (1024 * 1024)} MB"
+        )
+        if st.button("Clear response cache", key="llm_clear_cache"):
+            clear_response_cache()
+            st.rerun()
+    else:
+        st.caption("Response cache: disabled")
+    ls = limiter_stats()
+    st.caption(
+        f"Rate limit: {ls['rpm']} req/min, {ls['tpm']} tok/min · "
+        f"{ls['waits']} throttled calls ({ls['wait_s_total']} s), {ls['retries']} retries"
+    )
+    fs = flight_stats()
+    st.caption(f"Coalesced duplicate requests: {fs['coalesced_total']} · in flight now: {fs['in_flight']}")
+    if fs["waiters_by_key"]:
+        st.caption("Waiters per request key: " + ", ".join(f"`{k}` ×{v}" for k, v in list(fs["waiters_by_key"].items())[-5:]))
+
+if st.sidebar.checkbox("Show LLM diagnostics", value=False, key="show_llm_diagnostics"):
+    with st.sidebar.expander("LLM diagnostics", expanded=True):
+        rows = summary_by_family()
+        if not rows:
+            st.caption("No LLM calls recorded in this process yet.")
+        else:
+            st.caption("Latency / time-to-first-token (ms) per prompt family, recent calls in this process.")
+            st.dataframe(rows, use_container_width=True, hide_index=True)
+            with st.popover("Last 20 calls"):
+                st.dataframe(recent_calls(20)[::-1], use_container_width=True, hide_index=True)
+
 with st.sidebar.expander("Workspace snapshot", expanded=False):
     if not st.session_state.configured:
         st.write("Set up a workspace to see snapshot.")
@@ -165,15 +234,15 @@ else:
         st.write(f"**{cfg['time_days']} days**")
 
     st.write("")
-    tabs = st.tabs(["Topic Picker", "Plan Builder", "Dataset Helper", "Writing Studio", "Paper Analyzer"])
-
-    with tabs[0]:
-        render_topic_picker(cfg)
-    with tabs[1]:
-        render_plan_builder(cfg)
-    with tabs[2]:
-        render_dataset_helper(cfg)
-    with tabs[3]:
-        render_writing_studio(cfg)
-    with tabs[4]:
-        render_paper_analyzer(cfg)
\ No newline at end of file
+    active_tab = st.radio(
+        "Workspace tab",
+        list(WORKSPACE_TABS),
+        horizontal=True,
+        key="active_tab",
+        label_visibility="collapsed",
+    )
+    st.divider()
+
+    module_name, render_name = WORKSPACE_TABS[active_tab]
+    render_tab = getattr(importlib.import_module(module_name), render_name)
+    render_tab(cfg)
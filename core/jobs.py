@@ -0,0 +1,138 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from llm.gemini_client import generate_text_stream, MODEL_DEFAULT
+
+JOB_WORKERS_DEFAULT = 8
+JOB_TTL_S = 3600  # finished jobs nobody collected are dropped after this
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    """
+    One unit of background work. Worker code reports progress with emit() (text) or publish()
+    (named intermediate results) and should check `cancelled` between steps; the UI reads
+    `partial` / `parts` while it runs and `result` once done.
+    """
+
+    def __init__(self, label: str, meta: Optional[dict] = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.label = label
+        self.meta = meta or {}
+        self.status = "queued"  # queued | running | done | error | cancelled
+        self.partial = ""
+        self.parts: Dict[str, object] = {}
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+        self.future = None
+        self._cancel = threading.Event()
+
+    def emit(self, text: str) -> None:
+        self.partial += text
+
+    def publish(self, name: str, value) -> None:
+        self.parts[name] = value
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("done", "error", "cancelled")
+
+
+class JobManager:
+    """
+    Process-wide worker pool for work that must outlive a Streamlit script run.
+    Sessions only keep job ids; the jobs themselves live here until collected or expired.
+    """
+
+    def __init__(self, workers: int):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="draftwise-job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[[Job], object], label: str, meta: Optional[dict] = None) -> str:
+        job = Job(label, meta)
+        with self._lock:
+            self._gc()
+            self._jobs[job.id] = job
+        job.future = self._pool.submit(self._run, job, fn)
+        return job.id
+
+    def _run(self, job: Job, fn) -> None:
+        if job.cancelled:
+            job.status = "cancelled"
+            job.finished = time.time()
+            return
+        job.status = "running"
+        try:
+            job.result = fn(job)
+            job.status = "cancelled" if job.cancelled else "done"
+        except JobCancelled:
+            job.status = "cancelled"
+        except Exception as e:
+            job.error = e
+            job.status = "error"
+        finally:
+            job.finished = time.time()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def pop(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.pop(job_id, None)
+
+    def cancel(self, job_id: str) -> None:
+        job = self.get(job_id)
+        if job is None or job.done:
+            return
+        job._cancel.set()
+        if job.future is not None and job.future.cancel():
+            job.status = "cancelled"
+            job.finished = time.time()
+
+    def _gc(self) -> None:
+        now = time.time()
+        stale = [jid for jid, j in self._jobs.items() if j.finished and now - j.finished > JOB_TTL_S]
+        for jid in stale:
+            del self._jobs[jid]
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager(int(os.getenv("DRAFTWISE_JOB_WORKERS", JOB_WORKERS_DEFAULT)))
+        return _manager
+
+
+def stream_generation(
+    job: Job, prompt: str, family: str, module: str, use_cache: bool = True, model: str = MODEL_DEFAULT
+) -> str:
+    """Job body for a single prompt: streams into job.partial, returns the final stripped text."""
+    gen = generate_text_stream(prompt, model=model, use_cache=use_cache, family=family, module=module)
+    try:
+        for chunk in gen:
+            if job.cancelled:
+                raise JobCancelled()
+            job.emit(chunk)
+    finally:
+        gen.close()
+    return job.partial.strip()
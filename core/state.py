@@ -1,5 +1,6 @@
 import streamlit as st
 from dataclasses import dataclass, asdict
+from core.jobs import get_job_manager
 
 @dataclass
 class UserConfig:
@@ -25,12 +26,22 @@ def init_state():
             "writing": {},
             "paper_analysis": None,
         }
+    if "jobs" not in st.session_state:
+        # slot -> background job id (see core/jobs.py)
+        st.session_state.jobs = {}
 
 def set_config(cfg: UserConfig):
     st.session_state.config = asdict(cfg)
     st.session_state.configured = True
 
 def reset_workspace():
+    for job_id in st.session_state.get("jobs", {}).values():
+        get_job_manager().cancel(job_id)
+    st.session_state.jobs = {}
+    st.session_state.job_handlers = {}
+    st.session_state.job_notices = {}
+    st.session_state.kept_widgets = {}
+    st.session_state.kept_uploads = {}
     st.session_state.configured = False
     st.session_state.config = None
     st.session_state.artifacts = {
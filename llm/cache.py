@@ -0,0 +1,152 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+CACHE_PATH_DEFAULT = os.path.join(".draftwise_cache", "llm_responses.sqlite3")
+CACHE_MAX_MB_DEFAULT = 64
+CACHE_TTL_HOURS_DEFAULT = 72
+
+
+def normalize_prompt(prompt: str) -> str:
+    # Trailing whitespace / blank-line noise should not create separate cache entries.
+    lines = [line.rstrip() for line in (prompt or "").strip().splitlines()]
+    return "\n".join(lines)
+
+
+def cache_key(model: str, prompt: str) -> str:
+    h = hashlib.sha256()
+    h.update(model.encode("utf-8"))
+    h.update(b"\x00")
+    h.update(normalize_prompt(prompt).encode("utf-8"))
+    return h.hexdigest()
+
+
+class ResponseCache:
+    """
+    Disk-backed, content-addressed cache for LLM responses (SQLite).
+    - key: sha256(model + normalized prompt)
+    - TTL: entries older than ttl_s are treated as misses and deleted
+    - size-based LRU: when total stored bytes exceed max_bytes, least recently used rows go first
+    """
+
+    def __init__(self, path: str, max_bytes: int, ttl_s: float):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            d = os.path.dirname(self.path)
+            if d:
+                os.makedirs(d, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses(last_access)")
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            row = db.execute("SELECT text, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            text, created_at = row
+            if now - created_at > self.ttl_s:
+                db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                db.commit()
+                self.misses += 1
+                return None
+            db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            db.commit()
+            self.hits += 1
+            return text
+
+    def put(self, key: str, model: str, text: str) -> None:
+        now = time.time()
+        size = len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO responses (key, model, text, size, created_at, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, text, size, now, now),
+            )
+            self._evict(db, now)
+            db.commit()
+
+    def _evict(self, db: sqlite3.Connection, now: float) -> None:
+        db.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_s,))
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in db.execute("SELECT key, size FROM responses ORDER BY last_access ASC").fetchall():
+            db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self) -> None:
+        with self._lock:
+            db = self._db()
+            db.execute("DELETE FROM responses")
+            db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, total = self._db().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> Optional[ResponseCache]:
+    """
+    Process-wide cache configured from env (after .env is loaded):
+    DRAFTWISE_CACHE=0 disables it; DRAFTWISE_CACHE_PATH, DRAFTWISE_CACHE_MAX_MB, DRAFTWISE_CACHE_TTL_HOURS tune it.
+    """
+    global _cache
+    if os.getenv("DRAFTWISE_CACHE", "1") == "0":
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(
+                path=os.getenv("DRAFTWISE_CACHE_PATH", CACHE_PATH_DEFAULT),
+                max_bytes=int(float(os.getenv("DRAFTWISE_CACHE_MAX_MB", CACHE_MAX_MB_DEFAULT)) * 1024 * 1024),
+                ttl_s=float(os.getenv("DRAFTWISE_CACHE_TTL_HOURS", CACHE_TTL_HOURS_DEFAULT)) * 3600,
+            )
+        return _cache
@@ -1,17 +1,579 @@
 import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, CancelledError, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterator, Optional, Tuple
 from dotenv import load_dotenv
 from google import genai
+from google.genai import errors as genai_errors
+from google.genai import types as genai_types
+from llm.cache import get_cache, cache_key
+from llm.providers import LLMProvider, StubProvider, TransientProviderError, provider_name
+from llm import telemetry
+from llm.telemetry import estimate_tokens
+from llm.singleflight import SingleFlight, FlightAborted
+
+MODEL_DEFAULT = "gemini-2.5-flash-lite"
+MAX_CONCURRENCY_DEFAULT = 4
+
+# Client-side quota (shared by every session in the process). Override via env.
+RPM_DEFAULT = 60
+TPM_DEFAULT = 250_000
+DEADLINE_S_DEFAULT = 120.0
+MAX_OUTPUT_TOKENS_DEFAULT = 8192
+MAX_RETRIES_DEFAULT = 4
+BACKOFF_BASE_S = 1.0
+BACKOFF_CAP_S = 20.0
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class LLMUnavailableError(RuntimeError):
+    """Raised when a call cannot be served within its deadline (quota wait or retries exhausted)."""
+
+
+class _ClientManager:
+    """
+    Process-wide holder for one genai.Client.
+    Credentials are read once; the client's HTTP connection pool is reused by every
+    Streamlit session in this process instead of doing a fresh TLS handshake per call.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._client = None
+        self._env_loaded = False
+        self.clients_created = 0
+        self.requests = 0  # requests served by the current client (httpx keeps its connections alive between them)
+        self.last_health = None
+
+    def load_env(self):
+        with self._lock:
+            if not self._env_loaded:
+                load_dotenv()
+                self._env_loaded = True
+
+    def get(self):
+        self.load_env()
+        with self._lock:
+            if self._client is None:
+                api_key = os.getenv("GOOGLE_API_KEY")
+                if not api_key:
+                    raise RuntimeError("Missing GOOGLE_API_KEY. Put it in a .env file in the project root.")
+                self._client = genai.Client(api_key=api_key)
+                self.clients_created += 1
+                self.requests = 0
+            self.requests += 1
+            return self._client
+
+    def reset(self):
+        # Next get() builds a fresh client (new credentials / connection pool).
+        with self._lock:
+            self._client = None
+            self.last_health = None
+
+    def stats(self) -> dict:
+        return {
+            "clients_created": self.clients_created,
+            "requests": self.requests,
+            "last_health": self.last_health,
+        }
+
+
+_manager = _ClientManager()
 
-MODEL_DEFAULT = "gemini-2.5-flash-lite" 
 
 def get_client():
-    load_dotenv()
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key:
-        raise RuntimeError("Missing GOOGLE_API_KEY. Put it in a .env file in the project root.")
-    return genai.Client(api_key=api_key)
-
-def generate_text(prompt: str, model: str = MODEL_DEFAULT) -> str:
-    client = get_client()
-    resp = client.models.generate_content(model=model, contents=prompt)
-    return (resp.text or "").strip()
\ No newline at end of file
+    return _manager.get()
+
+
+def _fill_usage(usage: Optional[dict], meta) -> None:
+    if usage is None or meta is None:
+        return
+    if getattr(meta, "prompt_token_count", None) is not None:
+        usage["tokens_in"] = meta.prompt_token_count
+    if getattr(meta, "candidates_token_count", None) is not None:
+        usage["tokens_out"] = meta.candidates_token_count
+
+
+def _request_config(timeout_s: Optional[float], max_output_tokens: Optional[int]):
+    # Per-request HTTP timeout (milliseconds), so a hung call cannot outlive the caller's deadline.
+    http = genai_types.HttpOptions(timeout=max(1, int(timeout_s * 1000))) if timeout_s is not None else None
+    return genai_types.GenerateContentConfig(max_output_tokens=max_output_tokens, http_options=http)
+
+
+class GeminiProvider(LLMProvider):
+    name = "gemini"
+
+    def generate(
+        self, prompt: str, model: str, usage: Optional[dict] = None,
+        timeout_s: Optional[float] = None, max_output_tokens: Optional[int] = None,
+    ) -> str:
+        resp = get_client().models.generate_content(
+            model=model, contents=prompt, config=_request_config(timeout_s, max_output_tokens)
+        )
+        _fill_usage(usage, getattr(resp, "usage_metadata", None))
+        return resp.text or ""
+
+    def stream(
+        self, prompt: str, model: str, usage: Optional[dict] = None,
+        timeout_s: Optional[float] = None, max_output_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        config = _request_config(timeout_s, max_output_tokens)
+        for chunk in get_client().models.generate_content_stream(model=model, contents=prompt, config=config):
+            # Usage totals are cumulative; the last chunk carries the final counts.
+            _fill_usage(usage, getattr(chunk, "usage_metadata", None))
+            if chunk.text:
+                yield chunk.text
+
+    def health(self, model: str) -> None:
+        get_client().models.get(model=model)
+
+
+_PROVIDERS = {"gemini": GeminiProvider, "stub": StubProvider}
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_provider() -> LLMProvider:
+    """
+    Backend selected by DRAFTWISE_LLM_PROVIDER (gemini | stub); built once per process.
+    """
+    global _provider
+    _manager.load_env()
+    with _provider_lock:
+        if _provider is None:
+            name = provider_name()
+            if name not in _PROVIDERS:
+                raise RuntimeError(f"Unknown DRAFTWISE_LLM_PROVIDER '{name}'. Use one of: {', '.join(_PROVIDERS)}.")
+            _provider = _PROVIDERS[name]()
+        return _provider
+
+
+def client_stats() -> dict:
+    return _manager.stats()
+
+
+def reset_client() -> None:
+    """Drops the shared client so the next call (or warm-up) reconnects from scratch."""
+    _manager.reset()
+
+
+def cache_stats() -> dict:
+    _manager.load_env()
+    cache = get_cache()
+    return cache.stats() if cache is not None else {}
+
+
+def clear_response_cache() -> None:
+    _manager.load_env()
+    cache = get_cache()
+    if cache is not None:
+        cache.clear()
+
+
+def warm_up(model: str = MODEL_DEFAULT) -> dict:
+    """
+    Health check + warm-up: builds the shared client and opens a connection with a cheap
+    metadata call, so the first real generation does not pay the handshake.
+    Never raises; returns a status dict for the UI.
+    """
+    t0 = time.perf_counter()
+    try:
+        provider = get_provider()
+        provider.health(model)
+        health = {"ok": True, "provider": provider.name, "model": model, "latency_ms": round((time.perf_counter() - t0) * 1000, 1)}
+    except Exception as e:
+        health = {"ok": False, "model": model, "error": str(e)}
+    _manager.last_health = health
+    return health
+
+
+class _RateLimiter:
+    """
+    Two token buckets refilled continuously: requests/minute and estimated tokens/minute.
+    acquire() blocks until both have capacity or the caller's deadline would be missed;
+    release() returns (or, if negative, further charges) tokens once the real usage is known.
+    """
+
+    def __init__(self, rpm: int, tpm: int):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._req = float(rpm)
+        self._tok = float(tpm)
+        self._last = time.monotonic()
+        self._cond = threading.Condition()
+        self.waits = 0
+        self.wait_s_total = 0.0
+
+    def _refill(self, now: float):
+        elapsed = now - self._last
+        self._last = now
+        self._req = min(self.rpm, self._req + elapsed * self.rpm / 60.0)
+        self._tok = min(self.tpm, self._tok + elapsed * self.tpm / 60.0)
+
+    def acquire(self, tokens: int, deadline: float):
+        tokens = min(tokens, self.tpm)
+        t0 = time.monotonic()
+        waited = False
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self._req >= 1 and self._tok >= tokens:
+                    self._req -= 1
+                    self._tok -= tokens
+                    if waited:
+                        self.waits += 1
+                        self.wait_s_total += now - t0
+                    return
+                wait = max(
+                    (1 - self._req) * 60.0 / self.rpm if self._req < 1 else 0.0,
+                    (tokens - self._tok) * 60.0 / self.tpm if self._tok < tokens else 0.0,
+                )
+                if now + wait > deadline:
+                    raise LLMUnavailableError("Rate limit: the request could not be scheduled before its deadline. Try again shortly.")
+                waited = True
+                self._cond.wait(timeout=wait)
+
+    def release(self, tokens: int):
+        with self._cond:
+            self._refill(time.monotonic())
+            self._tok = min(self.tpm, self._tok + tokens)
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            self._refill(time.monotonic())
+            return {
+                "rpm": self.rpm,
+                "tpm": self.tpm,
+                "requests_available": round(self._req, 1),
+                "tokens_available": int(self._tok),
+                "waits": self.waits,
+                "wait_s_total": round(self.wait_s_total, 2),
+            }
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+_retry_count = 0
+
+
+def _get_limiter() -> _RateLimiter:
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = _RateLimiter(
+                rpm=int(os.getenv("DRAFTWISE_RPM", RPM_DEFAULT)),
+                tpm=int(os.getenv("DRAFTWISE_TPM", TPM_DEFAULT)),
+            )
+        return _limiter
+
+
+def limiter_stats() -> dict:
+    _manager.load_env()
+    return {**_get_limiter().stats(), "retries": _retry_count}
+
+
+def _is_retryable(e: Exception) -> bool:
+    if isinstance(e, TransientProviderError):
+        return True
+    if isinstance(e, genai_errors.APIError):
+        return getattr(e, "code", None) in RETRYABLE_STATUS
+    # Transport-level failures (httpx errors are matched by name to avoid a hard import)
+    if isinstance(e, (ConnectionError, TimeoutError)):
+        return True
+    return type(e).__name__ in {"ConnectError", "ReadTimeout", "WriteTimeout", "PoolTimeout", "RemoteProtocolError"}
+
+
+def _max_output_tokens() -> int:
+    return int(os.getenv("DRAFTWISE_MAX_OUTPUT_TOKENS", MAX_OUTPUT_TOKENS_DEFAULT))
+
+
+def _call_with_retries(fn, prompt: str, deadline: float, rec: Optional[dict] = None):
+    """
+    Rate-limited call with jittered exponential backoff on retryable errors.
+    fn(timeout_s) gets the time left before the deadline as its per-request timeout.
+    Each attempt reserves the prompt estimate plus max output tokens; a failed attempt gives the
+    output part back, and _settle_tokens() reconciles a successful one against reported usage.
+    Non-retryable errors propagate unchanged; running out of time/retries raises LLMUnavailableError.
+    """
+    global _retry_count
+    max_retries = int(os.getenv("DRAFTWISE_LLM_MAX_RETRIES", MAX_RETRIES_DEFAULT))
+    limiter = _get_limiter()
+    max_out = _max_output_tokens()
+    tokens = estimate_tokens(prompt) + max_out
+    attempt = 0
+    while True:
+        limiter.acquire(tokens, deadline)
+        remaining = deadline - time.monotonic()
+        try:
+            if remaining <= 0:
+                raise LLMUnavailableError("Generation exceeded its deadline.")
+            result = fn(remaining)
+        except Exception as e:
+            limiter.release(max_out)
+            if not _is_retryable(e):
+                raise
+            delay = random.uniform(0, min(BACKOFF_CAP_S, BACKOFF_BASE_S * (2 ** attempt)))
+            if attempt >= max_retries or time.monotonic() + delay > deadline:
+                raise LLMUnavailableError(f"Gemini is busy or rate-limited ({e}). Please retry in a moment.") from e
+            with _limiter_lock:
+                _retry_count += 1
+            if rec is not None:
+                rec["retries"] += 1
+            attempt += 1
+            time.sleep(delay)
+        else:
+            if rec is not None:
+                rec["tokens_reserved"] = tokens
+            return result
+
+
+def _settle_tokens(rec: dict, text: str) -> None:
+    """Gives back (or charges) the difference between the reservation and the tokens really used."""
+    reserved = rec.pop("tokens_reserved", None)
+    if reserved is None:
+        return
+    used_in = rec.get("tokens_in") or rec.get("est_tokens_in") or 0
+    used_out = rec.get("tokens_out") or estimate_tokens(text)
+    _get_limiter().release(reserved - used_in - used_out)
+
+
+def _cache_key(prompt: str, model: str) -> str:
+    # Provider is part of the key so stub output never answers a real Gemini request.
+    return cache_key(f"{get_provider().name}/{model}", prompt)
+
+
+def _deadline() -> float:
+    return time.monotonic() + float(os.getenv("DRAFTWISE_LLM_DEADLINE_S", DEADLINE_S_DEFAULT))
+
+
+def _generate_once(prompt: str, model: str, rec: dict, timeout_s: float) -> str:
+    return get_provider().generate(
+        prompt, model, usage=rec, timeout_s=timeout_s, max_output_tokens=_max_output_tokens()
+    ).strip()
+
+
+def _open_stream(prompt: str, model: str, rec: dict, timeout_s: float):
+    # Pull the first chunk inside the retry window so connection/quota errors are retried;
+    # once text has been yielded to the UI the stream cannot be restarted transparently.
+    it = iter(get_provider().stream(
+        prompt, model, usage=rec, timeout_s=timeout_s, max_output_tokens=_max_output_tokens()
+    ))
+    for chunk in it:
+        if chunk:
+            return chunk, it
+    return "", it
+
+
+def _cache_lookup(prompt: str, model: str, use_cache: bool, rec: dict):
+    cache = get_cache()
+    key = _cache_key(prompt, model)
+    if cache is None:
+        rec["cache"] = "off"
+    elif not use_cache:
+        rec["cache"] = "bypass"
+    else:
+        hit = cache.get(key)
+        rec["cache"] = "hit" if hit is not None else "miss"
+        if hit is not None:
+            return cache, key, hit
+    return cache, key, None
+
+
+_flights = SingleFlight()
+
+
+def flight_stats() -> dict:
+    return _flights.stats()
+
+
+def _join_flight(key: str, use_cache: bool, family: str, deadline: float, rec: dict):
+    """
+    Registers this request in the single-flight table. Returns (call, is_leader, shared_text):
+    followers block until the identical in-flight request finishes and get its text.
+    If the leader was aborted, the follower proceeds with its own upstream call (call=None).
+    """
+    call, leader = _flights.begin(f"{key}:{int(use_cache)}", f"{family}:{key[:8]}")
+    if leader:
+        return call, True, None
+    try:
+        text = _flights.wait(call, timeout=max(0.0, deadline - time.monotonic()))
+    except FlightAborted:
+        return None, False, None
+    rec["coalesced"] = True
+    return call, False, text
+
+
+def _land_flight(key: str, use_cache: bool, call, text=None, error=None) -> None:
+    if error is not None and not isinstance(error, Exception):
+        error = FlightAborted()
+    _flights.finish(f"{key}:{int(use_cache)}", call, result=text, error=error)
+
+
+def _generate(prompt: str, model: str, use_cache: bool, family: str, module: str) -> str:
+    _manager.load_env()
+    rec = telemetry.start(module, family, model, get_provider().name, prompt)
+    text, error = None, None
+    try:
+        cache, key, text = _cache_lookup(prompt, model, use_cache, rec)
+        if text is not None:
+            return text
+
+        deadline = _deadline()
+        call, leader, text = _join_flight(key, use_cache, family, deadline, rec)
+        if text is not None:
+            return text
+        try:
+            text = _call_with_retries(lambda t: _generate_once(prompt, model, rec, t), prompt, deadline, rec)
+        except BaseException as e:
+            if leader:
+                _land_flight(key, use_cache, call, error=e)
+            raise
+        _settle_tokens(rec, text)
+        if cache is not None and text:
+            cache.put(key, model, text)
+        if leader:
+            _land_flight(key, use_cache, call, text=text)
+        return text
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        telemetry.finish(rec, text, error)
+
+
+def _stream(prompt: str, model: str, use_cache: bool, family: str, module: str) -> Iterator[str]:
+    _manager.load_env()
+    rec = telemetry.start(module, family, model, get_provider().name, prompt)
+    text, error = None, None
+    try:
+        cache, key, hit = _cache_lookup(prompt, model, use_cache, rec)
+        if hit is not None:
+            telemetry.mark_first_token(rec)
+            text = hit
+            yield hit
+            return
+
+        deadline = _deadline()
+        call, leader, shared = _join_flight(key, use_cache, family, deadline, rec)
+        if shared is not None:
+            # An identical request was already streaming elsewhere: show its final text at once.
+            telemetry.mark_first_token(rec)
+            text = shared
+            yield shared
+            return
+
+        parts = []
+        try:
+            first, rest = _call_with_retries(lambda t: _open_stream(prompt, model, rec, t), prompt, deadline, rec)
+            parts.append(first)
+            if first:
+                telemetry.mark_first_token(rec)
+                yield first
+            for chunk in rest:
+                if time.monotonic() > deadline:
+                    raise LLMUnavailableError("Generation exceeded its deadline.")
+                if chunk:
+                    parts.append(chunk)
+                    yield chunk
+        except BaseException as e:
+            # Includes GeneratorExit when a rerun abandons the stream; waiters then retry on their own.
+            if leader:
+                _land_flight(key, use_cache, call, error=e)
+            raise
+        finally:
+            _settle_tokens(rec, "".join(parts))
+
+        text = "".join(parts).strip()
+        if cache is not None and text:
+            cache.put(key, model, text)
+        if leader:
+            _land_flight(key, use_cache, call, text=text)
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        telemetry.finish(rec, text, error)
+
+
+def generate_text(
+    prompt: str,
+    model: str = MODEL_DEFAULT,
+    use_cache: bool = True,
+    family: str = "other",
+    module: Optional[str] = None,
+) -> str:
+    """
+    use_cache=False skips the lookup (Regenerate buttons) but still stores the fresh answer.
+    Upstream calls go through the shared rate limiter and retry/backoff layer.
+    `family` tags the prompt type (plan, topics, section, ...) in the call log; `module` overrides
+    the detected caller (background jobs run off the caller's stack).
+    """
+    return _generate(prompt, model, use_cache, family, module or telemetry.caller_module())
+
+
+def generate_text_stream(
+    prompt: str,
+    model: str = MODEL_DEFAULT,
+    use_cache: bool = True,
+    family: str = "other",
+    module: Optional[str] = None,
+) -> Iterator[str]:
+    """
+    Streaming variant of generate_text: yields text chunks as the model produces them.
+    Join the chunks and strip to get the same string generate_text would return.
+    A cache hit is yielded as a single chunk.
+    """
+    # Resolve the caller now: the generator body runs under whoever iterates it.
+    return _stream(prompt, model, use_cache, family, module or telemetry.caller_module())
+
+
+def generate_many(
+    prompts: Dict[str, str],
+    model: str = MODEL_DEFAULT,
+    max_workers: Optional[int] = None,
+    use_cache: bool = True,
+    family: str = "other",
+    module: Optional[str] = None,
+    cancelled: Optional[Callable[[], bool]] = None,
+) -> Iterator[Tuple[str, Optional[str], Optional[Exception]]]:
+    """
+    Runs several independent prompts concurrently on a bounded thread pool.
+    Yields (key, text, error) in completion order; one failure does not cancel the others.
+    Concurrency: max_workers, else DRAFTWISE_MAX_CONCURRENCY, else MAX_CONCURRENCY_DEFAULT.
+    When `cancelled()` turns true (checked by workers before each call and between results), or the
+    generator is closed, queued prompts are dropped and the generator returns without waiting for
+    calls already in flight.
+    """
+    if not prompts:
+        return
+    _manager.load_env()
+    if max_workers is None:
+        max_workers = int(os.getenv("DRAFTWISE_MAX_CONCURRENCY", MAX_CONCURRENCY_DEFAULT))
+    workers = max(1, min(max_workers, len(prompts)))
+    module = module or telemetry.caller_module()
+    stop = cancelled or (lambda: False)
+
+    def run(prompt: str) -> str:
+        if stop():
+            raise CancelledError()
+        return _generate(prompt, model, use_cache, family, module)
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="draftwise-llm")
+    try:
+        futures = {pool.submit(run, prompt): key for key, prompt in prompts.items()}
+        pending = set(futures)
+        while pending and not stop():
+            done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+            for fut in done:
+                key = futures[fut]
+                try:
+                    yield key, fut.result(), None
+                except Exception as e:
+                    yield key, None, e
+    finally:
+        # No `with` block: its exit would wait for every queued and in-flight request.
+        pool.shutdown(wait=False, cancel_futures=True)
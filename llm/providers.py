@@ -0,0 +1,219 @@
+import hashlib
+import os
+import random
+import re
+import threading
+import time
+from typing import Iterator, Optional
+
+PROVIDER_DEFAULT = "gemini"
+
+
+class TransientProviderError(RuntimeError):
+    """A retryable backend failure (treated like a 429/503 by the retry layer)."""
+
+
+class LLMProvider:
+    """
+    Minimal backend interface used by llm/gemini_client.py.
+    generate() returns the full (unstripped) text; stream() yields text chunks.
+    If `usage` is given, backends fill in "tokens_in" / "tokens_out" when they know them.
+    `timeout_s` bounds the request itself (connect, first byte, gaps between chunks) and
+    `max_output_tokens` caps the answer; both are None when unset.
+    """
+
+    name = "base"
+
+    def generate(
+        self, prompt: str, model: str, usage: Optional[dict] = None,
+        timeout_s: Optional[float] = None, max_output_tokens: Optional[int] = None,
+    ) -> str:
+        raise NotImplementedError
+
+    def stream(
+        self, prompt: str, model: str, usage: Optional[dict] = None,
+        timeout_s: Optional[float] = None, max_output_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        raise NotImplementedError
+
+    def health(self, model: str) -> None:
+        """Cheap call that raises if the backend is unusable."""
+        raise NotImplementedError
+
+
+def provider_name() -> str:
+    return os.getenv("DRAFTWISE_LLM_PROVIDER", PROVIDER_DEFAULT).strip().lower()
+
+
+# -----------------------------
+# Deterministic local stub
+# -----------------------------
+def _field(prompt: str, label: str, default: str = "") -> str:
+    m = re.search(rf"^- {re.escape(label)}:\s*(.+)$", prompt, re.MULTILINE)
+    return m.group(1).strip() if m else default
+
+
+def _budget_header(topic: str) -> str:
+    return "\n".join([
+        "## TL;DR (read this only)",
+        f"- Scope the work on **{topic}** to one baseline and one bounded improvement.",
+        "- Use a public dataset and a fixed train/val/test split.",
+        "- Report one primary metric with [RESULTS_TBD] placeholders.",
+        "",
+        "## Next actions",
+        "- Confirm the dataset and split.",
+        "- Run the baseline end-to-end.",
+        "- Write the setup section while experiments run.",
+        "",
+        "## Risks",
+        "- Leakage across splits.",
+        "- Scope creep beyond the time window.",
+    ])
+
+
+def _stub_topics(prompt: str, seed: int) -> str:
+    track = _field(prompt, "Track", "CS")
+    n_ideas = 3 + seed % 3
+    blocks = [_budget_header(track), ""]
+    for n in range(1, n_ideas + 1):
+        blocks += [
+            f"### Idea {n}: {track} baseline study variant {n}",
+            "**Problem (1–2 lines):**",
+            f"- Measure how a lightweight method performs on a {track} task (variant {n}).",
+            "**Dataset / Source options (1–3):**",
+            "- [DATASET_NAME_TBD]",
+            "**Baseline:**",
+            "- Logistic regression",
+            "**Proposed improvement:**",
+            "- One controlled feature or preprocessing change",
+            "**What you will submit (2–4 deliverables):**",
+            "- Code repository",
+            "- Short report",
+            f"**Risk:** {['Low', 'Medium', 'High'][(seed + n) % 3]}",
+            "**Why it fits your scope (1–2 lines):**",
+            "- Small data, one baseline, one ablation.",
+            "",
+        ]
+    blocks += [f"**Recommended idea:** Idea {1 + seed % n_ideas}", "**Reason (2–3 lines):** Lowest risk for the time window."]
+    return "\n".join(blocks)
+
+
+def _stub_options(prompt: str, seed: int) -> str:
+    lines = []
+    for n in range(1, 6):
+        lines += [
+            f"### Option {n}: Public benchmark dataset {n}",
+            "- What it enables (1 line): a clean supervised baseline.",
+            "- Why it's feasible (1 line): small and well documented.",
+            "- Baseline (finishable in 1 day): logistic regression.",
+            "- One bounded \"research contribution\" angle: feature ablation.",
+            "- Main risk (leakage/imbalance/licensing/noise): class imbalance.",
+            "- Mitigation (1 line): stratified split and macro-F1.",
+            "",
+        ]
+    lines += [f"**Recommendation:** Option {1 + seed % 5}", "**Reason (2–3 lines):** Smallest setup cost."]
+    return "\n".join(lines)
+
+
+def _stub_feasibility(prompt: str, seed: int) -> str:
+    status = ["Green", "Yellow", "Red"][seed % 3]
+    return "\n".join([
+        "## Feasibility verdict",
+        f"**Status:** {status}",
+        "**One-line reason:** Stub verdict for offline runs.",
+        "",
+        "## Score breakdown (0–2 each, total /10)",
+        "- Clarity: 2",
+        "- Data feasibility: 1",
+        "- Evaluation feasibility: 2",
+        "- Scope fit: 1",
+        "- Execution risk: 1",
+        "**Total:** 7/10",
+    ])
+
+
+def _stub_generic(prompt: str, seed: int) -> str:
+    topic = _field(prompt, "Track", "the selected topic")
+    body = [_budget_header(topic), ""]
+    # A few filler sections so long-output paths (plans, paper analysis) have realistic size.
+    for k in range(1, 4 + seed % 4):
+        body += [f"## Details {k}", f"- Placeholder point {k}.1 [CITATION_TBD]", f"- Placeholder point {k}.2 [RESULTS_TBD]", ""]
+    return "\n".join(body).strip()
+
+
+def stub_response(prompt: str) -> str:
+    seed = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8], 16)
+    if "### Idea <n>" in prompt:
+        return _stub_topics(prompt, seed)
+    if "### Option <n>" in prompt:
+        return _stub_options(prompt, seed)
+    if "## Feasibility verdict" in prompt:
+        return _stub_feasibility(prompt, seed)
+    return _stub_generic(prompt, seed)
+
+
+class StubProvider(LLMProvider):
+    """
+    Offline backend: schema-shaped markdown per prompt family, identical for identical prompts.
+    Env knobs: DRAFTWISE_STUB_LATENCY_MS (mean total latency), DRAFTWISE_STUB_ERROR_RATE (0..1),
+    DRAFTWISE_STUB_SEED (makes the latency/error sequence repeatable). A latency longer than the
+    request's timeout_s ends in TimeoutError after timeout_s, like a hung HTTP call.
+    """
+
+    name = "stub"
+
+    def __init__(self):
+        self.latency_s = float(os.getenv("DRAFTWISE_STUB_LATENCY_MS", "0")) / 1000.0
+        self.error_rate = float(os.getenv("DRAFTWISE_STUB_ERROR_RATE", "0"))
+        self._rng = random.Random(int(os.getenv("DRAFTWISE_STUB_SEED", "0")))
+        self._lock = threading.Lock()
+
+    def _roll(self):
+        with self._lock:
+            fail = self._rng.random() < self.error_rate
+            latency = self.latency_s * self._rng.uniform(0.5, 1.5)
+        return fail, latency
+
+    @staticmethod
+    def _usage(usage: Optional[dict], prompt: str, text: str):
+        if usage is not None:
+            usage["tokens_in"] = max(1, len(prompt) // 4)
+            usage["tokens_out"] = max(1, len(text) // 4)
+
+    @staticmethod
+    def _wait(seconds: float, timeout_s: Optional[float]) -> None:
+        if timeout_s is not None and seconds > timeout_s:
+            time.sleep(timeout_s)
+            raise TimeoutError("Stub provider: simulated request timeout.")
+        time.sleep(seconds)
+
+    def generate(
+        self, prompt: str, model: str, usage: Optional[dict] = None,
+        timeout_s: Optional[float] = None, max_output_tokens: Optional[int] = None,
+    ) -> str:
+        fail, latency = self._roll()
+        self._wait(latency, timeout_s)
+        if fail:
+            raise TransientProviderError("Stub provider: simulated transient failure.")
+        text = stub_response(prompt)
+        self._usage(usage, prompt, text)
+        return text
+
+    def stream(
+        self, prompt: str, model: str, usage: Optional[dict] = None,
+        timeout_s: Optional[float] = None, max_output_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        fail, latency = self._roll()
+        text = stub_response(prompt)
+        self._usage(usage, prompt, text)
+        chunks = [text[i:i + 80] for i in range(0, len(text), 80)] or [""]
+        per_chunk = latency / len(chunks)
+        self._wait(per_chunk, timeout_s)
+        if fail:
+            raise TransientProviderError("Stub provider: simulated transient failure.")
+        for chunk in chunks:
+            yield chunk
+            self._wait(per_chunk, timeout_s)
+
+    def health(self, model: str) -> None:
+        return None
@@ -0,0 +1,74 @@
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+KEY_HISTORY_MAX = 200
+
+
+class FlightAborted(Exception):
+    """The leading call went away without a result (e.g. its stream was closed by a rerun)."""
+
+
+class _Call:
+    def __init__(self, label: str):
+        self.label = label
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Process-wide de-duplication of identical in-flight requests.
+    The first caller for a key becomes the leader and does the upstream work; concurrent callers
+    with the same key wait for the leader and share its result (or its exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.coalesced_total = 0
+        self._key_waiters = OrderedDict()
+
+    def begin(self, key: str, label: str = ""):
+        """Returns (call, is_leader). A leader must call finish() exactly once."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced_total += 1
+                self._key_waiters[call.label] = self._key_waiters.get(call.label, 0) + 1
+                self._key_waiters.move_to_end(call.label)
+                while len(self._key_waiters) > KEY_HISTORY_MAX:
+                    self._key_waiters.popitem(last=False)
+                return call, False
+            call = _Call(label or key[:12])
+            self._calls[key] = call
+            return call, True
+
+    def finish(self, key: str, call: _Call, result=None, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        call.result = result
+        call.error = error
+        call.done.set()
+
+    def wait(self, call: _Call, timeout: Optional[float] = None):
+        if not call.done.wait(timeout):
+            raise TimeoutError("Timed out waiting for an identical in-flight request.")
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def stats(self) -> dict:
+        with self._lock:
+            in_flight = {c.label: c.waiters for c in self._calls.values()}
+            history = dict(self._key_waiters)
+        return {
+            "in_flight": len(in_flight),
+            "in_flight_waiters": in_flight,
+            "coalesced_total": self.coalesced_total,
+            "waiters_by_key": history,
+        }
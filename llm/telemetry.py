@@ -0,0 +1,126 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+LOG_PATH_DEFAULT = os.path.join(".draftwise_cache", "llm_calls.jsonl")
+RECENT_MAX = 2000
+
+_recent = deque(maxlen=RECENT_MAX)
+_lock = threading.Lock()
+
+
+def estimate_tokens(text: str) -> int:
+    # Rough heuristic (~4 chars/token) — good enough for client-side budgeting.
+    return max(1, len(text or "") // 4)
+
+
+def caller_module() -> str:
+    """First module on the stack outside llm/* (e.g. 'modules.plan_builder')."""
+    f = sys._getframe(1)
+    while f is not None and f.f_globals.get("__name__", "").startswith("llm."):
+        f = f.f_back
+    return f.f_globals.get("__name__", "?") if f is not None else "?"
+
+
+def start(module: str, family: str, model: str, provider: str, prompt: str) -> dict:
+    return {
+        "ts": datetime.now(timezone.utc).isoformat(),
+        "module": module,
+        "family": family,
+        "model": model,
+        "provider": provider,
+        "prompt_chars": len(prompt),
+        "est_tokens_in": estimate_tokens(prompt),
+        "est_tokens_out": None,
+        "tokens_in": None,
+        "tokens_out": None,
+        "ttft_ms": None,
+        "latency_ms": None,
+        "retries": 0,
+        "cache": None,
+        "coalesced": False,
+        "ok": True,
+        "error": None,
+        "_t0": time.perf_counter(),
+    }
+
+
+def mark_first_token(rec: dict) -> None:
+    if rec["ttft_ms"] is None:
+        rec["ttft_ms"] = round((time.perf_counter() - rec["_t0"]) * 1000, 1)
+
+
+def finish(rec: dict, output: Optional[str] = None, error: Optional[Exception] = None) -> None:
+    rec["latency_ms"] = round((time.perf_counter() - rec.pop("_t0")) * 1000, 1)
+    if output is not None:
+        rec["est_tokens_out"] = estimate_tokens(output)
+        if rec["ttft_ms"] is None:
+            # Non-streaming call: the first token arrives with the whole response.
+            rec["ttft_ms"] = rec["latency_ms"]
+    if error is not None:
+        rec["ok"] = False
+        rec["error"] = f"{type(error).__name__}: {error}"[:300]
+
+    with _lock:
+        _recent.append(rec)
+        path = os.getenv("DRAFTWISE_LLM_LOG", LOG_PATH_DEFAULT)
+        if path and path != "0":
+            try:
+                d = os.path.dirname(path)
+                if d:
+                    os.makedirs(d, exist_ok=True)
+                with open(path, "a", encoding="utf-8") as fh:
+                    fh.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            except OSError:
+                # Diagnostics must never break generation.
+                pass
+
+
+def _pct(values: List[float], q: float) -> Optional[float]:
+    vals = sorted(v for v in values if v is not None)
+    if not vals:
+        return None
+    idx = min(len(vals) - 1, max(0, int(round(q * (len(vals) - 1)))))
+    return vals[idx]
+
+
+def summary_by_family() -> List[Dict]:
+    """p50/p95 latency and TTFT plus token/cache/retry totals per prompt family (recent calls)."""
+    with _lock:
+        recs = list(_recent)
+    fams: Dict[str, List[dict]] = {}
+    for r in recs:
+        fams.setdefault(r["family"], []).append(r)
+
+    rows = []
+    for fam, rs in sorted(fams.items()):
+        lat = [r["latency_ms"] for r in rs]
+        ttft = [r["ttft_ms"] for r in rs]
+        tin = [r["tokens_in"] if r["tokens_in"] is not None else r["est_tokens_in"] for r in rs]
+        tout = [r["tokens_out"] if r["tokens_out"] is not None else (r["est_tokens_out"] or 0) for r in rs]
+        rows.append({
+            "family": fam,
+            "calls": len(rs),
+            "errors": sum(1 for r in rs if not r["ok"]),
+            "cache_hits": sum(1 for r in rs if r["cache"] == "hit"),
+            "coalesced": sum(1 for r in rs if r.get("coalesced")),
+            "retries": sum(r["retries"] for r in rs),
+            "p50_ms": _pct(lat, 0.5),
+            "p95_ms": _pct(lat, 0.95),
+            "p50_ttft_ms": _pct(ttft, 0.5),
+            "p95_ttft_ms": _pct(ttft, 0.95),
+            "avg_prompt_chars": round(sum(r["prompt_chars"] for r in rs) / len(rs)),
+            "avg_tokens_in": round(sum(tin) / len(rs)),
+            "avg_tokens_out": round(sum(tout) / len(rs)),
+        })
+    return rows
+
+
+def recent_calls(n: int = 50) -> List[Dict]:
+    with _lock:
+        return list(_recent)[-n:]
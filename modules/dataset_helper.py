@@ -1,56 +1,628 @@
+import hashlib
+import os
+import tempfile
+import time
+from typing import List, Optional
 import streamlit as st
 import pandas as pd
-import numpy as np
-from llm.gemini_client import generate_text, MODEL_DEFAULT
+from core.jobs import JobCancelled, get_job_manager
+from llm.gemini_client import generate_text_stream, MODEL_DEFAULT
+from profiling.frame_cache import SessionLRU, get_frame_cache
+from profiling.chunked import profile_csv_chunked, CHUNK_ROWS_DEFAULT
+from profiling.columnar import (
+    IPC_EXTS,
+    PARQUET_EXTS,
+    columnar_available,
+    columnar_kind,
+    columnar_metadata,
+    iter_columnar_chunks,
+    profile_columnar_chunked,
+    read_columnar,
+)
+from profiling.compact import compact_frame, read_csv_compact
+from profiling.duck import DuckDataset, duckdb_available
+from profiling.duplicates import near_duplicates
+from profiling.leakage import leakage_scan, resolve_target
+from profiling.multifile import profile_uploads
+from profiling.progressive import PROFILE_GROUPS, iter_profile_groups
+from profiling.sampling import SAMPLE_ROWS_DEFAULT, sample_profile, sample_profile_csv
+from profiling.semantic import group_by_type
+from profiling.splits import export_splits, plan_splits
+from profiling.target import TargetProfiler, target_analysis
+from utils.ui_render import keep, kept_uploader, render_stream
 
 
 # -----------------------------
 # Local profiling (no AI needed)
 # -----------------------------
-def _basic_profile(df: pd.DataFrame) -> dict:
-    n_rows, n_cols = df.shape
-
-    dtypes = df.dtypes.astype(str).to_dict()
-    missing_pct = (df.isna().mean() * 100).round(2).to_dict()
-    dup_rows = int(df.duplicated().sum())
-    nunique = df.nunique(dropna=True).to_dict()
-
-    num_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-    cat_cols = [c for c in df.columns if c not in num_cols]
-
-    likely_id = []
-    if n_rows >= 50:
-        for c in df.columns:
-            if nunique.get(c, 0) >= 0.98 * n_rows:
-                likely_id.append(c)
-
-    top_missing = sorted(missing_pct.items(), key=lambda x: x[1], reverse=True)[:15]
-    return {
-        "shape": (n_rows, n_cols),
-        "dtypes": dtypes,
-        "missing_pct": missing_pct,
-        "top_missing": top_missing,
-        "dup_rows": dup_rows,
-        "num_cols": num_cols,
-        "cat_cols": cat_cols,
-        "likely_id": likely_id,
-    }
-
-
-def _local_csv_report(cfg: dict, profile: dict, target_hint: str) -> str:
+SESSION_MEMO_MAX = 4  # uploads (or upload x target) whose results each session memo keeps
+
+
+def _session_memo(name: str, on_evict=None) -> SessionLRU:
+    """Per-session memo bounded to the SESSION_MEMO_MAX most recently used keys."""
+    memo = st.session_state.get(name)
+    if not isinstance(memo, SessionLRU):
+        memo = st.session_state[name] = SessionLRU(SESSION_MEMO_MAX, on_evict)
+    return memo
+
+
+def _close_duck(value) -> None:
+    value[0].close()
+
+
+def _remove_export(value) -> None:
+    if os.path.exists(value["path"]):
+        os.remove(value["path"])
+
+
+def _upload_digest(up) -> str:
+    # Content hash of the upload, computed once per uploaded file (file_id) per session.
+    memo = _session_memo("upload_digests")
+    file_id = getattr(up, "file_id", None)
+    if file_id and file_id in memo:
+        return memo[file_id]
+    digest = hashlib.sha256(up.getbuffer()).hexdigest()
+    if file_id:
+        memo[file_id] = digest
+    return digest
+
+
+LARGE_FILE_MB = 200  # uploads at/above this size default to chunked profiling
+
+
+def _chunked_profile(
+    up, key: str, kind: Optional[str] = None, columns: Optional[List[str]] = None, fast: bool = False
+):
+    """
+    Out-of-core path: streams the upload in chunks; memoized per session by content hash (+ columns).
+    fast=True keeps only a bounded row sample and returns estimates with confidence intervals.
+    """
+    memo = _session_memo("sampled_profiles" if fast else "chunked_profiles")
+    if key not in memo:
+        chunk_rows = int(os.getenv("DRAFTWISE_CHUNK_ROWS", CHUNK_ROWS_DEFAULT))
+        label = "Sampling" if fast else "Profiling in chunks"
+        bar = st.progress(0.0, text=f"{label}...")
+
+        def report(rows: int, frac: float):
+            bar.progress(frac, text=f"{label}... {rows:,} rows")
+
+        try:
+            if fast:
+                sample_rows = int(os.getenv("DRAFTWISE_SAMPLE_ROWS", SAMPLE_ROWS_DEFAULT))
+                if kind:
+                    total, chunks = iter_columnar_chunks(up, kind, columns=columns, chunk_rows=chunk_rows)
+                    profile, preview, prof = sample_profile(
+                        chunks, total_rows=total, sample_rows=sample_rows, progress=report
+                    )
+                else:
+                    profile, preview, prof = sample_profile_csv(
+                        up, sample_rows=sample_rows, chunk_rows=chunk_rows, progress=report
+                    )
+                # The bounded sample backs checks that need rows (e.g. leakage) in fast mode.
+                _session_memo("sample_frames")[key] = prof.sample
+            elif kind:
+                profile, preview, _ = profile_columnar_chunked(
+                    up, kind, columns=columns, chunk_rows=chunk_rows, progress=report
+                )
+            else:
+                up.seek(0)
+                profile, preview, _ = profile_csv_chunked(up, chunk_rows=chunk_rows, progress=report)
+        except Exception as e:
+            bar.empty()
+            st.error(f"Could not read file: {e}")
+            st.stop()
+        bar.empty()
+        memo[key] = (profile, preview)
+    return memo[key]
+
+
+def _duck_profile(up, key: str, kind: Optional[str], columns: Optional[List[str]]):
+    """SQL path: the upload goes into a temporary DuckDB database; memoized per session with its profile."""
+    memo = _session_memo("duck_datasets", _close_duck)
+    if key not in memo:
+        with st.status("Loading into DuckDB and profiling with SQL...", expanded=False) as status:
+            try:
+                ds = DuckDataset(up, kind, columns)
+                profile, preview = ds.profile(), ds.preview()
+            except Exception as e:
+                status.update(label="Failed to load dataset.", state="error", expanded=True)
+                st.error(f"Could not read file: {e}")
+                st.stop()
+            status.update(label="Profiled with DuckDB.", state="complete", expanded=False)
+        memo[key] = (ds, profile, preview)
+    return memo[key]
+
+
+def _profile_job(job, entry) -> dict:
+    """Job body: publishes each metric group as it completes, then memoizes the profile on the frame."""
+    profile = {}
+    for name, part in iter_profile_groups(entry.df):
+        if job.cancelled:
+            raise JobCancelled()
+        job.publish(name, part)
+        profile.update(part)
+    entry.results["stats"] = profile.pop("column_stats")
+    entry.results["basic"] = profile
+    return profile
+
+
+def _background_profile(entry) -> Optional[str]:
+    """
+    Id of the background job profiling `entry` (started on first call), or None once its results are
+    memoized. The id is kept on the shared frame entry, so sessions opening the same file share one job.
+    """
+    if "basic" in entry.results and "stats" in entry.results:
+        return None
+    manager = get_job_manager()
+    job = manager.get(entry.results.get("profile_job", ""))
+    if job is not None and job.status == "error":
+        entry.results.pop("profile_job", None)  # the next run starts a fresh job
+        st.error(f"Profiling failed: {job.error}")
+        st.stop()
+    if job is None or job.status == "cancelled":
+        entry.results["profile_job"] = manager.submit(
+            lambda j: _profile_job(j, entry), label="Profiling dataset", meta={"digest": entry.digest}
+        )
+    return entry.results["profile_job"]
+
+
+@st.fragment(run_every=1.0)
+def _profile_panel(job_id: str, entry, kind: Optional[str]):
+    job = get_job_manager().get(job_id)
+    if job is None or job.done:
+        # Full rerun so the page picks up the memoized profile (or reports the error).
+        st.rerun()
+    profile = {}
+    for part in list(job.parts.values()):
+        profile.update(part)
+    pending = [label for name, label in PROFILE_GROUPS if name not in job.parts]
+    with st.expander("Basic stats", expanded=True):
+        st.caption(f"⏳ Still computing: {', '.join(pending)} ({int(time.time() - job.created)} s)")
+        _render_basic_stats(profile, profile.get("column_stats", {}), entry=entry, kind=kind)
+
+
+def _leakage(profile: dict, target: str, entry=None, sample_key: Optional[str] = None) -> Optional[dict]:
+    """Leakage scan on the in-memory frame (memoized with it) or on the fast-mode sample."""
+    if entry is not None:
+        return get_frame_cache().memo(
+            entry, ("leakage", target), lambda: leakage_scan(entry.df, target, likely_id=profile["likely_id"])
+        )
+    sample = _session_memo("sample_frames").get(sample_key)
+    if sample is None or target not in sample.columns:
+        return None
+    memo = _session_memo("sample_leakage")
+    if (sample_key, target) not in memo:
+        memo[(sample_key, target)] = leakage_scan(sample, target, likely_id=profile["likely_id"])
+    return memo[(sample_key, target)]
+
+
+def _target(target: str, key: str, entry=None, chunks=None, fast: bool = False) -> Optional[dict]:
+    """
+    Target analysis on the in-memory frame (memoized with it), the fast-mode sample, or one streamed
+    pass over the chunks (memoized per session by content hash, target and mode).
+    """
+    if entry is not None:
+        return get_frame_cache().memo(entry, ("target", target), lambda: target_analysis(entry.df, target))
+    memo = _session_memo("target_analyses")
+    if (key, target, fast) not in memo:
+        if fast:
+            sample = _session_memo("sample_frames").get(key)
+            if sample is None or target not in sample.columns:
+                return None
+            result = target_analysis(sample, target)
+            result["estimated_from_sample"] = True
+        else:
+            prof = TargetProfiler(target)
+            for chunk in chunks():
+                prof.update(chunk)
+            result = prof.result()
+        memo[(key, target, fast)] = result
+    return memo[(key, target, fast)]
+
+
+def _render_target(info: dict):
+    """Body of the "Target analysis" expander."""
+    rows = info["rows"] - info["missing_target"]
+    note = " (fast-estimate sample)" if info.get("estimated_from_sample") else ""
+    if info.get("note"):
+        st.info(f"Target analysis skipped: {info['note']}.")
+        return
+    if info["task"] == "regression":
+        d = info["distribution"]
+        st.write(f"Regression target on {rows:,} rows{note}; {info['missing_target_pct']}% of rows have no target.")
+        q = d.get("q") or [None] * 5
+        st.dataframe(
+            pd.DataFrame([{
+                "min": d.get("min"), "p25": q[1], "median": q[2], "p75": q[3], "max": d.get("max"),
+                "mean": d.get("mean"), "std": d.get("std"), "distribution": d.get("hist"),
+            }]),
+            use_container_width=True,
+            hide_index=True,
+            column_config={"distribution": st.column_config.BarChartColumn("distribution")},
+        )
+        return
+
+    if info["n_classes"] is None:
+        st.write(
+            f"More than {info['classes_over']} distinct target values on {rows:,} rows{note}; "
+            "per-class summaries are skipped. Is this the label column?"
+        )
+        return
+    st.write(
+        f"{info['n_classes']} classes on {rows:,} rows{note}; imbalance ratio (largest / smallest class) "
+        f"**{info.get('imbalance_ratio', 0)}**, majority-class accuracy {info.get('majority_baseline_accuracy', 0):.1%}; "
+        f"{info['missing_target_pct']}% of rows have no target."
+    )
+    st.dataframe(pd.DataFrame(info["classes"]), use_container_width=True, hide_index=True)
+    if info.get("missing_by_class"):
+        st.write("Missingness that differs by class (% missing per class):")
+        st.dataframe(
+            pd.DataFrame([{"feature": m["feature"], **m["missing_pct"]} for m in info["missing_by_class"]]),
+            use_container_width=True,
+            hide_index=True,
+        )
+    if info.get("feature_by_class"):
+        st.write("Numeric features by class (mean per class; separation = spread of class means in pooled std):")
+        st.dataframe(
+            pd.DataFrame([
+                {"feature": f["feature"], "separation": f["separation"], **f["mean_by_class"]}
+                for f in info["feature_by_class"]
+            ]),
+            use_container_width=True,
+            hide_index=True,
+        )
+    elif "missing_by_class" not in info:
+        st.caption("Too many classes for per-class summaries.")
+
+
+def _stats_tables(stats: dict):
+    """(numeric, categorical) display frames; histograms render as sparkline bar charts."""
+    num_rows, cat_rows = [], []
+    for c, s in stats.items():
+        if s["kind"] == "numeric" and s.get("count"):
+            q = s.get("q") or [None] * 5
+            num_rows.append({
+                "column": c, "min": s["min"], "p25": q[1], "median": q[2], "p75": q[3], "max": s["max"],
+                "mean": s["mean"], "std": s["std"], "distribution": s["hist"],
+            })
+        elif s["kind"] == "categorical" and s["top"]:
+            cat_rows.append({
+                "column": c,
+                "top values": ", ".join(f"{v} ({n:,})" for v, n in s["top"]),
+                "top share": [n for _, n in s["top"]],
+            })
+    return pd.DataFrame(num_rows), pd.DataFrame(cat_rows)
+
+
+def _compact_stats(stats: dict, max_cols: int = 25) -> dict:
+    """Prompt-sized subset: summary numbers without histograms, first max_cols columns."""
+    out = {}
+    for c, s in list(stats.items())[:max_cols]:
+        out[c] = {k: v for k, v in s.items() if k not in ("hist", "kind")} if s["kind"] == "numeric" else {"top": s["top"][:3]}
+    return out
+
+
+def _compact_target(info: dict) -> dict:
+    """Prompt-sized target analysis: top classes and features only, no histogram."""
+    out = {k: v for k, v in info.items() if k not in ("classes", "distribution", "missing_by_class", "feature_by_class")}
+    if info["task"] == "regression":
+        out["distribution"] = {k: v for k, v in info["distribution"].items() if k not in ("hist", "kind")}
+    else:
+        out["classes"] = info["classes"][:10]
+        out["missing_by_class"] = (info.get("missing_by_class") or [])[:5]
+        out["feature_by_class"] = (info.get("feature_by_class") or [])[:5]
+    return out
+
+
+def _upgrade_to_exact():
+    st.session_state["dataset_fast_estimate"] = False
+
+
+def _render_basic_stats(profile: dict, col_stats: dict, est: Optional[dict] = None, entry=None, kind=None):
+    """Body of the "Basic stats" expander. Groups missing from a partial profile are skipped."""
+    if "shape" not in profile:
+        return
+    n_rows, n_cols = profile["shape"]
+    a, b, c = st.columns(3)
+    a.metric("Rows", n_rows)
+    b.metric("Columns", n_cols)
+    if est:
+        lo, hi = est["dup_rows_ci"]
+        c.metric("Duplicate rows (est.)", f"≈ {profile['dup_rows']:,}", help=f"95% CI: {lo:,} – {hi:,}")
+    else:
+        c.metric("Duplicate rows", profile.get("dup_rows", "…"))
+
+    if entry is not None:
+        load_report = entry.results.get("load")
+        if load_report:
+            m1, m2, m3 = st.columns(3)
+            m1.metric("Memory (default dtypes)", f"{load_report['before_bytes'] / 2**20:,.1f} MB")
+            saved = 1 - load_report["after_bytes"] / max(load_report["before_bytes"], 1)
+            m2.metric(
+                "Memory (compact)",
+                f"{load_report['after_bytes'] / 2**20:,.1f} MB",
+                delta=f"-{saved:.0%}",
+                delta_color="inverse",
+            )
+            m3.metric("Categorical columns", len(load_report["categoricals"]))
+            if not kind:
+                st.caption("Default-dtype memory is estimated from a parsed sample of the file.")
+        else:
+            st.caption(f"In-memory size: {entry.nbytes / 2**20:,.1f} MB (turn on compact loading to shrink it).")
+
+    if "likely_id" in profile:
+        st.write("Likely ID columns (near-unique):")
+        st.write(profile["likely_id"] if profile["likely_id"] else "None detected")
+        if profile.get("nunique_method") == "hll":
+            st.caption("Distinct counts are HyperLogLog estimates (about ±1%) for this dataset size.")
+
+    if "top_missing" in profile:
+        st.write("Missingness (top 15):")
+        miss_table = pd.DataFrame(profile["top_missing"], columns=["column", "missing_%"])
+        if est:
+            miss_table["ci_low_%"] = [est["missing_pct_ci"][c][0] for c in miss_table["column"]]
+            miss_table["ci_high_%"] = [est["missing_pct_ci"][c][1] for c in miss_table["column"]]
+        st.dataframe(miss_table, use_container_width=True)
+
+    if est:
+        st.write("Distinct values (estimated):")
+        st.dataframe(
+            pd.DataFrame({
+                "column": list(profile["nunique"]),
+                "distinct": list(profile["nunique"].values()),
+                "ci_low": [est["nunique_ci"][c][0] for c in profile["nunique"]],
+                "ci_high": [est["nunique_ci"][c][1] for c in profile["nunique"]],
+            }),
+            use_container_width=True,
+        )
+
+    if "semantic_types" in profile:
+        groups = group_by_type(profile["semantic_types"])
+        st.write("Inferred column types (from a value sample):")
+        if groups:
+            st.dataframe(
+                pd.DataFrame([{"type": t, "columns": ", ".join(cols)} for t, cols in groups.items()]),
+                use_container_width=True,
+                hide_index=True,
+            )
+        else:
+            st.write("No dates, free text, emails/URLs, hashes or numbers stored as text detected")
+
+    st.write("Numeric columns (sample):")
+    st.write(profile["num_cols"][:20])
+
+    st.write("Non-numeric columns (sample):")
+    st.write(profile["cat_cols"][:20])
+
+    num_table, cat_table = _stats_tables(col_stats)
+    if not num_table.empty:
+        st.write("Numeric columns:")
+        st.dataframe(
+            num_table,
+            use_container_width=True,
+            hide_index=True,
+            column_config={"distribution": st.column_config.BarChartColumn("distribution", width="medium")},
+        )
+    if not cat_table.empty:
+        st.write("Most frequent values:")
+        st.dataframe(
+            cat_table,
+            use_container_width=True,
+            hide_index=True,
+            column_config={"top share": st.column_config.BarChartColumn("top share", width="small")},
+        )
+    if col_stats:
+        st.caption("Quantiles and histograms come from a uniform row sample; top-value counts are lower bounds for high-cardinality columns.")
+
+
+def _multi_file_profile(ups, key: str):
+    """Parallel per-shard profiling of a zip / several files; memoized per session by content hash."""
+    memo = _session_memo("multi_profiles")
+    if key not in memo:
+        chunk_rows = int(os.getenv("DRAFTWISE_CHUNK_ROWS", CHUNK_ROWS_DEFAULT))
+        workers = int(os.getenv("DRAFTWISE_PROFILE_PROCESSES", 0)) or None
+        bar = st.progress(0.0, text="Profiling shards in parallel...")
+
+        def report(done: int, total: int, name: str):
+            bar.progress(done / total, text=f"Profiled {done}/{total} shards (last: {name})")
+
+        try:
+            memo[key] = profile_uploads(ups, chunk_rows=chunk_rows, max_workers=workers, progress=report)
+        except Exception as e:
+            bar.empty()
+            st.error(f"Could not profile the files: {e}")
+            st.stop()
+        bar.empty()
+    return memo[key]
+
+
+def _columnar_meta(up, digest: str, kind: str) -> dict:
+    memo = _session_memo("columnar_meta")
+    if digest not in memo:
+        try:
+            memo[digest] = columnar_metadata(up, kind)
+        except Exception as e:
+            st.error(f"Could not read file metadata: {e}")
+            st.stop()
+    return memo[digest]
+
+
+def _load_frame(up, kind: Optional[str], columns: Optional[List[str]], compact: bool = False, use_pyarrow: bool = False):
+    """Returns (df, load_report); the report (memory before/after) only exists in compact mode."""
+    if kind:
+        df = read_columnar(up, kind, columns=columns)
+        return compact_frame(df) if compact else (df, None)
+    if compact:
+        return read_csv_compact(up, use_pyarrow=use_pyarrow)
+    up.seek(0)
+    return pd.read_csv(up), None
+
+
+SPLIT_DOWNLOAD_MAX_MB = 200  # Streamlit serves downloads from memory; bigger zips stay on disk
+
+
+def _chunk_source(up, kind: Optional[str], columns: Optional[List[str]], df=None, duck=None):
+    """Zero-argument factory of fresh chunk iterators over the loaded dataset (one per pass)."""
+    chunk_rows = int(os.getenv("DRAFTWISE_CHUNK_ROWS", CHUNK_ROWS_DEFAULT))
+
+    def chunks():
+        if duck is not None:
+            return duck.iter_chunks(chunk_rows)
+        if df is not None:
+            return (df.iloc[i:i + chunk_rows] for i in range(0, len(df), chunk_rows))
+        if kind:
+            return iter_columnar_chunks(up, kind, columns=columns, chunk_rows=chunk_rows)[1]
+        up.seek(0)
+        return pd.read_csv(up, chunksize=chunk_rows)
+
+    return chunks
+
+
+def _split_panel(chunks, profile: dict, target: Optional[str], key: str):
+    """Split options, the two streaming passes (assign + export) and the stored result for `key`."""
+    sem = group_by_type(profile.get("semantic_types") or {})
+    label = st.radio(
+        "Method",
+        ["Random", "Stratified by target", "Grouped by ID column", "Time-based"],
+        horizontal=True,
+        key="split_method",
+    )
+    method = {"Random": "random", "Stratified by target": "stratified", "Grouped by ID column": "grouped"}.get(label, "time")
+    column = None
+    if method == "stratified":
+        if target is None:
+            st.info("Set the target hint above to a column name to stratify by it.")
+            return
+        column = target
+        st.caption(f"Each split keeps the class proportions of `{target}`.")
+    elif method == "grouped":
+        preferred = sem.get("hashed_id", []) + sem.get("email", []) + profile["likely_id"]
+        column = st.selectbox(
+            "ID column (all rows with the same value stay in one split)",
+            list(dict.fromkeys(preferred + list(profile["dtypes"]))),
+            key="split_group_col",
+        )
+    elif method == "time":
+        options = list(dict.fromkeys(sem.get("datetime", []) + profile["num_cols"]))
+        if not options:
+            st.info("No datetime or numeric column to order rows by.")
+            return
+        column = st.selectbox("Time column (train = earliest rows, test = latest)", options, key="split_time_col")
+
+    c1, c2, c3, c4 = st.columns(4)
+    train = c1.number_input("Train %", min_value=1, max_value=98, value=70)
+    val = c2.number_input("Val %", min_value=0, max_value=98, value=15)
+    test = c3.number_input("Test %", min_value=1, max_value=98, value=15)
+    seed = c4.number_input("Seed", min_value=0, value=0, step=1)
+    dedupe = st.checkbox("Drop exact duplicate rows first (keeps the first copy)", value=bool(profile["dup_rows"]))
+    if train + val + test != 100:
+        st.warning("Train, val and test must add up to 100%.")
+        return
+
+    if st.button("Create splits", key="split_run"):
+        n_rows = max(profile["shape"][0], 1)
+        bar = st.progress(0.0, text="Assigning rows...")
+
+        def report(stage: str):
+            return lambda rows: bar.progress(min(1.0, rows / n_rows), text=f"{stage}... {rows:,} rows")
+
+        export_dir = os.getenv("DRAFTWISE_EXPORT_DIR", os.path.join(tempfile.gettempdir(), "draftwise_exports"))
+        path = None
+        try:
+            labels, split_report = plan_splits(
+                chunks(), method, (train, val, test), column, int(seed), dedupe, progress=report("Assigning rows")
+            )
+            # A unique file per export, so sessions splitting the same data never overwrite each other.
+            os.makedirs(export_dir, exist_ok=True)
+            fd, path = tempfile.mkstemp(prefix=f"splits_{key[:12]}_{method}_", suffix=".zip", dir=export_dir)
+            os.close(fd)
+            export_splits(chunks(), labels, path, split_report, progress=report("Writing files"))
+        except Exception as e:
+            bar.empty()
+            if path and os.path.exists(path):
+                os.remove(path)
+            st.error(f"Could not create splits: {e}")
+            return
+        bar.empty()
+        memo = _session_memo("dataset_splits", _remove_export)
+        previous = memo.get(key)
+        if previous and previous["path"] != path:
+            _remove_export(previous)
+        memo[key] = {"report": split_report, "path": path}
+
+    result = _session_memo("dataset_splits", _remove_export).get(key)
+    if not result:
+        return
+    rep, path = result["report"], result["path"]
+    st.dataframe(
+        pd.DataFrame([{"split": name, "rows": n} for name, n in rep["rows"].items()]),
+        use_container_width=True,
+        hide_index=True,
+    )
+    if rep.get("strata_note"):
+        st.warning(f"Stratification: {rep['strata_note']}.")
+    if rep.get("empty_splits"):
+        st.warning(
+            f"No rows ended up in {', '.join(rep['empty_splits'])}"
+            + (": many rows share the same time value and tied rows stay in the earlier split." if rep["method"] == "time" else ".")
+        )
+    shared = sum(o["rows"] for o in rep["overlap"])
+    if shared:
+        st.error(f"{shared:,} rows have an identical copy in another split; turn on duplicate dropping.")
+    else:
+        st.success("No identical rows shared between splits (checked by row hash).")
+    if rep["dropped_duplicates"]:
+        st.caption(f"Dropped {rep['dropped_duplicates']:,} duplicate rows.")
+    if rep.get("time_ranges"):
+        st.dataframe(pd.DataFrame(rep["time_ranges"], index=["from", "to"]), use_container_width=True)
+    if rep.get("rows_without_time"):
+        st.caption(f"{rep['rows_without_time']:,} rows without a readable time value were put in train.")
+    if not os.path.exists(path):
+        return
+    size = os.path.getsize(path)
+    if size <= SPLIT_DOWNLOAD_MAX_MB * 1024 * 1024:
+        with open(path, "rb") as f:
+            st.download_button("Download splits (zip)", f, file_name=f"splits_{rep['method']}.zip", mime="application/zip")
+    else:
+        st.caption(f"Zip saved to `{path}` ({size / 2**20:,.0f} MB), too large to serve through the browser.")
+
+
+def _local_csv_report(
+    cfg: dict,
+    profile: dict,
+    target_hint: str,
+    leakage: Optional[dict] = None,
+    splits: Optional[dict] = None,
+    target_info: Optional[dict] = None,
+) -> str:
     n_rows, n_cols = profile["shape"]
     miss_cols = [(c, p) for c, p in profile["top_missing"] if p > 0]
     likely_id = profile["likely_id"][:10]
+    sem = group_by_type(profile.get("semantic_types") or {})
+
+    est = profile.get("estimates")
+    if est and est["exact_sample"]:
+        est = None
 
     lines = []
     lines.append("## Dataset overview")
     lines.append(f"- Rows: **{n_rows}**, Columns: **{n_cols}**")
     if target_hint.strip():
         lines.append(f"- Target/label (user hint): **{target_hint.strip()}**")
+    if est:
+        lines.append(
+            f"- Note: duplicate, missingness and distinct-value figures below are **estimates** from a "
+            f"{est['sample_rows']:,}-row sample ({est['confidence']:.0%} intervals in brackets); "
+            "run an exact profile before quoting them in the paper."
+        )
     lines.append("")
 
     lines.append("## Data quality snapshot")
-    lines.append(f"- Duplicate rows: **{profile['dup_rows']}**")
+    if est:
+        lo, hi = est["dup_rows_ci"]
+        lines.append(f"- Duplicate rows (estimate): **≈{profile['dup_rows']}** [{lo}–{hi}]")
+    else:
+        lines.append(f"- Duplicate rows: **{profile['dup_rows']}**")
     if likely_id:
         lines.append(f"- Likely ID columns (near-unique): {', '.join([f'`{c}`' for c in likely_id])}")
         lines.append("  - Do not use IDs as features; use only for joins/indexing.")
@@ -60,19 +632,105 @@ def _local_csv_report(cfg: dict, profile: dict, target_hint: str) -> str:
     if miss_cols:
         lines.append("- Missingness (top columns):")
         for c, p in miss_cols[:10]:
-            lines.append(f"  - `{c}`: **{p}%** missing")
+            if est:
+                lo, hi = est["missing_pct_ci"][c]
+                lines.append(f"  - `{c}`: **≈{p}%** missing [{lo}–{hi}%] (estimate)")
+            else:
+                lines.append(f"  - `{c}`: **{p}%** missing")
     else:
         lines.append("- Missingness: **No missing values detected** (nice).")
 
+    def cols(t):
+        return ", ".join(f"`{c}`" for c in sem.get(t, [])[:8])
+
+    if sem.get("numeric_string"):
+        lines.append(f"- Numbers stored as text: {cols('numeric_string')} — strip currency/commas/% and convert before modeling.")
+    if sem.get("boolean_string"):
+        lines.append(f"- Yes/no values stored as text: {cols('boolean_string')} — encode as 0/1.")
+    if sem.get("hashed_id"):
+        lines.append(f"- Hash/UUID columns: {cols('hashed_id')} — identifiers, not features.")
+
+    if target_info:
+        t = target_info
+        sampled = " (estimated from the fast-estimate sample)" if t.get("estimated_from_sample") else ""
+        lines.append("")
+        lines.append("## Target analysis")
+        lines.append(f"- Target `{t['column']}`: **{t['task']}**{sampled}; rows without a target: **{t['missing_target']:,}** ({t['missing_target_pct']}%)")
+        if t["task"] == "regression":
+            d = t["distribution"]
+            q = d.get("q") or [None] * 5
+            lines.append(f"- Distribution: mean **{d.get('mean')}**, std **{d.get('std')}**, median **{q[2]}**, range [{d.get('min')}, {d.get('max')}]")
+        elif t["n_classes"] is None:
+            lines.append(f"- More than {t['classes_over']} distinct text values: check that this is really the label column.")
+        elif t["classes"]:
+            dist = ", ".join(f"`{c['class']}` {c['count']:,} ({c['pct']}%)" for c in t["classes"][:10])
+            lines.append(f"- Classes ({t['n_classes']}): {dist}")
+            lines.append(
+                f"- Imbalance ratio (largest / smallest class): **{t['imbalance_ratio']}**; "
+                f"majority-class baseline accuracy: **{t['majority_baseline_accuracy']:.1%}**"
+            )
+            if t["imbalance_ratio"] >= 3:
+                lines.append("  - Imbalanced: report macro-F1 / per-class recall rather than accuracy alone, and stratify the split.")
+            for m in (t.get("missing_by_class") or [])[:5]:
+                rates = ", ".join(f"`{c}` {p}%" for c, p in list(m["missing_pct"].items())[:6])
+                lines.append(f"- `{m['feature']}` is missing at different rates per class ({rates}): missingness itself carries label signal.")
+            top = (t.get("feature_by_class") or [])[:5]
+            if top:
+                lines.append("- Numeric features that separate the classes most (difference of class means, in pooled std):")
+                for f in top:
+                    lines.append(f"  - `{f['feature']}`: **{f['separation']}**")
+
     lines.append("")
     lines.append("## Research-useful guidance (write this in your paper)")
     lines.append(f"- Track: **{cfg['track']}**, Goal: **{cfg['goal']}**, Degree: **{cfg['degree_level']}**, Time: **{cfg['time_days']} days**")
     lines.append("- Suggested split strategy:")
-    lines.append("  - Start with a simple train/val/test split.")
-    lines.append("  - If data has time/user/product identifiers, avoid random split (risk of leakage).")
+    # Unique timestamps / texts also look like IDs; only real keys make sense as split groups.
+    not_keys = set(sem.get("datetime", []) + sem.get("free_text", []))
+    entity_cols = list(dict.fromkeys(sem.get("hashed_id", []) + sem.get("email", []) + [c for c in likely_id if c not in not_keys]))
+    if sem.get("datetime"):
+        lines.append(f"  - Time-based split on {cols('datetime')}: train on earlier rows, validate/test on later ones (a random split lets the model see the future).")
+    if entity_cols:
+        lines.append(f"  - If an entity (user/product/…) has several rows, split by group on its key (e.g. `{entity_cols[0]}`) so no entity appears in two splits.")
+    if not sem.get("datetime") and not entity_cols:
+        lines.append("  - Start with a simple train/val/test split (stratified by the target for classification).")
+        lines.append("  - If data has time/user/product identifiers, avoid random split (risk of leakage).")
     lines.append("- Leakage checks:")
+    if leakage and leakage.get("note"):
+        lines.append(f"  - Target `{leakage['target']}`: {leakage['note']}.")
+    elif leakage:
+        if leakage["flagged"]:
+            lines.append(f"  - Flagged against target `{leakage['target']}` (drop or justify before training):")
+            for f in leakage["flagged"][:10]:
+                lines.append(f"    - `{f['column']}`: {'; '.join(f['reasons'])}")
+        else:
+            lines.append(f"  - No column strongly predicts `{leakage['target']}` on its own (checked {leakage['rows_used']:,} rows).")
+        if leakage["id_leaks"]:
+            lines.append("  - Identifier order/prefix tracks the target: shuffle before splitting and never use these ids as features.")
     lines.append("  - Remove post-outcome columns, IDs, timestamps that reveal the answer.")
-    lines.append("  - Watch for duplicates across splits.")
+    if sem.get("datetime"):
+        lines.append(f"  - Date/time columns ({cols('datetime')}): keep only those known at prediction time.")
+    if sem.get("free_text"):
+        lines.append(f"  - Free-text columns ({cols('free_text')}) can state the outcome in words; check them for label terms before using them.")
+    if sem.get("email") or sem.get("url"):
+        lines.append(f"  - Emails/URLs ({', '.join(f'`{c}`' for c in (sem.get('email', []) + sem.get('url', []))[:8])}) identify people or sources: drop them or use them only for grouping.")
+    overlaps = [o for o in profile.get("split_overlap") or [] if o["rows"]]
+    if overlaps:
+        for o in overlaps:
+            lines.append(f"  - Rows shared across provided splits ({o['splits']}): **{o['rows']}** ({o['pct']}%) — deduplicate before evaluating.")
+    elif splits is None:
+        lines.append("  - Watch for duplicates across splits.")
+    if splits:
+        r = splits["rows"]
+        shared = sum(o["rows"] for o in splits["overlap"])
+        on = f" on `{splits['column']}`" if splits["column"] else ""
+        lines.append(
+            f"  - Splits created ({splits['method']}{on}): train {r['train']:,} / val {r['val']:,} / test {r['test']:,} rows; "
+            + (f"**{shared:,}** identical rows shared across splits." if shared else "no identical rows shared across splits.")
+        )
+        if splits.get("strata_note"):
+            lines.append(f"  - Stratification: {splits['strata_note']}.")
+        if splits.get("empty_splits"):
+            lines.append(f"  - Empty split(s): {', '.join(splits['empty_splits'])} — pick another split column or method before evaluating.")
     lines.append("- Baseline:")
     lines.append("  - Pick a simple baseline model and report a clean metric table.")
     lines.append("- One improvement (bounded):")
@@ -155,12 +813,8 @@ def render_dataset_helper(cfg):
     st.subheader("Dataset Helper")
     st.write("Two paths: get help shortlisting a dataset, or upload a CSV for EDA + paper-ready narrative.")
 
-    mode = st.radio(
-        "What do you want to do?",
-        ["Help me pick a dataset (shortlist)", "I have a CSV (analyze my dataset)"],
-        index=0,
-        horizontal=True,
-    )
+    modes = ["Help me pick a dataset (shortlist)", "I have a CSV (analyze my dataset)"]
+    mode = st.radio("What do you want to do?", modes, horizontal=True, **keep("dataset_mode", options=modes, index=0))
 
     # -------------------------
     # Mode 1: dataset shortlist
@@ -169,18 +823,17 @@ def render_dataset_helper(cfg):
         st.markdown("### Dataset shortlist (guided choice)")
         st.caption("You’ll get a short list. You still choose, and you justify your choice (2–3 lines).")
 
-        task_type = st.selectbox(
-            "Task type",
-            ["Classification", "Regression", "Clustering", "Information Retrieval / Search", "NLP (text)", "Computer Vision", "Systems / Logs", "Cybersecurity"],
-        )
+        task_types = ["Classification", "Regression", "Clustering", "Information Retrieval / Search", "NLP (text)", "Computer Vision", "Systems / Logs", "Cybersecurity"]
+        task_type = st.selectbox("Task type", task_types, **keep("dataset_task_type", options=task_types, index=0))
+        constraints = ["Only public datasets", "Public + scraping is okay", "Public + synthetic data is okay"]
         data_constraint = st.selectbox(
-            "Data constraint",
-            ["Only public datasets", "Public + scraping is okay", "Public + synthetic data is okay"],
+            "Data constraint", constraints, **keep("dataset_constraint", options=constraints, index=0)
         )
         notes = st.text_area(
             "Optional notes",
             placeholder="e.g., I want something healthcare-ish, I want minimal preprocessing, I want an explainable baseline...",
             height=90,
+            **keep("dataset_notes", value=""),
         )
 
         c1, c2 = st.columns([1, 1])
@@ -195,8 +848,13 @@ def render_dataset_helper(cfg):
             st.session_state.artifacts["dataset_choice"] = None
 
             prompt = _dataset_shortlist_prompt(cfg, task_type, data_constraint, notes)
-            with st.status("Generating dataset shortlist...", expanded=False) as status:
-                raw = generate_text(prompt)
+            with st.status("Generating dataset shortlist...", expanded=True) as status:
+                try:
+                    raw = render_stream(generate_text_stream(prompt, family="dataset_shortlist"))
+                except Exception as e:
+                    status.update(label="Shortlist generation failed.", state="error", expanded=True)
+                    st.error(f"AI request failed: {e}")
+                    st.stop()
                 status.update(label="Shortlist generated.", state="complete", expanded=False)
 
             st.session_state.artifacts["dataset_shortlist_raw"] = raw
@@ -223,10 +881,12 @@ def render_dataset_helper(cfg):
             "Why did you choose this dataset? (2–3 lines)",
             placeholder="I picked this because... It fits my time window because... My contribution will be...",
             height=90,
+            **keep("dataset_why", value=""),
         )
         risk = st.text_input(
             "One risk you anticipate (short)",
             placeholder="e.g., class imbalance, noisy labels, leakage risk, licensing constraints",
+            **keep("dataset_risk", value=""),
         )
 
         if st.button("Confirm dataset choice"):
@@ -288,49 +948,285 @@ def render_dataset_helper(cfg):
     # Mode 2: CSV analysis
     # -------------------------
     st.markdown("### CSV analysis (EDA + research narrative)")
-    up = st.file_uploader("Upload CSV", type=["csv"])
-    if not up:
-        st.info("Upload a CSV to continue.")
-        st.stop()
-
-    with st.status("Loading CSV...", expanded=False) as status:
-        try:
-            df = pd.read_csv(up)
-        except Exception as e:
-            status.update(label="Failed to load CSV.", state="error", expanded=True)
-            st.error(f"Could not read CSV: {e}")
+    upload_types = ["csv"] + (list(PARQUET_EXTS + IPC_EXTS) if columnar_available() else [])
+    multi = st.toggle(
+        "Multi-file dataset (a zip or several shards, e.g. train/val/test)",
+        **keep("dataset_multi_file", value=False),
+        help="Profiles each file in parallel worker processes and merges the results into one dataset profile.",
+    )
+    cache = get_frame_cache()
+    if multi:
+        ups = kept_uploader(
+            "Upload a zip or several data files", key="dataset_uploads", type=upload_types + ["zip"], accept_multiple_files=True
+        )
+        if not ups:
+            st.info("Upload a zip or several files to continue.")
+            st.stop()
+        key = hashlib.sha256("".join(sorted(_upload_digest(u) for u in ups)).encode()).hexdigest()
+        profile, preview = _multi_file_profile(ups, key)
+        # Shards are streamed in worker processes; nothing is held as one DataFrame.
+        kind, fast, large_file, use_duck = None, False, True, False
+    else:
+        up = kept_uploader(
+            "Upload CSV, Parquet or Feather/Arrow" if columnar_available() else "Upload CSV",
+            key="dataset_upload",
+            type=upload_types,
+        )
+        if not up:
+            st.info("Upload a CSV to continue.")
             st.stop()
-        status.update(label="CSV loaded.", state="complete", expanded=False)
+
+        digest = _upload_digest(up)
+        kind = columnar_kind(up.name)
+
+        # Columnar files carry schema (and Parquet null counts) in their metadata: show them before loading
+        # anything and read only the columns the user keeps.
+        columns = None
+        if kind:
+            meta = _columnar_meta(up, digest, kind)
+            n_meta = meta["n_rows"]
+            with st.expander(f"Schema from file metadata ({n_meta:,} rows, {len(meta['columns'])} columns)"):
+                st.dataframe(
+                    pd.DataFrame({
+                        "column": meta["columns"],
+                        "dtype": [meta["dtypes"].get(c) for c in meta["columns"]],
+                        "missing_%": [
+                            round(meta["null_counts"][c] / n_meta * 100, 2)
+                            if n_meta and meta["null_counts"].get(c) is not None else None
+                            for c in meta["columns"]
+                        ],
+                    }),
+                    use_container_width=True,
+                )
+            selected = st.multiselect("Columns to load", meta["columns"], default=meta["columns"])
+            if not selected:
+                st.info("Select at least one column to load.")
+                st.stop()
+            if len(selected) < len(meta["columns"]):
+                columns = selected
+
+        use_duck = duckdb_available() and kind != "ipc" and st.toggle(
+            "SQL engine (DuckDB)",
+            key="dataset_duckdb",
+            help="Loads the file into a temporary on-disk DuckDB database and computes the profile with "
+                 "multi-threaded SQL aggregations, out of core. Also lets you run read-only SQL queries.",
+        )
+        fast = not use_duck and st.toggle(
+            "Fast estimate (sampled, with 95% confidence intervals)",
+            key="dataset_fast_estimate",
+            help="One streaming pass that keeps a bounded row sample. Numbers are estimates; "
+                 "you can switch to an exact run afterwards.",
+        )
+        # DuckDB, fast and large-file mode never hold the full DataFrame.
+        large_file = use_duck or fast or st.toggle(
+            "Large-file mode (chunked profiling)",
+            value=up.size >= LARGE_FILE_MB * 1024 * 1024,
+            help="Streams the file in chunks instead of loading it into one DataFrame, for files too big to "
+                 "parse in memory. The upload itself stays in memory, and exact duplicate detection keeps "
+                 "8 bytes per row; the fast estimate avoids the per-row cost.",
+        )
+
+        compact, use_pyarrow = False, False
+        if not large_file:
+            compact = st.toggle(
+                "Compact loading (smaller dtypes, categoricals)",
+                value=False,
+                help="Downcasts numeric columns and stores low-cardinality text columns as categoricals. "
+                     "Uses a fraction of the memory; values are unchanged.",
+            )
+            if compact and not kind and columnar_available():
+                use_pyarrow = st.checkbox("Parse with the pyarrow engine (Arrow-backed columns)", value=False)
+
+        # Parsed frames and their profiles are memoized by content hash (plus the column selection and
+        # load options), so widget interactions after the first load do not re-parse or re-profile the file.
+        key = digest if columns is None else digest + ":" + hashlib.sha1("\x1f".join(columns).encode()).hexdigest()
+        if compact:
+            key += ":compact-arrow" if use_pyarrow else ":compact"
+        if use_duck:
+            duck, profile, preview = _duck_profile(up, key + ":duckdb", kind, columns)
+        elif large_file:
+            profile, preview = _chunked_profile(up, key, kind, columns, fast=fast)
+        else:
+            entry = cache.get(key)
+            if entry is None:
+                with st.status("Loading dataset...", expanded=False) as status:
+                    try:
+                        df, load_report = _load_frame(up, kind, columns, compact, use_pyarrow)
+                    except Exception as e:
+                        status.update(label="Failed to load dataset.", state="error", expanded=True)
+                        st.error(f"Could not read file: {e}")
+                        st.stop()
+                    entry = cache.put(key, df)
+                    entry.results["load"] = load_report
+                    status.update(label="Dataset loaded.", state="complete", expanded=False)
+            df = entry.df
+            preview = df.head(25)
 
     st.success("Loaded dataset.")
-    st.dataframe(df.head(25), use_container_width=True)
+    st.dataframe(preview, use_container_width=True)
+
+    shards = profile.get("shards") if large_file else None
+    if shards:
+        issues = len(profile["dtype_conflicts"]) + len(profile["missing_columns"])
+        overlap = sum(o["rows"] for o in profile["split_overlap"])
+        with st.expander(f"Shards ({len(shards)} files)", expanded=bool(issues or overlap)):
+            st.dataframe(pd.DataFrame(shards), use_container_width=True, hide_index=True)
+            if profile["dtype_conflicts"]:
+                st.warning("Columns parsed with different dtypes in different files (merged as the widest type):")
+                st.dataframe(
+                    pd.DataFrame([
+                        {"column": c, "dtypes": "; ".join(f"{d}: {len(files)} file(s)" for d, files in seen.items())}
+                        for c, seen in profile["dtype_conflicts"].items()
+                    ]),
+                    use_container_width=True,
+                    hide_index=True,
+                )
+            if profile["missing_columns"]:
+                st.warning("Columns missing from some files: " + ", ".join(f"`{c}`" for c in profile["missing_columns"]))
+            if profile["split_overlap"]:
+                st.write("Identical rows shared between splits (by row hash):")
+                st.dataframe(pd.DataFrame(profile["split_overlap"]), use_container_width=True, hide_index=True)
+                if overlap:
+                    st.error("Some evaluation rows also appear in an earlier split; deduplicate before reporting results.")
 
     target_hint = st.text_input(
         "Optional: what do you think is the target/label column?",
         placeholder="e.g., label, sentiment, price, churn",
+        **keep("dataset_target_hint", value=""),
     )
 
-    profile = _basic_profile(df)
+    if not large_file:
+        job_id = _background_profile(entry)
+        if job_id:
+            # Metric groups fill in as the worker finishes them; the panel reruns the page when all are in.
+            _profile_panel(job_id, entry, kind)
+            st.stop()
+        profile, col_stats = entry.results["basic"], entry.results["stats"]
+    else:
+        col_stats = profile.get("column_stats", {})
 
-    with st.expander("Basic stats", expanded=True):
-        n_rows, n_cols = profile["shape"]
-        a, b, c = st.columns(3)
-        a.metric("Rows", n_rows)
-        b.metric("Columns", n_cols)
-        c.metric("Duplicate rows", profile["dup_rows"])
+    leakage, target = None, None
+    if target_hint.strip():
+        target = resolve_target(list(profile["dtypes"]), target_hint)
+        if target is None:
+            st.caption("Target hint does not match a column name, so leakage checks are skipped.")
+        elif use_duck:
+            st.caption("Leakage checks need rows in memory; test leakage hypotheses with the SQL queries below.")
+        elif large_file and not fast:
+            st.caption("Leakage checks need rows in memory: turn off large-file mode or use fast estimate.")
+        else:
+            with st.spinner("Checking columns for target leakage..."):
+                leakage = _leakage(profile, target, entry=None if large_file else entry, sample_key=key)
 
-        st.write("Likely ID columns (near-unique):")
-        st.write(profile["likely_id"] if profile["likely_id"] else "None detected")
+    target_info = None
+    if target and multi:
+        st.caption("Target analysis runs on single-file uploads.")
+    elif target:
+        with st.spinner(f"Analyzing target `{target}`..."):
+            target_info = _target(
+                target,
+                key,
+                entry=None if large_file else entry,
+                chunks=_chunk_source(up, kind, columns, duck=duck if use_duck else None),
+                fast=fast,
+            )
+    if target_info:
+        with st.expander(f"Target analysis ({target}: {target_info['task']})", expanded=True):
+            _render_target(target_info)
 
-        st.write("Missingness (top 15):")
-        miss_table = pd.DataFrame(profile["top_missing"], columns=["column", "missing_%"])
-        st.dataframe(miss_table, use_container_width=True)
+    if leakage:
+        label = f"Leakage checks (target: {leakage['target']}, {len(leakage['flagged'])} flagged)"
+        with st.expander(label, expanded=bool(leakage["flagged"])):
+            if leakage["flagged"]:
+                st.dataframe(
+                    pd.DataFrame([
+                        {"column": f["column"], "why": "; ".join(f["reasons"])} for f in leakage["flagged"]
+                    ]),
+                    use_container_width=True,
+                )
+            elif leakage.get("note"):
+                st.info(f"Leakage checks skipped: {leakage['note']}.")
+            else:
+                st.write("No single column predicts the target suspiciously well.")
+            st.caption(
+                f"Association with the target on {leakage['rows_used']:,} rows "
+                f"({leakage['task']}; majority-class accuracy {leakage['baseline_accuracy']:.1%}). "
+                "mi = share of target entropy explained; purity = accuracy from this column alone."
+            )
+            st.dataframe(pd.DataFrame(leakage["top_associations"]), use_container_width=True)
 
-        st.write("Numeric columns (sample):")
-        st.write(profile["num_cols"][:20])
+    if use_duck:
+        with st.expander("SQL queries (DuckDB)", expanded=bool(target)):
+            if target:
+                q = '"' + target.replace('"', '""') + '"'
+                example = f"SELECT {q}, count(*) AS n\nFROM data\nGROUP BY 1\nORDER BY n DESC"
+            else:
+                example = "SELECT *\nFROM data\nLIMIT 10"
+            sql = st.text_area("Read-only SQL over table `data`", value=example, height=140, key=f"duck_sql_{key}")
+            st.caption("e.g. group by a suspect column and the target to see whether one predicts the other.")
+            if st.button("Run query", key="duck_run"):
+                try:
+                    result, truncated = duck.query(sql)
+                except Exception as e:
+                    st.error(f"Query failed: {e}")
+                else:
+                    st.dataframe(result, use_container_width=True)
+                    if truncated:
+                        st.caption(f"Showing the first {len(result):,} rows.")
+
+    est = profile.get("estimates")
+    with st.expander("Basic stats", expanded=True):
+        if est and not est["exact_sample"]:
+            st.info(
+                f"Fast estimate: metrics below come from a {est['sample_rows']:,}-row sample of {profile['shape'][0]:,} rows "
+                f"(ranges are {est['confidence']:.0%} confidence intervals)."
+            )
+            st.button("Run exact profile", on_click=_upgrade_to_exact)
+        else:
+            est = None
+        _render_basic_stats(profile, col_stats, est, entry=None if large_file else entry, kind=kind)
 
-        st.write("Non-numeric columns (sample):")
-        st.write(profile["cat_cols"][:20])
+    if not fast and (profile["dup_rows"] or not large_file):
+        with st.expander("Duplicate rows", expanded=False):
+            groups = profile.get("dup_groups") or []
+            if groups:
+                st.write("Most repeated rows:")
+                if large_file:
+                    # Only row hashes are kept in large-file mode, so show positions rather than contents.
+                    st.dataframe(
+                        pd.DataFrame(groups).rename(columns={"row": "first_row", "count": "copies"}),
+                        use_container_width=True,
+                    )
+                else:
+                    top = df.iloc[[g["row"] for g in groups]].copy()
+                    top.insert(0, "copies", [g["count"] for g in groups])
+                    st.dataframe(top, use_container_width=True)
+            else:
+                st.caption("No exact duplicate rows.")
+
+            if not large_file:
+                subset = st.multiselect(
+                    "Near-duplicates: rows that match on these columns only",
+                    options=list(df.columns),
+                    help="e.g. pick the text column to find the same sample stored under different ids.",
+                )
+                if subset:
+                    near = cache.memo(entry, ("near_dups", tuple(subset)), lambda: near_duplicates(df, subset))
+                    st.metric("Near-duplicate rows", near["dup_rows"])
+                    if near["dup_groups"]:
+                        top = df.iloc[[g["row"] for g in near["dup_groups"]]][subset].copy()
+                        top.insert(0, "copies", [g["count"] for g in near["dup_groups"]])
+                        st.dataframe(top, use_container_width=True)
+
+    with st.expander("Train/val/test splits", expanded=False):
+        if multi:
+            st.caption("Multi-file uploads come already split; the Shards panel shows rows shared between them.")
+        else:
+            chunks = _chunk_source(
+                up, kind, columns, df=None if large_file else df, duck=duck if use_duck else None
+            )
+            _split_panel(chunks, profile, target, key)
+    splits = _session_memo("dataset_splits", _remove_export).get(key, {}).get("report")
 
     st.divider()
     st.subheader("Narrative report")
@@ -344,7 +1240,7 @@ def render_dataset_helper(cfg):
 
     if st.button("Generate dataset report", type="primary", use_container_width=True):
         if report_mode.startswith("Local"):
-            report = _local_csv_report(cfg, profile, target_hint)
+            report = _local_csv_report(cfg, profile, target_hint, leakage, splits, target_info)
         else:
             summary = {
                 "rows": profile["shape"][0],
@@ -356,6 +1252,31 @@ def render_dataset_helper(cfg):
                 "num_cols_sample": profile["num_cols"][:15],
                 "cat_cols_sample": profile["cat_cols"][:15],
             }
+            summary["column_stats"] = _compact_stats(col_stats)
+            summary["semantic_types"] = {t: c[:10] for t, c in group_by_type(profile.get("semantic_types") or {}).items()}
+            if shards:
+                summary["shards"] = {
+                    "files": len(shards),
+                    "splits": sorted({sh["split"] for sh in shards if sh["split"]}),
+                    "split_overlap": profile["split_overlap"],
+                    "dtype_conflicts": list(profile["dtype_conflicts"])[:20],
+                }
+            if est:
+                summary["estimated_from_sample"] = {
+                    "sample_rows": est["sample_rows"],
+                    "dup_rows_95ci": est["dup_rows_ci"],
+                    "note": "dup_rows, missingness and likely_id are sample estimates; say so in the report",
+                }
+            if leakage:
+                summary["leakage_checks"] = {
+                    "target": leakage["target"],
+                    "flagged": leakage["flagged"][:10],
+                    "id_leaks": leakage["id_leaks"],
+                }
+            if target_info:
+                summary["target_analysis"] = _compact_target(target_info)
+            if splits:
+                summary["splits_created"] = {k: splits[k] for k in ("method", "column", "rows", "dropped_duplicates", "overlap")}
             prompt = f"""
 You are DraftWise. Write a mentor-style dataset analysis for a beginner CS/IT researcher.
 
@@ -380,14 +1301,14 @@ Output requirements:
   - What to write in “Dataset” and “Experimental Setup”
 - Keep it actionable and bounded for the time window.
 """.strip()
-            with st.status("Generating dataset report...", expanded=False) as status:
+            with st.status("Generating dataset report...", expanded=True) as status:
                 try:
-                    report = generate_text(prompt)
+                    report = render_stream(generate_text_stream(prompt, family="dataset_report"))
                 except Exception as e:
                     status.update(label="AI request failed.", state="error", expanded=True)
                     st.error(f"AI request failed: {e}")
                     st.info("Falling back to local report.")
-                    report = _local_csv_report(cfg, profile, target_hint)
+                    report = _local_csv_report(cfg, profile, target_hint, leakage, splits, target_info)
                 else:
                     status.update(label="Dataset report generated.", state="complete", expanded=False)
 
@@ -401,6 +1322,20 @@ Output requirements:
                 "top_missing": profile["top_missing"][:20],
                 "num_cols": profile["num_cols"][:50],
                 "cat_cols": profile["cat_cols"][:50],
+                "estimated": bool(est),
+                "column_stats": dict(list(col_stats.items())[:50]),
+                "semantic_types": profile.get("semantic_types"),
+                "split_overlap": profile.get("split_overlap"),
+                "splits": splits,
+                "target": target_info,
+                "leakage": {
+                    "target": leakage["target"],
+                    "task": leakage["task"],
+                    "flagged": leakage["flagged"][:20],
+                    "id_leaks": leakage["id_leaks"],
+                    "post_outcome_names": leakage["post_outcome_names"][:20],
+                    "top_associations": leakage["top_associations"][:10],
+                } if leakage else None,
             },
             "report_md": report,
         }
@@ -1,7 +1,8 @@
 import streamlit as st
 from pypdf import PdfReader
-from llm.gemini_client import generate_text, MODEL_DEFAULT
+from llm.gemini_client import MODEL_DEFAULT
 from llm.prompts import shorten_prompt
+from utils.ui_render import keep, kept_uploader, start_generation_job, poll_job
 #from utils.ui_render import render_compact
 
 MAX_CHARS = 45000  # safety cap for model context
@@ -202,6 +203,14 @@ Paper text:
 --- END PAPER TEXT ---
 """.strip()
 
+def _store_analysis(report_md: str, meta: dict):
+    # New analyses carry their record in meta; regenerate/shorten only replace the report text.
+    if meta.get("record"):
+        st.session_state.artifacts["paper_analysis"] = {**meta["record"], "report_md": report_md}
+    elif st.session_state.artifacts.get("paper_analysis"):
+        st.session_state.artifacts["paper_analysis"]["report_md"] = report_md
+
+
 # -----------------------------
 # UI
 # -----------------------------
@@ -209,43 +218,36 @@ def render_paper_analyzer(cfg):
     st.subheader("Paper Analyzer")
     st.write("Two options: analyze a draft section you wrote, or analyze a full paper PDF.")
 
-    mode = st.radio(
-        "Choose analysis type",
-        ["Section Analyzer (paste text)", "Full Paper Analyzer (upload PDF)"],
-        index=0,
-        horizontal=True,
-    )
+    modes = ["Section Analyzer (paste text)", "Full Paper Analyzer (upload PDF)"]
+    mode = st.radio("Choose analysis type", modes, horizontal=True, **keep("paper_mode", options=modes, index=0))
 
     # -------------------------
     # Section Analyzer
     # -------------------------
     if mode.startswith("Section Analyzer"):
+        section_types = [
+            "Abstract",
+            "Introduction",
+            "Related Work",
+            "Method",
+            "Experimental Setup",
+            "Results",
+            "Discussion",
+            "Limitations",
+            "Conclusion",
+        ]
         section_type = st.selectbox(
-            "Which section is this?",
-            [
-                "Abstract",
-                "Introduction",
-                "Related Work",
-                "Method",
-                "Experimental Setup",
-                "Results",
-                "Discussion",
-                "Limitations",
-                "Conclusion",
-            ],
+            "Which section is this?", section_types, **keep("paper_section_type", options=section_types, index=0)
         )
 
-        tone = st.radio(
-            "Feedback tone",
-            ["Mentor mode (supportive)", "Reviewer mode (strict)"],
-            index=0,
-            horizontal=True,
-        )
+        tones = ["Mentor mode (supportive)", "Reviewer mode (strict)"]
+        tone = st.radio("Feedback tone", tones, horizontal=True, **keep("paper_tone", options=tones, index=0))
 
         section_text = st.text_area(
             "Paste your section text here",
             height=260,
             placeholder="Paste the exact text from your draft (no need to format).",
+            **keep("paper_section_text", value=""),
         )
 
         col1, col2 = st.columns([1, 1])
@@ -266,54 +268,41 @@ def render_paper_analyzer(cfg):
             st.session_state.artifacts["paper_analysis"] = None
             prompt = _section_analyzer_prompt(cfg, section_type, section_text.strip(), tone)
 
-            with st.status("Analyzing section...", expanded=False) as status:
-                try:
-                    report = generate_text(prompt)
-                except Exception as e:
-                    status.update(label="Section analysis failed.", state="error", expanded=True)
-                    st.error(f"AI request failed: {e}")
-                    st.stop()
-                status.update(label="Section analysis complete.", state="complete", expanded=False)
-
-            st.session_state.artifacts["paper_analysis"] = {
-                "type": "section",
-                "section_type": section_type,
-                "tone": tone,
-                "report_md": report,
-                "last_prompt": prompt,
-            }
+            start_generation_job(
+                "paper_analysis", prompt, label="Analyzing section", family="section_review",
+                meta={"record": {
+                    "type": "section",
+                    "section_type": section_type,
+                    "tone": tone,
+                    "last_prompt": prompt,
+                }},
+            )
+
+        busy = poll_job("paper_analysis", _store_analysis)
 
         pa = st.session_state.artifacts.get("paper_analysis")
         if not pa:
-            st.info("Paste a section and click **Analyze this section**.")
+            if not busy:
+                st.info("Paste a section and click **Analyze this section**.")
             return
 
         st.success(f"Section analysis ready: {pa.get('section_type','')}")
         c1, c2 = st.columns(2)
         with c1:
-            regen_btn = st.button("Regenerate analysis", key="regen_section_analysis")
+            regen_btn = st.button("Regenerate analysis", key="regen_section_analysis", disabled=busy)
         with c2:
-            shorten_btn = st.button("Shorten analysis", key="short_any_analysis")
+            shorten_btn = st.button("Shorten analysis", key="short_any_analysis", disabled=busy)
             
         if regen_btn:
-            with st.status("Regenerating analysis...", expanded=False) as status:
-                try:
-                    new_md = generate_text(pa["last_prompt"])
-                except Exception as e:
-                    status.update(label="Regeneration failed.", state="error", expanded=True)
-                    st.error(f"AI request failed: {e}")
-                    st.stop()
-                status.update(label="Analysis regenerated.", state="complete", expanded=False)
-
-            st.session_state.artifacts["paper_analysis"]["report_md"] = new_md
+            start_generation_job(
+                "paper_analysis", pa["last_prompt"], label="Regenerating analysis",
+                family="section_review", use_cache=False,
+            )
             st.rerun()
     
         if shorten_btn:
             prompt = shorten_prompt(cfg, pa["report_md"])
-            with st.status("Shortening analysis...", expanded=False) as status:
-                new_md = generate_text(prompt)
-                status.update(label="Analysis shortened.", state="complete", expanded=False)
-            st.session_state.artifacts["paper_analysis"]["report_md"] = new_md
+            start_generation_job("paper_analysis", prompt, label="Shortening analysis", family="shorten")
             st.rerun()
 
         st.markdown(st.session_state.artifacts["paper_analysis"]["report_md"])
@@ -332,14 +321,12 @@ def render_paper_analyzer(cfg):
     # -------------------------
     # Full Paper Analyzer
     # -------------------------
+    paper_modes = ["Reader mode (extract + explain)", "Reviewer mode (critique)"]
     analysis_mode = st.radio(
-        "Full paper mode",
-        ["Reader mode (extract + explain)", "Reviewer mode (critique)"],
-        index=0,
-        horizontal=True,
+        "Full paper mode", paper_modes, horizontal=True, **keep("paper_analysis_mode", options=paper_modes, index=0)
     )
 
-    up = st.file_uploader("Upload PDF", type=["pdf"])
+    up = kept_uploader("Upload PDF", key="paper_pdf", type=["pdf"])
     if not up:
         st.info("Upload a PDF to continue.")
         st.stop()
@@ -380,54 +367,41 @@ def render_paper_analyzer(cfg):
 
         prompt = _paper_analyzer_prompt(cfg, short_text, analysis_mode)
 
-        with st.status("Generating paper analysis...", expanded=False) as status:
-            try:
-                report = generate_text(prompt)
-            except Exception as e:
-                status.update(label="Paper analysis failed.", state="error", expanded=True)
-                st.error(f"AI request failed: {e}")
-                st.stop()
-            status.update(label="Paper analysis complete.", state="complete", expanded=False)
+        start_generation_job(
+            "paper_analysis", prompt, label="Generating paper analysis", family="paper",
+            meta={"record": {
+                "type": "paper",
+                "mode": analysis_mode,
+                "chars_used": len(short_text),
+                "last_prompt": prompt,
+            }},
+        )
 
-        st.session_state.artifacts["paper_analysis"] = {
-            "type": "paper",
-            "mode": analysis_mode,
-            "chars_used": len(short_text),
-            "report_md": report,
-            "last_prompt": prompt,
-        }
+    busy = poll_job("paper_analysis", _store_analysis)
 
     pa = st.session_state.artifacts.get("paper_analysis")
     if not pa:
-        st.info("Click **Analyze paper** to generate the report.")
+        if not busy:
+            st.info("Click **Analyze paper** to generate the report.")
         return
 
     st.success(f"Paper analysis ready (chars sent: {pa.get('chars_used', 0)}).")
     c1, c2 = st.columns(2)
     with c1:
-        regen_btn = st.button("Regenerate analysis", key="regen_paper_analysis")
+        regen_btn = st.button("Regenerate analysis", key="regen_paper_analysis", disabled=busy)
     with c2:
-        shorten_btn = st.button("Shorten analysis", key="short_any_analysis")  
+        shorten_btn = st.button("Shorten analysis", key="short_any_analysis", disabled=busy)  
         
     if regen_btn:
-        with st.status("Regenerating analysis...", expanded=False) as status:
-            try:
-                new_md = generate_text(pa["last_prompt"])
-            except Exception as e:
-                status.update(label="Regeneration failed.", state="error", expanded=True)
-                st.error(f"AI request failed: {e}")
-                st.stop()
-            status.update(label="Analysis regenerated.", state="complete", expanded=False)
-
-        st.session_state.artifacts["paper_analysis"]["report_md"] = new_md
+        start_generation_job(
+            "paper_analysis", pa["last_prompt"], label="Regenerating analysis",
+            family="paper", use_cache=False,
+        )
         st.rerun()
     
     if shorten_btn:
         prompt = shorten_prompt(cfg, pa["report_md"])
-        with st.status("Shortening analysis...", expanded=False) as status:
-            new_md = generate_text(prompt)
-            status.update(label="Analysis shortened.", state="complete", expanded=False)
-        st.session_state.artifacts["paper_analysis"]["report_md"] = new_md
+        start_generation_job("paper_analysis", prompt, label="Shortening analysis", family="shorten")
         st.rerun()
 
     st.markdown(st.session_state.artifacts["paper_analysis"]["report_md"])
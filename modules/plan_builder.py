@@ -1,7 +1,10 @@
 import streamlit as st
-from llm.gemini_client import generate_text, MODEL_DEFAULT
+from llm.gemini_client import MODEL_DEFAULT
 from llm.prompts import plan_builder_prompt, shorten_prompt 
-from utils.ui_render import render_compact
+from utils.ui_render import render_compact, start_generation_job, poll_job
+
+def _store_plan(plan_md: str, meta: dict):
+    st.session_state.artifacts["plan"] = plan_md
 
 def render_plan_builder(cfg):
     st.subheader("Plan Builder")
@@ -25,38 +28,33 @@ def render_plan_builder(cfg):
     if run:
         st.session_state.artifacts["plan"] = None
         prompt = plan_builder_prompt(cfg, chosen)
-        with st.status("Generating a bounded plan...", expanded=False) as status:
-            plan_md = generate_text(prompt)
-            status.update(label="Plan generated.", state="complete", expanded=False)
-        st.session_state.artifacts["plan"] = plan_md
+        start_generation_job("plan", prompt, label="Generating a bounded plan", family="plan")
+
+    # Generation runs in the background; the page keeps working while it streams in.
+    busy = poll_job("plan", _store_plan)
 
     plan = st.session_state.artifacts.get("plan")
     if not plan:
-        st.info("Click **Generate plan** to create your experimental protocol and timeline.")
+        if not busy:
+            st.info("Click **Generate plan** to create your experimental protocol and timeline.")
         return
 
     render_compact(plan, details_title="Show full plan details")
     
     c1, c2 = st.columns(2)
     with c1:
-        regen2 = st.button("Regenerate plan")
+        regen2 = st.button("Regenerate plan", disabled=busy)
     with c2:
-        shorten = st.button("Shorten plan")
+        shorten = st.button("Shorten plan", disabled=busy)
 
     if regen2:
         prompt = plan_builder_prompt(cfg, chosen)
-        with st.status("Regenerating plan...", expanded=False) as status:
-            plan_md = generate_text(prompt)
-            status.update(label="Plan regenerated.", state="complete", expanded=False)
-        st.session_state.artifacts["plan"] = plan_md
+        start_generation_job("plan", prompt, label="Regenerating plan", family="plan", use_cache=False)
         st.rerun()
 
     if shorten:
         prompt = shorten_prompt(cfg, plan)
-        with st.status("Shortening plan...", expanded=False) as status:
-            short_md = generate_text(prompt)
-            status.update(label="Plan shortened.", state="complete", expanded=False)
-        st.session_state.artifacts["plan"] = short_md
+        start_generation_job("plan", prompt, label="Shortening plan", family="shorten")
         st.rerun()
 
     st.divider()
@@ -68,4 +66,4 @@ def render_plan_builder(cfg):
         file_name="draftwise_plan.md",
         mime="text/markdown",
         disabled=not reviewed,
-    )
\ No newline at end of file
+    )
@@ -1,8 +1,8 @@
 import re
 import streamlit as st
-from llm.gemini_client import generate_text, MODEL_DEFAULT
+from llm.gemini_client import generate_text_stream, MODEL_DEFAULT
 from llm.prompts import topic_picker_prompt
-from utils.ui_render import render_compact
+from utils.ui_render import keep, render_compact, render_stream
 
 # -----------------------------
 # Helpers
@@ -117,12 +117,8 @@ def render_topic_picker(cfg):
     st.subheader("Topic Picker")
     st.write("Pick from DraftWise suggestions, or bring your own topic and run a feasibility check.")
 
-    path = st.radio(
-        "Choose your path",
-        ["Suggest topics (DraftWise)", "I already have a topic"],
-        index=0,
-        horizontal=True,
-    )
+    paths = ["Suggest topics (DraftWise)", "I already have a topic"]
+    path = st.radio("Choose your path", paths, horizontal=True, **keep("topic_path", options=paths, index=0))
 
     
     # Guardrail (optional): if on Suggest mode and nothing generated yet, hint user
@@ -149,8 +145,13 @@ def render_topic_picker(cfg):
             st.session_state.artifacts["selected_topic"] = None
 
             prompt = topic_picker_prompt(cfg)
-            with st.status("Generating topic ideas...", expanded=False) as status:
-                raw = generate_text(prompt)
+            with st.status("Generating topic ideas...", expanded=True) as status:
+                try:
+                    raw = render_stream(generate_text_stream(prompt, family="topics"))
+                except Exception as e:
+                    status.update(label="Topic generation failed.", state="error", expanded=True)
+                    st.error(f"AI request failed: {e}")
+                    st.stop()
                 status.update(label="Topic ideas generated.", state="complete", expanded=False)
 
             st.session_state.artifacts["topics_raw"] = raw
@@ -190,23 +191,33 @@ def render_topic_picker(cfg):
         st.markdown("### Bring your own topic")
         st.caption("You’ll enter your topic, DraftWise will evaluate feasibility, then you decide whether to proceed.")
 
-        title = st.text_input("Topic title", placeholder="e.g., Detecting phishing emails using lightweight NLP baselines")
+        title = st.text_input(
+            "Topic title",
+            placeholder="e.g., Detecting phishing emails using lightweight NLP baselines",
+            **keep("own_topic_title", value=""),
+        )
         problem = st.text_area(
             "Problem statement (2–5 lines)",
             placeholder="What exactly are you trying to predict/measure? Why does it matter? What’s the input/output?",
             height=120,
+            **keep("own_topic_problem", value=""),
         )
         plan = st.text_area(
             "What do you plan to do? (rough steps)",
             placeholder="e.g., pick dataset, clean it, train baseline, try 1 improvement, evaluate, write report",
             height=110,
+            **keep("own_topic_plan", value=""),
+        )
+        situations = ["Public dataset available", "I will scrape (legal/allowed)", "I will create synthetic data", "I have private data (risky)"]
+        data = st.selectbox("Data situation", situations, **keep("own_topic_data", options=situations, index=0))
+        metric = st.text_input(
+            "Metric (optional)", placeholder="e.g., F1, accuracy, ROC-AUC, MSE, latency", **keep("own_topic_metric", value="")
         )
-        data = st.selectbox(
-            "Data situation",
-            ["Public dataset available", "I will scrape (legal/allowed)", "I will create synthetic data", "I have private data (risky)"],
+        baseline = st.text_input(
+            "Baseline (optional)",
+            placeholder="e.g., Logistic Regression, Random Forest, BERT baseline, BM25",
+            **keep("own_topic_baseline", value=""),
         )
-        metric = st.text_input("Metric (optional)", placeholder="e.g., F1, accuracy, ROC-AUC, MSE, latency")
-        baseline = st.text_input("Baseline (optional)", placeholder="e.g., Logistic Regression, Random Forest, BERT baseline, BM25")
 
         col1, col2 = st.columns([1, 1])
         with col1:
@@ -232,8 +243,14 @@ def render_topic_picker(cfg):
                 return
 
             prompt = _feasibility_prompt(cfg, title, problem, plan, data, metric, baseline)
-            with st.spinner("Analyzing feasibility..."):
-                feas_md = generate_text(prompt)
+            with st.status("Analyzing feasibility...", expanded=True) as status:
+                try:
+                    feas_md = render_stream(generate_text_stream(prompt, family="feasibility"))
+                except Exception as e:
+                    status.update(label="Feasibility check failed.", state="error", expanded=True)
+                    st.error(f"AI request failed: {e}")
+                    st.stop()
+                status.update(label="Feasibility check complete.", state="complete", expanded=False)
 
             st.session_state.artifacts["feasibility_raw"] = feas_md
 
@@ -1,6 +1,9 @@
+from contextlib import closing
 import streamlit as st
-from llm.gemini_client import generate_text, MODEL_DEFAULT
+from core.jobs import JobCancelled
+from llm.gemini_client import generate_many, MODEL_DEFAULT
 from llm.prompts import writing_studio_prompt, shorten_prompt
+from utils.ui_render import job_notice, keep, start_job, start_generation_job, poll_job
 #from utils.ui_render import render_compact
 
 SECTIONS = [
@@ -13,6 +16,48 @@ SECTIONS = [
     "Conclusion & Future Work",
 ]
 
+def _dataset_facts(profile: dict) -> str:
+    """Numbers computed locally in the Dataset Helper, so sections quote them instead of guessing."""
+    if not profile.get("shape"):
+        return ""
+    rows, cols = profile["shape"]
+    approx = "≈" if profile.get("estimated") else ""
+    lines = [
+        "## Dataset facts (computed locally; use these exact numbers)",
+        f"- Rows: {rows:,}; columns: {cols:,}; duplicate rows: {approx}{profile.get('dup_rows', 0):,}",
+    ]
+    missing = [f"`{c}` {approx}{p}%" for c, p in (profile.get("top_missing") or [])[:5] if p > 0]
+    if missing:
+        lines.append(f"- Most missing columns: {', '.join(missing)}")
+
+    t = profile.get("target") or {}
+    if t:
+        lines.append(f"- Target `{t['column']}` ({t['task']}); rows without a target: {t['missing_target']:,} ({t['missing_target_pct']}%)")
+        if t["task"] == "regression":
+            d = t.get("distribution") or {}
+            q = d.get("q") or [None] * 5
+            lines.append(f"- Target distribution: mean {d.get('mean')}, std {d.get('std')}, median {q[2]}, min {d.get('min')}, max {d.get('max')}")
+        elif t.get("classes"):
+            dist = ", ".join(f"{c['class']}: {c['count']:,} ({c['pct']}%)" for c in t["classes"][:10])
+            lines.append(f"- Class distribution ({t['n_classes']} classes): {dist}")
+            lines.append(
+                f"- Imbalance ratio (largest / smallest class): {t['imbalance_ratio']}; "
+                f"majority-class baseline accuracy: {t['majority_baseline_accuracy']:.1%}"
+            )
+            for m in (t.get("missing_by_class") or [])[:3]:
+                rates = ", ".join(f"{c}: {p}%" for c, p in list(m["missing_pct"].items())[:6])
+                lines.append(f"- `{m['feature']}` missing rate by class: {rates}")
+            for f in (t.get("feature_by_class") or [])[:3]:
+                means = ", ".join(f"{c}: {v}" for c, v in list(f["mean_by_class"].items())[:6])
+                lines.append(f"- `{f['feature']}` mean by class: {means} (separation {f['separation']} pooled std)")
+
+    splits = profile.get("splits")
+    if splits:
+        r = splits["rows"]
+        lines.append(f"- Splits ({splits['method']}): train {r['train']:,} / val {r['val']:,} / test {r['test']:,} rows")
+    return "\n".join(lines)
+
+
 def _gather_context() -> dict:
     a = st.session_state.artifacts
     topic = a.get("selected_topic") or {}
@@ -23,6 +68,9 @@ def _gather_context() -> dict:
     dataset_md = ""
     if isinstance(dataset, dict) and dataset.get("report_md"):
         dataset_md = dataset.get("report_md", "")
+        facts = _dataset_facts(dataset.get("profile") or {})
+        if facts:
+            dataset_md = f"{dataset_md}\n\n{facts}"
     elif isinstance(dataset_choice, dict):
         # turn dataset choice into a small markdown snippet
         picked = dataset_choice.get("picked_option", {})
@@ -65,6 +113,39 @@ def _compile_draft(writing: dict) -> str:
         return ""
     return "# DraftWise Paper Draft\n\n" + "\n".join(parts)
 
+def _sections_job(job, prompts: dict, module: str) -> dict:
+    # Background job body: all sections in parallel, per-section success/failure kept apart.
+    job.emit(f"Sections in flight: {', '.join(prompts)}\n\n")
+    texts, errors = {}, {}
+    results = generate_many(
+        prompts, family="section", module=module, cancelled=lambda: job.cancelled
+    )
+    with closing(results):
+        for section, text, err in results:
+            if job.cancelled:
+                raise JobCancelled()
+            if err is not None:
+                errors[section] = str(err)
+                job.emit(f"- ⚠️ {section} failed\n")
+            else:
+                texts[section] = text
+                job.emit(f"- ✅ {section}\n")
+    if job.cancelled:
+        raise JobCancelled()
+    return {"texts": texts, "errors": errors}
+
+def _store_sections(result: dict, meta: dict):
+    _ensure_writing_state()
+    st.session_state.artifacts["writing"].update(result["texts"])
+    for section, err in result["errors"].items():
+        job_notice("writing:batch", "error", f"{section}: AI request failed: {err}")
+    if result["texts"] and not result["errors"]:
+        job_notice("writing:batch", "success", "Generated.")
+
+def _store_section(text: str, meta: dict):
+    _ensure_writing_state()
+    st.session_state.artifacts["writing"][meta["section"]] = text
+
 def render_writing_studio(cfg):
     st.subheader("Writing Studio")
     st.write("Generate paper sections from your selected topic + plan + dataset info. No fake results.")
@@ -91,12 +172,14 @@ def render_writing_studio(cfg):
         st.caption("Plan included?" + (" Yes" if ctx["plan_md"] else " No"))
         st.caption("Dataset info included?" + (" Yes" if ctx["dataset_md"] else " No"))
 
-    sel = st.multiselect("Choose sections to generate", SECTIONS, default=["Abstract", "Introduction"])
-    write_mode = st.radio("Writing mode", ["Template", "Draft"], index=0, horizontal=True)
+    sel = st.multiselect("Choose sections to generate", SECTIONS, **keep("writing_sections", default=["Abstract", "Introduction"]))
+    modes = ["Template", "Draft"]
+    write_mode = st.radio("Writing mode", modes, horizontal=True, **keep("writing_mode", options=modes, index=0))
     extra_notes = st.text_area(
         "Optional: extra notes / constraints",
         placeholder="e.g., keep it short, focus on reproducibility, emphasize my intended contribution...",
         height=90,
+        **keep("writing_notes", value=""),
     )
 
     col1, col2 = st.columns([1, 1])
@@ -110,9 +193,9 @@ def render_writing_studio(cfg):
         st.rerun()
 
     if gen:
-        writing = st.session_state.artifacts["writing"]
+        prompts = {}
         for section in sel:
-            prompt = writing_studio_prompt(
+            prompts[section] = writing_studio_prompt(
                 cfg,
                 section=section,
                 context={
@@ -121,17 +204,20 @@ def render_writing_studio(cfg):
                 },
                 write_mode=write_mode
             )
-            with st.status(f"Generating {section}...", expanded=False) as status:
-                text = generate_text(prompt)
-                status.update(label=f"{section} generated.", state="complete", expanded=False)
-            writing[section] = text
-        st.session_state.artifacts["writing"] = writing
-        st.success("Generated.")
+        if prompts:
+            start_job(
+                "writing:batch",
+                lambda job: _sections_job(job, prompts, module=__name__),
+                label=f"Generating {len(prompts)} section(s)",
+            )
+
+    busy = poll_job("writing:batch", _store_sections)
 
     writing = st.session_state.artifacts.get("writing", {})
 
     if not writing:
-        st.info("Generate at least one section to see output here.")
+        if not busy:
+            st.info("Generate at least one section to see output here.")
         return
 
     st.divider()
@@ -148,31 +234,19 @@ def render_writing_studio(cfg):
 
                 if regen_sec:
                     prompt = writing_studio_prompt(cfg, section=section, context=ctx, write_mode=write_mode)
-                    with st.status(f"Regenerating {section}...", expanded=False) as status:
-                        try:
-                            new_text = generate_text(prompt)
-                        except Exception as e:
-                            status.update(label=f"{section} regeneration failed.", state="error", expanded=True)
-                            st.error(f"AI request failed: {e}")
-                            st.stop()
-                        status.update(label=f"{section} regenerated.", state="complete", expanded=False)
-
-                    st.session_state.artifacts["writing"][section] = new_text
-                    st.rerun()
+                    start_generation_job(
+                        f"writing:{section}", prompt, label=f"Regenerating {section}",
+                        family="section", use_cache=False, meta={"section": section},
+                    )
 
                 if short_sec:
                     prompt = shorten_prompt(cfg, writing[section])
-                    with st.status(f"Shortening {section}...", expanded=False) as status:
-                        try:
-                            new_text = generate_text(prompt)
-                        except Exception as e:
-                            status.update(label=f"{section} shortening failed.", state="error", expanded=True)
-                            st.error(f"AI request failed: {e}")
-                            st.stop()
-                        status.update(label=f"{section} shortened.", state="complete", expanded=False)
-
-                    st.session_state.artifacts["writing"][section] = new_text
-                    st.rerun()
+                    start_generation_job(
+                        f"writing:{section}", prompt, label=f"Shortening {section}",
+                        family="shorten", meta={"section": section},
+                    )
+
+                poll_job(f"writing:{section}", _store_section)
 
                 st.markdown(st.session_state.artifacts["writing"][section])
 
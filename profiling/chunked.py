@@ -0,0 +1,165 @@
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from profiling.duplicates import duplicate_summary, row_hashes
+from profiling.semantic import ValueSampler
+from profiling.sketches import (
+    EXACT_DISTINCT_BUDGET,
+    EXACT_DISTINCT_MAX_ROWS,
+    DistinctCounter,
+    as_dtype,
+    is_numeric_dtype_name,
+    value_hashes,
+)
+from profiling.stats import SAMPLE_CELLS_STREAMED, ColumnStats
+
+CHUNK_ROWS_DEFAULT = 100_000
+
+
+def widen_dtype(a: Optional[str], b: str) -> str:
+    """dtype of a column whose chunks were parsed as `a` and `b` (pandas would have produced this)."""
+    if a is None or a == b:
+        return b
+    if is_numeric_dtype_name(a) and is_numeric_dtype_name(b):
+        floats = pd.api.types.is_float_dtype(as_dtype(a)) or pd.api.types.is_float_dtype(as_dtype(b))
+        return "float64" if floats else "int64"
+    return "object"
+
+
+class ChunkedProfiler:
+    """
+    Incremental version of the in-memory profile (profiling.progressive): feed chunks with
+    update(), combine partial profilers with merge(), read the usual profile dict from result().
+    Per-chunk work is vectorized; state kept between chunks is never raw rows:
+    - per column: counters, a distinct counter (exact up to EXACT_DISTINCT_BUDGET / n_columns
+      distinct values, capped at EXACT_DISTINCT_MAX_ROWS, then a 16 KB HyperLogLog) and a sample of
+      SAMPLE_VALUES text values;
+    - numeric quantile sample: SAMPLE_CELLS_STREAMED cells shared by the numeric columns;
+    - 64-bit row hashes for duplicates: 8 bytes per row, the only part that grows with the row count.
+    """
+
+    def __init__(self):
+        self.n_rows = 0
+        self.columns: List[str] = []
+        self.dtypes: Dict[str, str] = {}
+        self.null_counts: Dict[str, int] = {}
+        self.distinct: Dict[str, DistinctCounter] = {}
+        self._row_hashes: List[np.ndarray] = []
+        self.stats = ColumnStats(sample_cells=SAMPLE_CELLS_STREAMED)
+        self.values = ValueSampler()
+        self.exact_max = EXACT_DISTINCT_MAX_ROWS
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        if not self.columns:
+            self.columns = [str(c) for c in chunk.columns]
+            self.exact_max = min(EXACT_DISTINCT_MAX_ROWS, max(1, EXACT_DISTINCT_BUDGET // max(len(self.columns), 1)))
+        chunk = chunk.rename(columns=str)
+        self.n_rows += len(chunk)
+
+        nulls = chunk.isna().sum()
+        for c in chunk.columns:
+            self.dtypes[c] = widen_dtype(self.dtypes.get(c), str(chunk[c].dtype))
+            self.null_counts[c] = self.null_counts.get(c, 0) + int(nulls[c])
+
+        # Sorted column order so files that list the same columns differently hash rows identically.
+        self._row_hashes.append(row_hashes(chunk, subset=sorted(chunk.columns), normalize=True))
+        self.stats.update(chunk)
+        self.values.update(chunk)
+        for c in chunk.columns:
+            self.distinct.setdefault(c, DistinctCounter(self.exact_max)).add_hashes(value_hashes(chunk[c]))
+
+    def merge(self, other: "ChunkedProfiler") -> "ChunkedProfiler":
+        for c in other.columns:
+            if c not in self.columns:
+                self.columns.append(c)
+        self.n_rows += other.n_rows
+        for c, d in other.dtypes.items():
+            self.dtypes[c] = widen_dtype(self.dtypes.get(c), d)
+        for c, n in other.null_counts.items():
+            self.null_counts[c] = self.null_counts.get(c, 0) + n
+        for c, d in other.distinct.items():
+            if c in self.distinct:
+                self.distinct[c].merge(d)
+            else:
+                self.distinct[c] = d
+        self._row_hashes.extend(other._row_hashes)
+        self.stats.merge(other.stats)
+        self.values.merge(other.values)
+        return self
+
+    def row_hashes(self) -> np.ndarray:
+        if not self._row_hashes:
+            return np.empty(0, dtype=np.uint64)
+        if len(self._row_hashes) > 1:
+            self._row_hashes = [np.concatenate(self._row_hashes)]
+        return self._row_hashes[0]
+
+    def result(self) -> dict:
+        n_rows, n_cols = self.n_rows, len(self.columns)
+        dups = duplicate_summary(self.row_hashes())
+
+        missing_pct = {
+            c: round(self.null_counts.get(c, 0) / n_rows * 100, 2) if n_rows else 0.0
+            for c in self.columns
+        }
+        nunique = {c: self.distinct[c].count() if c in self.distinct else 0 for c in self.columns}
+        approx = any(d.approximate for d in self.distinct.values())
+
+        num_cols = [c for c in self.columns if is_numeric_dtype_name(self.dtypes.get(c, "object"))]
+        cat_cols = [c for c in self.columns if c not in num_cols]
+
+        likely_id = []
+        if n_rows >= 50:
+            likely_id = [c for c in self.columns if nunique.get(c, 0) >= 0.98 * n_rows]
+
+        top_missing = sorted(missing_pct.items(), key=lambda x: x[1], reverse=True)[:15]
+        return {
+            "shape": (n_rows, n_cols),
+            "dtypes": {c: self.dtypes.get(c, "object") for c in self.columns},
+            "missing_pct": missing_pct,
+            "top_missing": top_missing,
+            "dup_rows": dups["dup_rows"],
+            "dup_groups": dups["dup_groups"],
+            "num_cols": num_cols,
+            "cat_cols": cat_cols,
+            "likely_id": likely_id,
+            "nunique": nunique,
+            "nunique_method": "hll" if approx else "exact",
+            "column_stats": self.stats.result(self.columns),
+            "semantic_types": self.values.result({c: self.dtypes.get(c, "object") for c in self.columns}),
+        }
+
+
+def profile_csv_chunked(
+    source,
+    chunk_rows: int = CHUNK_ROWS_DEFAULT,
+    progress: Optional[Callable[[int, float], None]] = None,
+    read_kwargs: Optional[dict] = None,
+):
+    """
+    Streams a CSV (path or binary file object) through ChunkedProfiler.
+    Peak memory is one parsed chunk plus the per-column state.
+    progress(rows_done, fraction_of_bytes_read) is called after each chunk when the size is known.
+    Returns (profile, preview_head, profiler).
+    """
+    total = None
+    if hasattr(source, "seek"):
+        source.seek(0, 2)
+        total = source.tell()
+        source.seek(0)
+
+    prof = ChunkedProfiler()
+    preview = None
+    for chunk in pd.read_csv(source, chunksize=chunk_rows, **(read_kwargs or {})):
+        if preview is None:
+            preview = chunk.head(25)
+        prof.update(chunk)
+        if progress is not None:
+            frac = min(1.0, source.tell() / total) if total else 0.0
+            progress(prof.n_rows, frac)
+
+    if preview is None:
+        preview = pd.DataFrame()
+    return prof.result(), preview, prof
@@ -0,0 +1,162 @@
+from typing import Callable, List, Optional
+
+import pandas as pd
+
+from profiling.chunked import CHUNK_ROWS_DEFAULT, ChunkedProfiler
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:  # optional: CSV-only without pyarrow
+    pa = None
+
+PARQUET_EXTS = ("parquet", "pq")
+IPC_EXTS = ("feather", "arrow", "ipc")  # Feather v2 is the Arrow IPC file format
+
+
+def columnar_available() -> bool:
+    return pa is not None
+
+
+def columnar_kind(filename: str) -> Optional[str]:
+    """'parquet', 'ipc' or None (not a columnar file) from the upload's extension."""
+    ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if ext in PARQUET_EXTS:
+        return "parquet"
+    if ext in IPC_EXTS:
+        return "ipc"
+    return None
+
+
+def _arrow_source(source):
+    """
+    Zero-copy Arrow view of the input: local paths are memory-mapped, in-memory uploads are
+    wrapped without copying their bytes.
+    """
+    if isinstance(source, str):
+        return pa.memory_map(source, "r")
+    return pa.BufferReader(pa.py_buffer(source.getbuffer()))
+
+
+def _ipc_reader(source, columns: Optional[List[str]] = None):
+    """
+    IPC file reader that only loads (and decompresses) `columns`; opening it reads just the footer.
+    Batches come back in schema order; callers select() to get the requested order.
+    """
+    if columns is None:
+        return ipc.open_file(_arrow_source(source))
+    names = ipc.open_file(_arrow_source(source)).schema.names
+    fields = sorted(names.index(c) for c in columns)
+    return ipc.open_file(_arrow_source(source), options=ipc.IpcReadOptions(included_fields=fields))
+
+
+def _ipc_rows(source, schema) -> int:
+    # Batch lengths live in the batch headers; reading one column per batch keeps decompression minimal.
+    if not len(schema.names):
+        return 0
+    reader = _ipc_reader(source, schema.names[:1])
+    return sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+
+
+def _ipc_batches(reader, columns: Optional[List[str]], chunk_rows: int):
+    """One record batch in memory at a time, re-sliced to at most chunk_rows rows."""
+    for i in range(reader.num_record_batches):
+        batch = reader.get_batch(i)
+        if columns is not None:
+            batch = batch.select(columns)
+        for start in range(0, max(batch.num_rows, 1), chunk_rows):
+            yield batch.slice(start, chunk_rows)
+
+
+def _pandas_dtypes(schema) -> dict:
+    # Same strings the in-memory profile reports after to_pandas(), derived without reading any data.
+    return schema.empty_table().to_pandas().dtypes.astype(str).to_dict()
+
+
+def columnar_metadata(source, kind: str) -> dict:
+    """
+    Rows, columns, dtypes and per-column null counts from file metadata only.
+    Parquet nulls come from row-group statistics (None for a column if any row group lacks them).
+    IPC files have no null statistics in their footer, so IPC null counts are None; their row
+    count comes from the batch lengths, reading one column.
+    """
+    if kind == "parquet":
+        pf = pq.ParquetFile(_arrow_source(source))
+        md = pf.metadata
+        schema = pf.schema_arrow
+        null_counts = {}
+        for i, name in enumerate(schema.names):
+            total = 0
+            for rg in range(md.num_row_groups):
+                stats = md.row_group(rg).column(i).statistics
+                if stats is None or not stats.has_null_count:
+                    total = None
+                    break
+                total += stats.null_count
+            null_counts[name] = total
+        n_rows = md.num_rows
+    else:
+        schema = ipc.open_file(_arrow_source(source)).schema
+        null_counts = {name: None for name in schema.names}
+        n_rows = _ipc_rows(source, schema)
+
+    return {
+        "n_rows": n_rows,
+        "columns": list(schema.names),
+        "dtypes": _pandas_dtypes(schema),
+        "null_counts": null_counts,
+    }
+
+
+def read_columnar(source, kind: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Loads only `columns` (all when None); other IPC columns are never decompressed.
+    Uncompressed IPC reads are zero-copy until the pandas conversion.
+    """
+    if kind == "parquet":
+        table = pq.read_table(_arrow_source(source), columns=columns)
+    else:
+        table = _ipc_reader(source, columns).read_all()
+        if columns is not None:
+            table = table.select(columns)
+    return table.to_pandas()
+
+
+def iter_columnar_chunks(source, kind: str, columns: Optional[List[str]] = None, chunk_rows: int = CHUNK_ROWS_DEFAULT):
+    """
+    (total_rows, iterator of DataFrame chunks) for streaming consumers. IPC files are read one
+    record batch at a time (only the selected columns), so compressed files stream too.
+    """
+    if kind == "parquet":
+        pf = pq.ParquetFile(_arrow_source(source))
+        total = pf.metadata.num_rows
+        batches = pf.iter_batches(batch_size=chunk_rows, columns=columns)
+    else:
+        reader = _ipc_reader(source, columns)
+        total = _ipc_rows(source, reader.schema)
+        batches = _ipc_batches(reader, columns, chunk_rows)
+    return total, (batch.to_pandas() for batch in batches)
+
+
+def profile_columnar_chunked(
+    source,
+    kind: str,
+    columns: Optional[List[str]] = None,
+    chunk_rows: int = CHUNK_ROWS_DEFAULT,
+    progress: Optional[Callable[[int, float], None]] = None,
+):
+    """Columnar counterpart of profile_csv_chunked: record batches feed a ChunkedProfiler."""
+    total, chunks = iter_columnar_chunks(source, kind, columns, chunk_rows)
+    prof = ChunkedProfiler()
+    preview = None
+    for chunk in chunks:
+        if preview is None:
+            preview = chunk.head(25)
+        prof.update(chunk)
+        if progress is not None:
+            progress(prof.n_rows, min(1.0, prof.n_rows / total) if total else 0.0)
+
+    if preview is None:
+        preview = pd.DataFrame()
+    return prof.result(), preview, prof
@@ -0,0 +1,128 @@
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+SAMPLE_ROWS_DEFAULT = 50_000
+CATEGORY_MAX_RATIO = 0.5  # string columns with at most this share of distinct values become categoricals
+CATEGORY_MAX_LEVELS = 10_000
+
+
+def _pyarrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def infer_categoricals(sample: pd.DataFrame) -> Dict[str, str]:
+    """Low-cardinality string columns in a sample, as a read_csv dtype map ({column: 'category'})."""
+    out = {}
+    n = len(sample)
+    for c in sample.columns:
+        s = sample[c]
+        if s.dtype != object and not pd.api.types.is_string_dtype(s.dtype):
+            continue
+        k = s.nunique(dropna=True)
+        if n and k <= CATEGORY_MAX_LEVELS and k / n <= CATEGORY_MAX_RATIO:
+            out[c] = "category"
+    return out
+
+
+_INT_TYPES = ("int8", "int16", "int32")
+# Same-family names of the narrower types: numpy, nullable ("Int64") and Arrow ("int64[pyarrow]").
+_FAMILY_NAMES = {
+    "numpy": {**{t: t for t in _INT_TYPES}, "float32": "float32"},
+    "nullable": {**{t: t.capitalize() for t in _INT_TYPES}, "float32": "Float32"},
+    "arrow": {**{t: f"{t}[pyarrow]" for t in _INT_TYPES}, "float32": "float[pyarrow]"},
+}
+
+
+def _dtype_family(dtype) -> str:
+    if isinstance(dtype, np.dtype):
+        return "numpy"
+    return "arrow" if isinstance(dtype, pd.ArrowDtype) else "nullable"
+
+
+def downcast_numerics(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Smallest signed integer type that holds each int column; floats go to float32 only when every
+    value round-trips exactly, so profiles and reports never see precision loss. Nullable and Arrow
+    columns stay in their own family (Int64 -> Int8, int64[pyarrow] -> int8[pyarrow]).
+    """
+    out = {}
+    for c in df.columns:
+        s = df[c]
+        dtype = s.dtype
+        if pd.api.types.is_bool_dtype(dtype) or not pd.api.types.is_numeric_dtype(dtype):
+            continue
+        names = _FAMILY_NAMES[_dtype_family(dtype)]
+        if pd.api.types.is_signed_integer_dtype(dtype):
+            lo, hi = s.min(), s.max()
+            if pd.isna(lo):
+                continue
+            for t in _INT_TYPES:
+                info = np.iinfo(t)
+                if info.min <= lo and hi <= info.max:
+                    if np.dtype(t).itemsize < np.dtype(str(dtype).split("[")[0].lower()).itemsize:
+                        out[c] = s.astype(names[t])
+                    break
+        elif pd.api.types.is_float_dtype(dtype) and str(dtype) in ("float64", "Float64", "double[pyarrow]"):
+            s32 = s.astype(names["float32"])
+            as_f64 = s.to_numpy(dtype=np.float64, na_value=np.nan)
+            if np.array_equal(s32.to_numpy(dtype=np.float64, na_value=np.nan), as_f64, equal_nan=True):
+                out[c] = s32
+    return df.assign(**out) if out else df
+
+
+def read_csv_compact(
+    source,
+    sample_rows: int = SAMPLE_ROWS_DEFAULT,
+    use_pyarrow: bool = False,
+    read_kwargs: Optional[dict] = None,
+):
+    """
+    Loads a CSV with compact dtypes: a head sample picks categorical columns (passed to the parser,
+    so the object column is never built), then numerics are downcast.
+    use_pyarrow parses with the pyarrow engine into Arrow-backed columns when pyarrow is installed.
+    Returns (df, {"before_bytes", "after_bytes", "categoricals", "engine"}).
+    """
+    kwargs = dict(read_kwargs or {})
+    source.seek(0)
+    sample = pd.read_csv(source, nrows=sample_rows, **kwargs)
+    cats = infer_categoricals(sample)
+
+    engine = "c"
+    if use_pyarrow and _pyarrow_available():
+        engine = "pyarrow"
+        kwargs.update(engine="pyarrow", dtype_backend="pyarrow")
+
+    source.seek(0)
+    df = pd.read_csv(source, dtype=cats or None, **kwargs)
+    df = downcast_numerics(df)
+
+    # The sample was parsed with default dtypes, so scaling its footprint estimates the plain
+    # read_csv frame without ever building it.
+    per_row = sample.memory_usage(index=False, deep=True).sum() / max(len(sample), 1)
+    return df, {
+        "before_bytes": int(per_row * len(df)),
+        "after_bytes": int(df.memory_usage(index=False, deep=True).sum()),
+        "categoricals": sorted(cats),
+        "engine": engine,
+    }
+
+
+def compact_frame(df: pd.DataFrame, sample_rows: int = SAMPLE_ROWS_DEFAULT):
+    """Same conversions for a frame that is already loaded (columnar inputs). Returns (df, report)."""
+    before = int(df.memory_usage(index=False, deep=True).sum())
+    cats = infer_categoricals(df.head(sample_rows))
+    if cats:
+        df = df.astype(cats)
+    df = downcast_numerics(df)
+    return df, {
+        "before_bytes": before,
+        "after_bytes": int(df.memory_usage(index=False, deep=True).sum()),
+        "categoricals": sorted(cats),
+        "engine": "arrow",
+    }
@@ -0,0 +1,294 @@
+import os
+import re
+import shutil
+import tempfile
+import weakref
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from profiling.semantic import SAMPLE_VALUES, infer_semantic_types
+from profiling.sketches import EXACT_DISTINCT_MAX_ROWS, is_numeric_dtype_name
+from profiling.stats import HIST_BINS, QUANTILES, TOPK_REPORT, _sig
+
+try:
+    import duckdb
+except ImportError:  # optional: the SQL engine is only offered when installed
+    duckdb = None
+
+QUERY_ROW_LIMIT = 1_000
+TOP_GROUPS = 10
+# pandas.read_csv's default na_values, so missingness matches the pandas path.
+PANDAS_NA_VALUES = (
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+)
+# Restrict CSV type sniffing to what pandas would infer (no dates, no narrow ints).
+_CSV_TYPES = ("BOOLEAN", "BIGINT", "DOUBLE", "VARCHAR")
+# The only spellings pandas.read_csv turns into booleans; DuckDB also accepts yes/no, t/f, ...
+PANDAS_BOOL_TEXT = ("True", "TRUE", "true", "False", "FALSE", "false")
+_INT_DTYPES = {
+    "TINYINT": "int8", "SMALLINT": "int16", "INTEGER": "int32", "BIGINT": "int64",
+    "UTINYINT": "uint8", "USMALLINT": "uint16", "UINTEGER": "uint32", "UBIGINT": "uint64",
+}
+_STRING_DTYPE = str(pd.Series(["a"]).dtype)  # "object", or "str" on pandas 3
+_READ_ONLY_RE = re.compile(r"^\s*(select|with|from)\b", re.IGNORECASE)
+
+
+def duckdb_available() -> bool:
+    return duckdb is not None
+
+
+def _ident(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _literal(text: str) -> str:
+    return "'" + text.replace("'", "''") + "'"
+
+
+def _pandas_dtype(sql_type: str, has_nulls: bool) -> str:
+    """dtype string the pandas loaders would report for a column of this SQL type."""
+    if sql_type == "BOOLEAN":
+        return "object" if has_nulls else "bool"
+    if sql_type in _INT_DTYPES:
+        return "float64" if has_nulls else _INT_DTYPES[sql_type]
+    if sql_type == "FLOAT":
+        return "float32"
+    if sql_type == "DOUBLE" or sql_type.startswith("DECIMAL"):
+        return "float64"
+    if sql_type == "VARCHAR":
+        return _STRING_DTYPE
+    if sql_type.startswith("TIMESTAMP WITH TIME ZONE"):
+        return "datetime64[ns, UTC]"
+    if sql_type.startswith("TIMESTAMP"):
+        return "datetime64[ns]"
+    return "object"
+
+
+def _csv_scan(path: str, varchar: Tuple[str, ...] = ()) -> str:
+    """read_csv() call typed like pandas; `varchar` columns are kept as text."""
+    types = ""
+    if varchar:
+        overrides = ", ".join(f"{_literal(c)}: 'VARCHAR'" for c in varchar)
+        types = f", types = {{{overrides}}}"
+    return (
+        f"read_csv({_literal(path)}, header = true, sample_size = -1, "
+        f"auto_type_candidates = [{', '.join(map(_literal, _CSV_TYPES))}], "
+        f"nullstr = [{', '.join(map(_literal, PANDAS_NA_VALUES))}]{types})"
+    )
+
+
+def _non_pandas_booleans(con, path: str, columns: List[str]) -> Tuple[str, ...]:
+    """Sniffed BOOLEAN columns whose text pandas would leave as strings (yes/no, t/f, ...)."""
+    if not columns:
+        return ()
+    allowed = ", ".join(map(_literal, PANDAS_BOOL_TEXT))
+    checks = ", ".join(f"coalesce(bool_or({_ident(c)} NOT IN ({allowed})), false)" for c in columns)
+    flags = con.execute(f"SELECT {checks} FROM {_csv_scan(path, tuple(columns))}").fetchone()
+    return tuple(c for c, bad in zip(columns, flags) if bad)
+
+
+def _as_dict(value) -> dict:
+    # MAP results arrive as {key: value} or as {"key": [...], "value": [...]} depending on the version.
+    if isinstance(value, dict) and set(value) == {"key", "value"}:
+        return dict(zip(value["key"], value["value"]))
+    return dict(value or {})
+
+
+class DuckDataset:
+    """
+    An upload copied into a temporary on-disk DuckDB database as table `data`.
+    Profiling runs as SQL aggregations inside DuckDB (out of core, multi-threaded); only the
+    aggregated results come back to Python. The database is reopened read-only with external
+    file access disabled, so ad-hoc queries can only read `data`. Removed when garbage collected.
+    """
+
+    def __init__(self, source, kind: Optional[str] = None, columns: Optional[List[str]] = None):
+        self.workdir = tempfile.mkdtemp(prefix="draftwise_duck_")
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.workdir, True)
+        config = {"temp_directory": os.path.join(self.workdir, "spill")}
+        memory_mb = os.getenv("DRAFTWISE_DUCKDB_MEMORY_MB")
+        if memory_mb:
+            config["memory_limit"] = f"{int(memory_mb)}MB"
+
+        raw = os.path.join(self.workdir, "upload.parquet" if kind == "parquet" else "upload.csv")
+        source.seek(0)
+        with open(raw, "wb") as dst:
+            shutil.copyfileobj(source, dst, 1024 * 1024)
+        scan = f"read_parquet({_literal(raw)})" if kind == "parquet" else _csv_scan(raw)
+        select = ", ".join(_ident(c) for c in columns) if columns else "*"
+
+        db = os.path.join(self.workdir, "profile.duckdb")
+        with duckdb.connect(db, config=config) as con:
+            con.execute(f"CREATE TABLE data AS SELECT {select} FROM {scan}")
+            if kind != "parquet":
+                bools = [r[0] for r in con.execute("DESCRIBE data").fetchall() if r[1] == "BOOLEAN"]
+                text = _non_pandas_booleans(con, raw, bools)
+                if text:
+                    # Rare: only re-read when the sniffer accepted spellings pandas does not.
+                    con.execute(f"CREATE OR REPLACE TABLE data AS SELECT {select} FROM {_csv_scan(raw, text)}")
+        os.remove(raw)
+
+        self.con = duckdb.connect(db, read_only=True, config=config)
+        self.con.execute("SET enable_external_access = false")  # can't be switched back on
+        self.schema: List[Tuple[str, str]] = [
+            (name, str(sql_type)) for name, sql_type in self.con.execute(
+                "SELECT column_name, data_type FROM information_schema.columns "
+                "WHERE table_name = 'data' ORDER BY ordinal_position"
+            ).fetchall()
+        ]
+
+    def _cursor(self):
+        # One cursor per call: DuckDB connections must not be shared between threads.
+        return self.con.cursor()
+
+    def _value(self, name: str, sql_type: str) -> str:
+        # pandas counts NaN as missing; SQL keeps it as a value.
+        if sql_type in ("FLOAT", "DOUBLE"):
+            return f"CASE WHEN isnan({_ident(name)}) THEN NULL ELSE {_ident(name)} END"
+        return _ident(name)
+
+    def preview(self, n: int = 25) -> pd.DataFrame:
+        return self._cursor().execute(f"SELECT * FROM data LIMIT {int(n)}").df()
+
+    def iter_chunks(self, chunk_rows: int):
+        """`data` in insertion order as DataFrame chunks (DuckDB fetches whole 2048-row vectors)."""
+        cur = self._cursor().execute("SELECT * FROM data")
+        while True:
+            chunk = cur.fetch_df_chunk(max(1, chunk_rows // 2048))
+            if chunk.empty:
+                return
+            yield chunk
+
+    def profile(self) -> dict:
+        """Same keys as the pandas profile (plus column_stats), from SQL aggregates over `data`."""
+        cur = self._cursor()
+        n_rows = cur.execute("SELECT count(*) FROM data").fetchone()[0]
+        approx = n_rows > EXACT_DISTINCT_MAX_ROWS
+        distinct = "approx_count_distinct" if approx else "count"
+
+        # One scan for counts, distinct counts and numeric moments/quantiles of every column.
+        parts, numeric = [], {}
+        for i, (name, sql_type) in enumerate(self.schema):
+            v = self._value(name, sql_type)
+            parts.append(f"count({v}) AS n{i}")
+            parts.append(f"{distinct}({'' if approx else 'DISTINCT '}{v}) AS d{i}")
+            if is_numeric_dtype_name(_pandas_dtype(sql_type, False)):
+                numeric[name] = i
+                x = f"CAST({v} AS DOUBLE)"
+                qs = ", ".join(str(q) for q in QUANTILES)
+                parts += [
+                    f"min({x}) AS lo{i}", f"max({x}) AS hi{i}", f"avg({x}) AS mean{i}",
+                    f"stddev_samp({x}) AS std{i}", f"approx_quantile({x}, [{qs}]) AS q{i}",
+                ]
+        row = cur.execute(f"SELECT {', '.join(parts)} FROM data").fetchone() if parts else ()
+        agg = dict(zip([d[0] for d in cur.description], row)) if parts else {}
+
+        dtypes, missing_pct, nunique = {}, {}, {}
+        for i, (name, sql_type) in enumerate(self.schema):
+            nulls = n_rows - agg[f"n{i}"]
+            dtypes[name] = _pandas_dtype(sql_type, nulls > 0)
+            missing_pct[name] = round(nulls / n_rows * 100, 2) if n_rows else 0.0
+            nunique[name] = int(agg[f"d{i}"])
+        num_cols = [c for c in dtypes if is_numeric_dtype_name(dtypes[c])]
+        cat_cols = [c for c in dtypes if c not in num_cols]
+
+        likely_id = []
+        if n_rows >= 50:
+            likely_id = [c for c in dtypes if nunique[c] >= 0.98 * n_rows]
+
+        dup_rows, dup_groups = self._duplicates(cur)
+        sample = cur.execute(f"SELECT * FROM data USING SAMPLE {4 * SAMPLE_VALUES} ROWS").df()
+        top_missing = sorted(missing_pct.items(), key=lambda x: x[1], reverse=True)[:15]
+        return {
+            "shape": (n_rows, len(self.schema)),
+            "dtypes": dtypes,
+            "missing_pct": missing_pct,
+            "top_missing": top_missing,
+            "dup_rows": dup_rows,
+            "dup_groups": dup_groups,
+            "num_cols": num_cols,
+            "cat_cols": cat_cols,
+            "likely_id": likely_id,
+            "nunique": nunique,
+            "nunique_method": "hll" if approx else "exact",
+            "column_stats": self._column_stats(cur, agg, numeric),
+            "semantic_types": infer_semantic_types(sample, dtypes=dtypes),
+        }
+
+    def _duplicates(self, cur) -> Tuple[int, List[dict]]:
+        """Rows repeating an earlier row and the largest groups ({"row": first rowid, "count"}), like duplicate_summary."""
+        if not self.schema:
+            return 0, []
+        keys = ", ".join(_ident(name) for name, _ in self.schema)
+        rows = cur.execute(
+            f"WITH g AS (SELECT min(rowid) AS first_row, count(*) AS copies FROM data GROUP BY {keys}) "
+            f"SELECT first_row, copies, sum(copies - 1) OVER () FROM g WHERE copies > 1 "
+            f"ORDER BY copies DESC, first_row LIMIT {TOP_GROUPS}"
+        ).fetchall()
+        if not rows:
+            return 0, []
+        return int(rows[0][2]), [{"row": int(r), "count": int(n)} for r, n, _ in rows]
+
+    def _column_stats(self, cur, agg: dict, numeric: Dict[str, int]) -> Dict[str, dict]:
+        """Per-column summaries in ColumnStats.result()'s format; histograms come from one more scan."""
+        types, bins = dict(self.schema), []
+        for name, i in numeric.items():
+            lo, hi = agg[f"lo{i}"], agg[f"hi{i}"]
+            if agg[f"n{i}"] and hi > lo:
+                x = f"CAST({self._value(name, types[name])} AS DOUBLE)"
+                b = f"least(CAST(floor(({x} - {lo!r}) / {(hi - lo) / HIST_BINS!r}) AS INTEGER), {HIST_BINS - 1})"
+                # least() skips NULLs, so missing values must be filtered out explicitly.
+                bins.append((name, f"histogram({b}) FILTER (WHERE {x} IS NOT NULL) AS h{i}"))
+        hists = {}
+        if bins:
+            row = cur.execute(f"SELECT {', '.join(expr for _, expr in bins)} FROM data").fetchone()
+            hists = {name: _as_dict(h) for (name, _), h in zip(bins, row)}
+
+        out = {}
+        for name, sql_type in self.schema:
+            if name in numeric:
+                i = numeric[name]
+                n = agg[f"n{i}"]
+                if not n:
+                    out[name] = {"kind": "numeric", "count": 0}
+                    continue
+                hist = [0] * HIST_BINS
+                if name in hists:
+                    for b, count in hists[name].items():
+                        if b is not None:
+                            hist[int(b)] = int(count)
+                else:
+                    hist[HIST_BINS // 2] = int(n)  # constant column: np.histogram puts it in the middle bin
+                out[name] = {
+                    "kind": "numeric",
+                    "count": int(n),
+                    "min": _sig(agg[f"lo{i}"]),
+                    "max": _sig(agg[f"hi{i}"]),
+                    "mean": _sig(agg[f"mean{i}"]),
+                    "std": _sig(agg[f"std{i}"]) if n > 1 else 0.0,
+                    "q": [_sig(q) for q in agg[f"q{i}"]],
+                    "hist": hist,
+                }
+            else:
+                v = self._value(name, sql_type)
+                label = f"CASE WHEN {v} THEN 'True' ELSE 'False' END" if sql_type == "BOOLEAN" else f"CAST({v} AS VARCHAR)"
+                top = cur.execute(
+                    f"SELECT {label} AS v, count(*) AS n FROM data WHERE {v} IS NOT NULL "
+                    f"GROUP BY 1 ORDER BY n DESC, v LIMIT {TOPK_REPORT}"
+                ).fetchall()
+                out[name] = {"kind": "categorical", "top": [[str(val)[:60], int(n)] for val, n in top]}
+        return out
+
+    def query(self, sql: str, limit: int = QUERY_ROW_LIMIT) -> Tuple[pd.DataFrame, bool]:
+        """Runs one read-only SELECT against `data`; returns (first `limit` rows, truncated)."""
+        sql = sql.strip().rstrip(";").strip()
+        if not _READ_ONLY_RE.match(sql) or ";" in sql:
+            raise ValueError("Only a single SELECT / WITH query is allowed.")
+        df = self._cursor().sql(sql).limit(limit + 1).df()
+        return df.head(limit), len(df) > limit
+
+    def close(self) -> None:
+        self.con.close()
+        self._finalizer()
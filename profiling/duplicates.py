@@ -0,0 +1,83 @@
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from profiling.sketches import normalize_for_hash
+
+TOP_GROUPS_DEFAULT = 10
+
+
+_MIX = np.uint64(0x100000001B3)
+
+
+def _column_hash(s: pd.Series, per_frame: bool = False) -> np.ndarray:
+    if per_frame and s.dtype == object and pd.api.types.infer_dtype(s, skipna=True) not in ("string", "empty"):
+        # Non-string Python objects would be hashed via str() (1 and "1" collide); factorize
+        # compares them like df.duplicated() does, but its codes only mean something within this frame.
+        codes, _ = pd.factorize(s)
+        return pd.util.hash_array(codes.astype(np.int64))
+    if s.dtype == object or pd.api.types.is_string_dtype(s.dtype):
+        # Hash the values directly: categorize=True would factorize first, which only pays
+        # off for low-cardinality columns and is the slow step on wide text tables.
+        vals = s.to_numpy(dtype=object)
+        mask = s.isna().to_numpy()
+        if mask.any():
+            vals = vals.copy()
+            vals[mask] = None  # None, NaN and pd.NA are the same missing value for duplicates
+        return pd.util.hash_array(vals, categorize=False)
+    if pd.api.types.is_float_dtype(s.dtype):
+        s = s + 0.0  # -0.0 and 0.0 are one value for df.duplicated()
+    return pd.util.hash_pandas_object(s, index=False).to_numpy()
+
+
+def row_hashes(
+    df: pd.DataFrame,
+    subset: Optional[Sequence[str]] = None,
+    normalize: bool = False,
+    on_column: Optional[Callable[[str, pd.Series, np.ndarray], None]] = None,
+) -> np.ndarray:
+    """
+    One 64-bit digest per row, computed column by column (vectorized) and folded together, so the
+    extra memory is a couple of uint64 arrays of length n_rows regardless of how wide the frame is.
+    Without normalize, digests follow df.duplicated() exactly but only compare within this frame;
+    normalize=True makes them comparable across frames parsed with different dtypes.
+    on_column(name, values, hashes) sees each column's cell hashes (nulls included) before folding.
+    """
+    cols = list(subset) if subset else list(df.columns)
+    if not cols or not len(df):
+        return np.empty(0, dtype=np.uint64)
+    acc = np.zeros(len(df), dtype=np.uint64)
+    for c in cols:
+        s = normalize_for_hash(df[c]) if normalize else df[c]
+        h = _column_hash(s, per_frame=not normalize)
+        if on_column is not None:
+            on_column(c, s, h)
+        acc *= _MIX
+        acc ^= h
+    return acc
+
+
+def duplicate_summary(hashes: np.ndarray, top_k: int = TOP_GROUPS_DEFAULT) -> dict:
+    """
+    Duplicate count (rows that repeat an earlier row, like df.duplicated().sum()) plus the
+    largest duplicated groups as {"row": first occurrence position, "count": group size}.
+    """
+    n = len(hashes)
+    if n == 0:
+        return {"dup_rows": 0, "dup_groups": []}
+    uniq, first, counts = np.unique(hashes, return_index=True, return_counts=True)
+    dup_rows = int(n - len(uniq))
+
+    groups: List[dict] = []
+    if dup_rows and top_k:
+        repeated = np.flatnonzero(counts > 1)
+        k = min(top_k, len(repeated))
+        order = repeated[np.argsort(-counts[repeated], kind="stable")[:k]]
+        groups = [{"row": int(first[i]), "count": int(counts[i])} for i in order]
+    return {"dup_rows": dup_rows, "dup_groups": groups}
+
+
+def near_duplicates(df: pd.DataFrame, subset: Sequence[str], top_k: int = TOP_GROUPS_DEFAULT) -> dict:
+    """Rows that repeat on the chosen columns only (e.g. the same text with a different id)."""
+    return duplicate_summary(row_hashes(df, subset), top_k=top_k)
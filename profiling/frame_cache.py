@@ -0,0 +1,112 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import pandas as pd
+
+FRAME_CACHE_MB_DEFAULT = 1024
+
+
+class CachedFrame:
+    def __init__(self, digest: str, df: pd.DataFrame, nbytes: int):
+        self.digest = digest
+        self.df = df
+        self.nbytes = nbytes
+        self.results: Dict[Any, Any] = {}  # memoized derived results (profiles, reports inputs)
+
+
+class FrameCache:
+    """
+    Process-wide LRU of loaded DataFrames keyed by a content hash of the upload, with a memory budget.
+    Cached frames are shared between sessions and must be treated as read-only.
+    """
+
+    def __init__(self, budget_bytes: int):
+        self.budget_bytes = budget_bytes
+        self._entries: "OrderedDict[str, CachedFrame]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, digest: str) -> Optional[CachedFrame]:
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return entry
+
+    def put(self, digest: str, df: pd.DataFrame) -> CachedFrame:
+        entry = CachedFrame(digest, df, int(df.memory_usage(deep=True).sum()))
+        with self._lock:
+            self._entries[digest] = entry
+            self._entries.move_to_end(digest)
+            # Evict least recently used files, but never the one just loaded.
+            while self._total() > self.budget_bytes and len(self._entries) > 1:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def memo(self, entry: CachedFrame, key: Any, compute: Callable[[], Any]) -> Any:
+        if key not in entry.results:
+            entry.results[key] = compute()
+        return entry.results[key]
+
+    def _total(self) -> int:
+        return sum(e.nbytes for e in self._entries.values())
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "files": len(self._entries),
+                "bytes": self._total(),
+                "budget_bytes": self.budget_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class SessionLRU(OrderedDict):
+    """
+    Small count-bounded LRU for per-session memos (profiles, samples, open datasets) keyed by upload.
+    Evicted values are passed to on_evict, e.g. to close a database or delete an export.
+    """
+
+    def __init__(self, maxsize: int, on_evict: Optional[Callable[[Any], None]] = None):
+        super().__init__()
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            _, old = self.popitem(last=False)
+            if self.on_evict is not None:
+                self.on_evict(old)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_frame_cache() -> FrameCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            mb = float(os.getenv("DRAFTWISE_FRAME_CACHE_MB", FRAME_CACHE_MB_DEFAULT))
+            _cache = FrameCache(int(mb * 1024 * 1024))
+        return _cache
@@ -0,0 +1,280 @@
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+MAX_ROWS = 50_000  # leakage statistics are computed on a deterministic row sample of this size
+BINS = 16  # value bins per column (numeric quantiles / most frequent categories), plus one for missing
+CLASS_MAX = 50  # targets with more distinct values are treated as regression targets
+BATCH_CELLS = 4_000_000  # rows x columns processed per batched pass
+MI_FLAG = 0.5  # share of the target's entropy explained by one column
+PURITY_FLAG = 0.98  # target predicted from one column's value alone
+CORR_FLAG = 0.95
+
+# Name tokens that usually describe something recorded after (or because of) the outcome. They count
+# only as a whole-token suffix ("loan_status", "is_churned") or prefix ("final_grade", "days_to_close")
+# of a column name, so "status_id" or "post_code" are not flagged.
+POST_OUTCOME_SUFFIXES = (
+    "outcome", "result", "label", "target", "status", "resolved", "resolution", "closed", "approved",
+    "rejected", "canceled", "cancelled", "refund", "refunded", "churn", "churned", "default", "defaulted",
+    "paid", "diagnosis", "diagnosed", "discharge", "discharged", "death", "died", "survived", "fraud",
+    "chargeback", "converted", "response", "feedback", "review score", "end date", "duration",
+)
+POST_OUTCOME_PREFIXES = ("final", "days to", "time to", "after")
+_NAME_TOKEN_RE = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+")
+_ID_PREFIX_RE = re.compile(r"^([A-Za-z]+)")
+
+
+def resolve_target(columns: List[str], hint: str) -> Optional[str]:
+    """Column named by the user's free-text hint (exact, then case-insensitive match)."""
+    hint = (hint or "").strip().strip("`'\"")
+    if not hint:
+        return None
+    if hint in columns:
+        return hint
+    lowered = {c.lower(): c for c in columns}
+    return lowered.get(hint.lower())
+
+
+def _name_tokens(name: str) -> List[str]:
+    """Lowercase word tokens of a column name (snake_case, kebab-case, camelCase and spaces)."""
+    return [t.lower() for t in _NAME_TOKEN_RE.findall(str(name))]
+
+
+def _starts_or_ends_with(tokens: List[str], phrase: List[str], start: bool = True, end: bool = True) -> bool:
+    """True when `phrase` is a whole-token prefix (start) or suffix (end) of `tokens`."""
+    k = len(phrase)
+    if not 0 < k <= len(tokens):
+        return False
+    return (start and tokens[:k] == phrase) or (end and tokens[-k:] == phrase)
+
+
+def _post_outcome_name(name: str, target: str) -> bool:
+    """Name looks recorded after the outcome, or is built from the full target name (e.g. `sale_price_log`)."""
+    tokens = _name_tokens(name)
+    return (
+        any(_starts_or_ends_with(tokens, p.split(), start=False) for p in POST_OUTCOME_SUFFIXES)
+        or any(_starts_or_ends_with(tokens, p.split(), end=False) for p in POST_OUTCOME_PREFIXES)
+        or _starts_or_ends_with(tokens, _name_tokens(target))
+    )
+
+
+def _id_like(s: pd.Series) -> bool:
+    """Identifiers are integers or strings (incl. hashes); near-unique floats are measurements, not ids."""
+    dtype = s.dtype
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_datetime64_any_dtype(dtype):
+        return False
+    if pd.api.types.is_numeric_dtype(dtype):
+        return pd.api.types.is_integer_dtype(dtype)
+    return True
+
+
+def _sample_rows(df: pd.DataFrame, max_rows: int) -> pd.DataFrame:
+    if len(df) <= max_rows:
+        return df
+    return df.sample(n=max_rows, random_state=0)
+
+
+def _encode_target(y: pd.Series):
+    """(codes, n_levels, task, numeric_values_or_None); missing targets get code -1."""
+    k = y.nunique(dropna=True)
+    numeric = pd.api.types.is_numeric_dtype(y.dtype) and not pd.api.types.is_bool_dtype(y.dtype)
+    if numeric and k > CLASS_MAX:
+        vals = y.to_numpy(dtype=np.float64, na_value=np.nan)
+        edges = np.unique(np.nanquantile(vals, np.linspace(0, 1, 11)[1:-1]))
+        codes = np.searchsorted(edges, vals, side="right")
+        codes[np.isnan(vals)] = -1
+        return codes.astype(np.int64), len(edges) + 1, "regression", vals
+    codes, uniques = pd.factorize(y)
+    vals = codes.astype(np.float64) if k == 2 else None  # binary targets also get correlations
+    if vals is not None:
+        vals[codes < 0] = np.nan
+    return codes.astype(np.int64), max(len(uniques), 1), "classification", vals
+
+
+def _numeric_codes(block: np.ndarray) -> np.ndarray:
+    """Quantile-bin every column of a float block at once; NaN -> bin BINS."""
+    # One sort for the whole block (NaNs sort last) and per-column quantile positions;
+    # np.nanquantile(axis=0) would loop over columns in Python.
+    ordered = np.sort(block, axis=0)
+    valid = (~np.isnan(block)).sum(axis=0)
+    qs = np.linspace(0, 1, BINS + 1)[1:-1]
+    pos = np.floor(qs[:, None] * np.maximum(valid - 1, 0)[None, :]).astype(np.int64)
+    edges = np.take_along_axis(ordered, pos, axis=0)  # (BINS-1, n_cols)
+    codes = (block[:, :, None] > edges.T[None, :, :]).sum(axis=2)
+    codes[np.isnan(block)] = BINS
+    return codes
+
+
+def _categorical_codes(s: pd.Series) -> np.ndarray:
+    """Most frequent BINS-1 values keep their own code, the rest share one; missing -> BINS."""
+    codes, uniques = pd.factorize(s)
+    if len(uniques) >= BINS:
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        rank = np.empty(len(uniques), dtype=np.int64)
+        rank[np.argsort(-counts, kind="stable")] = np.arange(len(uniques))
+        codes = np.where(codes >= 0, np.minimum(rank[codes], BINS - 1), -1)
+    return np.where(codes >= 0, codes, BINS)
+
+
+def _contingency(codes: np.ndarray, y: np.ndarray, n_levels: int) -> np.ndarray:
+    """(n_cols, BINS+1, n_levels) joint counts for a whole block with one bincount."""
+    n, p = codes.shape
+    width = (BINS + 1) * n_levels
+    flat = (np.arange(p)[None, :] * width + codes * n_levels + y[:, None]).ravel()
+    return np.bincount(flat, minlength=p * width).reshape(p, BINS + 1, n_levels)
+
+
+def _association(table: np.ndarray):
+    """Normalized mutual information and single-column purity for each contingency table."""
+    n = table.sum(axis=(1, 2)).astype(np.float64)
+    pxy = table / n[:, None, None]
+    px = pxy.sum(axis=2, keepdims=True)
+    py = pxy.sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mi = np.nansum(np.where(pxy > 0, pxy * np.log(pxy / (px * py)), 0.0), axis=(1, 2))
+        hy = -np.nansum(np.where(py > 0, py * np.log(py), 0.0), axis=(1, 2))
+        mi_norm = np.where(hy > 0, mi / hy, 0.0)
+    purity = table.max(axis=2).sum(axis=1) / n
+    return mi_norm, purity
+
+
+def _correlations(block: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Pearson r of every column of a float block with y over rows where both are present."""
+    mask = ~np.isnan(block) & ~np.isnan(y)[:, None]
+    m = mask.sum(axis=0).astype(np.float64)
+    x = np.where(mask, block, 0.0)
+    yy = np.where(mask, y[:, None], 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mx, my = x.sum(axis=0) / m, yy.sum(axis=0) / m
+        cov = (x * yy).sum(axis=0) / m - mx * my
+        vx = (x * x).sum(axis=0) / m - mx * mx
+        vy = (yy * yy).sum(axis=0) / m - my * my
+        r = cov / np.sqrt(vx * vy)
+    return np.where(np.isfinite(r), r, np.nan)
+
+
+def _id_prefix(s: pd.Series) -> pd.Series:
+    return s.astype(str).str.extract(_ID_PREFIX_RE.pattern, expand=False)
+
+
+def leakage_scan(
+    df: pd.DataFrame,
+    target: str,
+    likely_id: Optional[List[str]] = None,
+    max_rows: int = MAX_ROWS,
+) -> dict:
+    """
+    Per-column association with `target`, computed in batched NumPy passes over all columns:
+    normalized mutual information (share of the target's entropy), purity (accuracy of predicting
+    the target from the column's value alone), and Pearson r for numeric columns when the target is
+    numeric or binary. Also flags post-outcome-looking names and identifier leaks (IDs whose order or
+    prefix encodes the target). Returns a compact, JSON-friendly dict.
+    """
+    data = _sample_rows(df, max_rows)
+    y_codes, n_levels, task, y_num = _encode_target(data[target])
+    keep = y_codes >= 0
+    data, y_codes = data[keep], y_codes[keep]
+    y_num = y_num[keep] if y_num is not None else None
+    n = len(data)
+    if n == 0:
+        return {
+            "target": target,
+            "task": task,
+            "rows_used": 0,
+            "baseline_accuracy": 0.0,
+            "flagged": [],
+            "post_outcome_names": [],
+            "id_leaks": [],
+            "top_associations": [],
+            "note": "no rows with a non-missing target; nothing to check",
+        }
+
+    features = [c for c in data.columns if c != target]
+    num = [c for c in features if pd.api.types.is_numeric_dtype(data[c].dtype) and not pd.api.types.is_bool_dtype(data[c].dtype)]
+    other = [c for c in features if c not in num]
+
+    stats: Dict[str, dict] = {c: {"column": c} for c in features}
+    batch = max(1, BATCH_CELLS // max(n, 1))
+    baseline = float(np.bincount(y_codes, minlength=n_levels).max() / n) if n else 0.0
+
+    for i in range(0, len(num), batch):
+        cols = num[i:i + batch]
+        block = data[cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        mi, purity = _association(_contingency(_numeric_codes(block), y_codes, n_levels))
+        corr = _correlations(block, y_num) if y_num is not None else np.full(len(cols), np.nan)
+        for c, a, b, r in zip(cols, mi, purity, corr):
+            stats[c].update(mi=float(a), purity=float(b), corr=None if np.isnan(r) else float(r))
+
+    for i in range(0, len(other), batch):
+        cols = other[i:i + batch]
+        codes = np.column_stack([_categorical_codes(data[c]) for c in cols])
+        mi, purity = _association(_contingency(codes, y_codes, n_levels))
+        for c, a, b in zip(cols, mi, purity):
+            stats[c].update(mi=float(a), purity=float(b), corr=None)
+
+    # Identifier leakage: IDs are unique, so their value can't "predict" the target, but their order
+    # (sequential ids assigned per class/time) or a structured prefix ("PAID-0042") can. Only integer
+    # and string columns count as IDs; the association checks above run for every column regardless.
+    if likely_id is None:
+        likely_id = [c for c in features if n >= 50 and data[c].nunique(dropna=True) >= 0.98 * n]
+    ids = [c for c in sorted(set(likely_id)) if c in stats and _id_like(data[c])]
+    id_leaks = []
+    target_num = y_num if y_num is not None else y_codes.astype(np.float64)
+    for i in range(0, len(ids), batch):
+        cols = ids[i:i + batch]
+        # Rank all id columns of the batch at once and correlate the ranks with the target in one pass.
+        ranks = data[cols].rank(method="average").to_numpy(dtype=np.float64, na_value=np.nan)
+        rhos = _correlations(ranks, target_num) if n_levels > 1 else np.full(len(cols), np.nan)
+        for c, rho in zip(cols, rhos):
+            prefix_purity = None
+            prefix = None if pd.api.types.is_numeric_dtype(data[c].dtype) else _id_prefix(data[c])
+            if prefix is not None and prefix.notna().any() and 1 < prefix.nunique() <= BINS:
+                _, p = _association(_contingency(_categorical_codes(prefix)[:, None], y_codes, n_levels))
+                prefix_purity = float(p[0])
+            stats[c]["is_id"] = True
+            stats[c]["id_order_corr"] = None if np.isnan(rho) else float(rho)
+            stats[c]["id_prefix_purity"] = prefix_purity
+            if (not np.isnan(rho) and abs(rho) >= 0.5) or (prefix_purity is not None and prefix_purity >= PURITY_FLAG):
+                id_leaks.append(c)
+
+    post_outcome = [c for c in features if _post_outcome_name(c, target)]
+
+    flagged = []
+    for c, s in stats.items():
+        reasons = []
+        if c in id_leaks:
+            reasons.append("identifier encodes the target (order or prefix)")
+        if s.get("mi", 0) >= MI_FLAG:
+            reasons.append(f"explains {s['mi']:.0%} of target entropy")
+        if s.get("purity", 0) >= PURITY_FLAG and s["purity"] > baseline + 0.01:
+            reasons.append(f"predicts target alone ({s['purity']:.1%} vs {baseline:.1%} majority)")
+        if s.get("corr") is not None and abs(s["corr"]) >= CORR_FLAG:
+            reasons.append(f"|r| = {abs(s['corr']):.2f} with target")
+        if c in post_outcome:
+            reasons.append("name looks post-outcome / target-derived")
+        if reasons:
+            s["reasons"] = reasons
+            flagged.append(c)
+
+    def risk(s):
+        return max(s.get("mi", 0), s.get("purity", 0) - baseline, abs(s.get("corr") or 0))
+
+    ranked = sorted(stats.values(), key=risk, reverse=True)
+    flagged.sort(key=lambda c: risk(stats[c]), reverse=True)
+    return {
+        "target": target,
+        "task": task,
+        "rows_used": n,
+        "baseline_accuracy": round(baseline, 4),
+        "flagged": [
+            {"column": c, "reasons": stats[c]["reasons"]} for c in flagged
+        ],
+        "post_outcome_names": post_outcome,
+        "id_leaks": id_leaks,
+        "top_associations": [
+            {k: (round(v, 4) if isinstance(v, float) else v) for k, v in s.items() if k != "reasons"}
+            for s in ranked[:25]
+        ],
+    }
@@ -0,0 +1,156 @@
+import multiprocessing
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from profiling.chunked import CHUNK_ROWS_DEFAULT, ChunkedProfiler
+from profiling.columnar import columnar_kind, iter_columnar_chunks
+from profiling.splits import split_overlaps
+
+SHARD_EXTS = ("csv", "parquet", "pq", "feather", "arrow", "ipc")
+_SPLIT_RE = re.compile(r"(?<![a-z])(train|training|val|valid|validation|dev|test|testing|holdout)(?![a-z])", re.IGNORECASE)
+_SPLIT_NAMES = {
+    "train": "train", "training": "train",
+    "val": "val", "valid": "val", "validation": "val", "dev": "val",
+    "test": "test", "testing": "test", "holdout": "test",
+}
+
+
+def split_role(name: str) -> Optional[str]:
+    """
+    'train' / 'val' / 'test' from a shard's display name ("archive.zip/folder/file.csv"), else None.
+    The file name decides first, then its folders from the nearest up, and the archive name only as a
+    fallback, so "kaggle_test.zip/data/train.csv" is a train shard.
+    """
+    for part in reversed([p for p in name.replace("\\", "/").split("/") if p]):
+        m = _SPLIT_RE.search(part)
+        if m:
+            return _SPLIT_NAMES[m.group(1).lower()]
+    return None
+
+
+def stage_uploads(uploads, workdir: str) -> List[Tuple[str, str]]:
+    """
+    Writes uploaded files (and the data files inside uploaded zips) to `workdir` so worker
+    processes can open them by path. Returns [(display_name, path)].
+    """
+    shards = []
+    for up in uploads:
+        name = up.name
+        if name.lower().endswith(".zip"):
+            up.seek(0)
+            with zipfile.ZipFile(up) as zf:
+                for info in zf.infolist():
+                    member = info.filename
+                    if info.is_dir() or member.startswith("__MACOSX/") or os.path.basename(member).startswith("."):
+                        continue
+                    if member.rsplit(".", 1)[-1].lower() not in SHARD_EXTS:
+                        continue
+                    path = os.path.join(workdir, f"{len(shards):05d}_{os.path.basename(member)}")
+                    with zf.open(info) as src, open(path, "wb") as dst:
+                        shutil.copyfileobj(src, dst, 1024 * 1024)
+                    shards.append((f"{name}/{member}", path))
+        elif name.rsplit(".", 1)[-1].lower() in SHARD_EXTS:
+            path = os.path.join(workdir, f"{len(shards):05d}_{os.path.basename(name)}")
+            up.seek(0)
+            with open(path, "wb") as dst:
+                shutil.copyfileobj(up, dst, 1024 * 1024)
+            shards.append((name, path))
+    return shards
+
+
+def _profile_shard(path: str, chunk_rows: int):
+    """Process-pool worker: profiles one shard file. Returns (profiler, preview, per-shard dtypes)."""
+    kind = columnar_kind(path)
+    if kind:
+        _, chunks = iter_columnar_chunks(path, kind, chunk_rows=chunk_rows)
+    else:
+        chunks = pd.read_csv(path, chunksize=chunk_rows)
+    prof = ChunkedProfiler()
+    preview = None
+    for chunk in chunks:
+        if preview is None:
+            preview = chunk.head(25)
+        prof.update(chunk)
+    prof.row_hashes()  # concatenate once here, in the worker
+    dtypes = {c: prof.dtypes.get(c, "object") for c in prof.columns}
+    return prof, preview if preview is not None else pd.DataFrame(), dtypes
+
+
+def _schema_report(shard_dtypes: Dict[str, Dict[str, str]]) -> dict:
+    """Columns whose dtype differs between shards, and columns absent from some shards."""
+    all_cols: List[str] = []
+    for dt in shard_dtypes.values():
+        all_cols.extend(c for c in dt if c not in all_cols)
+    conflicts, missing = {}, {}
+    for c in all_cols:
+        seen: Dict[str, List[str]] = {}
+        for shard, dt in shard_dtypes.items():
+            if c in dt:
+                seen.setdefault(dt[c], []).append(shard)
+            else:
+                missing.setdefault(c, []).append(shard)
+        if len(seen) > 1:
+            conflicts[c] = seen
+    return {"dtype_conflicts": conflicts, "missing_columns": missing}
+
+
+def profile_shards(
+    shards: List[Tuple[str, str]],
+    chunk_rows: int = CHUNK_ROWS_DEFAULT,
+    max_workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int, str], None]] = None,
+):
+    """
+    Profiles shards in parallel worker processes and merges the per-shard ChunkedProfilers
+    (counts, distinct sketches, row hashes, column stats) into one dataset profile.
+    Adds shard details, dtype conflicts and train/val/test row overlaps.
+    Returns (profile, preview).
+    """
+    workers = max_workers or min(len(shards), os.cpu_count() or 1)
+    results = {}
+    # Spawned workers: forking the multithreaded Streamlit server can copy locks held by other threads.
+    with ProcessPoolExecutor(max_workers=max(1, workers), mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = {pool.submit(_profile_shard, path, chunk_rows): name for name, path in shards}
+        for i, fut in enumerate(as_completed(futures), 1):
+            name = futures[fut]
+            results[name] = fut.result()
+            if progress is not None:
+                progress(i, len(shards), name)
+
+    merged = ChunkedProfiler()
+    by_split: Dict[str, List[np.ndarray]] = {}
+    shard_rows, shard_dtypes = [], {}
+    preview = None
+    for name, _ in shards:  # merge in upload order so the result doesn't depend on finish order
+        prof, head, dtypes = results[name]
+        role = split_role(name)
+        if preview is None:
+            preview = head
+        if role:
+            by_split.setdefault(role, []).append(prof.row_hashes())
+        shard_dtypes[name] = dtypes
+        shard_rows.append({"shard": name, "split": role or "", "rows": prof.n_rows, "columns": len(prof.columns)})
+        merged.merge(prof)
+
+    profile = merged.result()
+    profile["shards"] = shard_rows
+    profile.update(_schema_report(shard_dtypes))
+    profile["split_overlap"] = split_overlaps({k: np.concatenate(v) for k, v in by_split.items()})
+    return profile, preview if preview is not None else pd.DataFrame()
+
+
+def profile_uploads(uploads, chunk_rows: int = CHUNK_ROWS_DEFAULT, max_workers: Optional[int] = None, progress=None):
+    """stage_uploads + profile_shards in a temporary directory that is removed afterwards."""
+    with tempfile.TemporaryDirectory(prefix="draftwise_shards_") as workdir:
+        shards = stage_uploads(uploads, workdir)
+        if not shards:
+            raise ValueError("No CSV/Parquet/Feather files found in the upload.")
+        return profile_shards(shards, chunk_rows=chunk_rows, max_workers=max_workers, progress=progress)
@@ -0,0 +1,69 @@
+from typing import Iterator, Tuple
+
+import pandas as pd
+
+from profiling.duplicates import duplicate_summary, row_hashes
+from profiling.semantic import infer_semantic_types
+from profiling.sketches import approx_nunique, is_numeric_dtype_name, EXACT_DISTINCT_MAX_ROWS
+from profiling.stats import column_stats
+
+# Metric groups in the order they are computed (cheapest first) and how the UI names them.
+PROFILE_GROUPS = (
+    ("shape", "shape and dtypes"),
+    ("missing", "missingness"),
+    ("duplicates", "duplicate rows"),
+    ("ids", "likely ID columns"),
+    ("semantic", "semantic column types"),
+    ("stats", "extended column statistics"),
+)
+
+
+def shape_group(df: pd.DataFrame) -> dict:
+    num_cols = [c for c in df.columns if is_numeric_dtype_name(df[c].dtype)]
+    return {
+        "shape": df.shape,
+        "dtypes": df.dtypes.astype(str).to_dict(),
+        "num_cols": num_cols,
+        "cat_cols": [c for c in df.columns if c not in num_cols],
+    }
+
+
+def missing_group(df: pd.DataFrame) -> dict:
+    missing_pct = (df.isna().mean() * 100).round(2).to_dict()
+    top_missing = sorted(missing_pct.items(), key=lambda x: x[1], reverse=True)[:15]
+    return {"missing_pct": missing_pct, "top_missing": top_missing}
+
+
+def duplicates_group(df: pd.DataFrame) -> dict:
+    # Hash each row once instead of df.duplicated()'s row-wise comparisons; memory grows with rows only.
+    dups = duplicate_summary(row_hashes(df))
+    return {"dup_rows": dups["dup_rows"], "dup_groups": dups["dup_groups"]}
+
+
+def ids_group(df: pd.DataFrame) -> dict:
+    n_rows = len(df)
+    # Exact distinct counts hash every value into a per-column table; past EXACT_DISTINCT_MAX_ROWS
+    # a 16 KB HyperLogLog per column is enough for the 98%-unique ID test.
+    approx = n_rows > EXACT_DISTINCT_MAX_ROWS
+    nunique = approx_nunique(df) if approx else df.nunique(dropna=True).to_dict()
+    likely_id = []
+    if n_rows >= 50:
+        likely_id = [c for c in df.columns if nunique.get(c, 0) >= 0.98 * n_rows]
+    return {"nunique": nunique, "nunique_method": "hll" if approx else "exact", "likely_id": likely_id}
+
+
+_GROUP_FNS = {
+    "shape": shape_group,
+    "missing": missing_group,
+    "duplicates": duplicates_group,
+    "ids": ids_group,
+    "semantic": lambda df: {"semantic_types": infer_semantic_types(df)},
+    "stats": lambda df: {"column_stats": column_stats(df)},
+}
+
+
+def iter_profile_groups(df: pd.DataFrame) -> Iterator[Tuple[str, dict]]:
+    """Yields (group, profile keys) one metric group at a time, so callers can show each as it lands."""
+    for name, _ in PROFILE_GROUPS:
+        yield name, _GROUP_FNS[name](df)
+
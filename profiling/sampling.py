@@ -0,0 +1,240 @@
+import math
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from profiling.chunked import CHUNK_ROWS_DEFAULT, widen_dtype
+from profiling.duplicates import row_hashes
+from profiling.semantic import infer_semantic_types
+from profiling.sketches import HyperLogLog, is_numeric_dtype_name
+from profiling.stats import SAMPLE_CELLS_STREAMED, ColumnStats
+
+SAMPLE_ROWS_DEFAULT = 100_000
+Z_95 = 1.96
+
+
+def wilson_interval(successes: int, n: int, z: float = Z_95) -> Tuple[float, float]:
+    """Wilson score interval for a binomial proportion (well-behaved near 0 and 1)."""
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    denom = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def cluster_ratio_interval(y: np.ndarray, x: np.ndarray, z: float = Z_95) -> Tuple[float, float, float]:
+    """
+    Row share sum(y) / sum(x) with a 95% interval, where each sampled distinct row contributes x rows
+    (its copies) of which y count. The distinct row is the sampling unit (all its copies come in
+    together), so this is a ratio estimator over clusters, not a binomial over rows.
+    Returns (estimate, low, high).
+    """
+    d = len(x)
+    if d == 0:
+        return 0.0, 0.0, 1.0
+    y, x = y.astype(np.float64), x.astype(np.float64)
+    r = float(y.sum() / x.sum())
+    if d < 2:
+        return r, 0.0, 1.0
+    if r == 0.0:
+        # Nothing seen: bound the share of distinct rows that could have it instead of claiming exactly 0.
+        return 0.0, 0.0, wilson_interval(0, d, z)[1]
+    if r == 1.0:
+        return 1.0, wilson_interval(d, d, z)[0], 1.0
+    resid = y - r * x
+    se = math.sqrt(float((resid ** 2).sum()) / (d - 1) / d) / float(x.mean())
+    return r, max(0.0, r - z * se), min(1.0, r + z * se)
+
+
+class SampledProfiler:
+    """
+    One streaming pass that keeps a bounded uniform sample of rows and reports the in-memory profile's
+    metrics as estimates with 95% intervals.
+
+    Rows are sampled by their content hash (bottom-k over distinct row digests): every row has the
+    same inclusion probability, and all copies of a row are in or out together, so duplicates
+    inside the sample estimate the duplicate rate without bias. Each kept digest stores one row and
+    its copy count, so memory is bounded by k distinct rows however duplicated the data is. Because
+    copies come in clusters, intervals treat distinct rows as the sampling unit
+    (cluster_ratio_interval). Cardinality comes from one HyperLogLog per column over the full
+    stream, not from the sample.
+    """
+
+    def __init__(self, sample_rows: int = SAMPLE_ROWS_DEFAULT):
+        self.k = sample_rows
+        self.n_rows = 0
+        self.columns: List[str] = []
+        self.dtypes: Dict[str, str] = {}
+        self.hll: Dict[str, HyperLogLog] = {}
+        self.value_counts: Dict[str, int] = {}
+        self._sample: Optional[pd.DataFrame] = None  # one row per kept digest, aligned with _hashes
+        self._hashes = np.empty(0, dtype=np.uint64)  # sorted, distinct
+        self._copies = np.empty(0, dtype=np.int64)
+        self._threshold = np.iinfo(np.uint64).max
+        self._saturated = False  # True once rows have been dropped, i.e. results are estimates
+        self.stats = ColumnStats(sample_cells=SAMPLE_CELLS_STREAMED)
+
+    def _sketch_column(self, c: str, s: pd.Series, h: np.ndarray) -> None:
+        valid = s.notna().to_numpy()
+        self.value_counts[c] = self.value_counts.get(c, 0) + int(valid.sum())
+        self.hll.setdefault(c, HyperLogLog()).add_hashes(h[valid])
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        if not self.columns:
+            self.columns = [str(c) for c in chunk.columns]
+        chunk = chunk.rename(columns=str)
+        self.n_rows += len(chunk)
+        for c in chunk.columns:
+            self.dtypes[c] = widen_dtype(self.dtypes.get(c), str(chunk[c].dtype))
+
+        self.stats.update(chunk)
+        h = row_hashes(chunk, normalize=True, on_column=self._sketch_column)
+        keep = np.flatnonzero(h <= self._threshold)
+        if not len(keep):
+            return
+        new, first, copies = np.unique(h[keep], return_index=True, return_counts=True)
+        cand = chunk.iloc[keep[first]].reset_index(drop=True)
+        sample = cand if self._sample is None else pd.concat([self._sample, cand], ignore_index=True)
+        hashes = np.concatenate([self._hashes, new])
+        copies = np.concatenate([self._copies, copies])
+
+        distinct, first, inverse = np.unique(hashes, return_index=True, return_inverse=True)
+        copies = np.bincount(inverse, weights=copies).astype(np.int64)
+        if len(distinct) > self.k:
+            self._threshold = distinct[self.k - 1]
+            self._saturated = True
+            distinct, first, copies = distinct[:self.k], first[:self.k], copies[:self.k]
+        self._sample = sample.iloc[first].reset_index(drop=True)
+        self._hashes, self._copies = distinct, copies
+
+    @property
+    def sample(self) -> pd.DataFrame:
+        """
+        Uniform row sample of at most k rows (copies included) for checks that need rows, e.g.
+        leakage: every kept row when they fit, else k rows drawn without replacement.
+        """
+        if self._sample is None:
+            return pd.DataFrame(columns=self.columns)
+        total = int(self._copies.sum())
+        if total <= self.k:
+            pos = np.arange(total)
+        else:
+            pos = np.sort(np.random.default_rng(0).choice(total, size=self.k, replace=False))
+        owner = np.searchsorted(np.cumsum(self._copies), pos, side="right")
+        return self._sample.iloc[owner].reset_index(drop=True)
+
+    def result(self) -> dict:
+        n_rows, n_cols = self.n_rows, len(self.columns)
+        copies = self._copies
+        m = int(copies.sum())  # rows represented by the kept digests
+        exact = not self._saturated
+
+        null_flags = self._sample.isna() if self._sample is not None else pd.DataFrame()
+        missing_pct, missing_ci = {}, {}
+        for c in self.columns:
+            y = null_flags[c].to_numpy() * copies if c in null_flags else np.zeros(len(copies))
+            k = float(y.sum())
+            if exact or not m:
+                lo = hi = k / m if m else 0.0
+            else:
+                _, lo, hi = cluster_ratio_interval(y, copies)
+            missing_pct[c] = round(k / m * 100, 2) if m else 0.0
+            missing_ci[c] = (round(lo * 100, 2), round(hi * 100, 2))
+
+        sample_dups = int(m - len(copies))
+        if exact:
+            dup_rows, dup_ci = sample_dups, (sample_dups, sample_dups)
+        else:
+            rate, lo, hi = cluster_ratio_interval(copies - 1, copies)
+            dup_rows = int(round(rate * n_rows))
+            dup_ci = (int(lo * n_rows), int(math.ceil(hi * n_rows)))
+
+        nunique, nunique_ci = {}, {}
+        for c in self.columns:
+            hll = self.hll.get(c)
+            seen = self.value_counts.get(c, 0)
+            est = min(round(hll.estimate()), seen) if hll is not None else 0
+            err = Z_95 * hll.relative_error * est if hll is not None else 0
+            nunique[c] = int(est)
+            nunique_ci[c] = (int(max(0, est - err)), int(min(seen, est + err)))
+
+        num_cols = [c for c in self.columns if is_numeric_dtype_name(self.dtypes.get(c, "object"))]
+        cat_cols = [c for c in self.columns if c not in num_cols]
+
+        likely_id = []
+        if n_rows >= 50:
+            likely_id = [c for c in self.columns if nunique.get(c, 0) >= 0.98 * n_rows]
+
+        top_missing = sorted(missing_pct.items(), key=lambda x: x[1], reverse=True)[:15]
+        return {
+            "shape": (n_rows, n_cols),
+            "dtypes": {c: self.dtypes.get(c, "object") for c in self.columns},
+            "missing_pct": missing_pct,
+            "top_missing": top_missing,
+            "dup_rows": dup_rows,
+            "dup_groups": [],
+            "num_cols": num_cols,
+            "cat_cols": cat_cols,
+            "likely_id": likely_id,
+            "nunique": nunique,
+            "nunique_method": "hll",
+            "column_stats": self.stats.result(self.columns),
+            "semantic_types": infer_semantic_types(self.sample, dtypes=self.dtypes),
+            "estimates": {
+                "sample_rows": m,
+                "exact_sample": exact,
+                "missing_pct_ci": missing_ci,
+                "dup_rows_ci": dup_ci,
+                "nunique_ci": nunique_ci,
+                "confidence": 0.95,
+            },
+        }
+
+
+def sample_profile(
+    chunks,
+    total_rows: Optional[int] = None,
+    total_bytes: Optional[int] = None,
+    source=None,
+    sample_rows: int = SAMPLE_ROWS_DEFAULT,
+    progress: Optional[Callable[[int, float], None]] = None,
+):
+    """
+    Runs SampledProfiler over an iterable of DataFrame chunks.
+    Progress is reported against total_rows, or against total_bytes via source.tell() for CSV streams.
+    Returns (profile, preview_head, profiler).
+    """
+    prof = SampledProfiler(sample_rows)
+    preview = None
+    for chunk in chunks:
+        if preview is None:
+            preview = chunk.head(25)
+        prof.update(chunk)
+        if progress is not None:
+            if total_rows:
+                frac = prof.n_rows / total_rows
+            elif total_bytes and source is not None:
+                frac = source.tell() / total_bytes
+            else:
+                frac = 0.0
+            progress(prof.n_rows, min(1.0, frac))
+
+    if preview is None:
+        preview = pd.DataFrame()
+    return prof.result(), preview, prof
+
+
+def sample_profile_csv(source, sample_rows: int = SAMPLE_ROWS_DEFAULT, chunk_rows: int = CHUNK_ROWS_DEFAULT, progress=None):
+    source.seek(0, 2)
+    total = source.tell()
+    source.seek(0)
+    return sample_profile(
+        pd.read_csv(source, chunksize=chunk_rows),
+        total_bytes=total,
+        source=source,
+        sample_rows=sample_rows,
+        progress=progress,
+    )
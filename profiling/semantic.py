@@ -0,0 +1,131 @@
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from profiling.sketches import as_dtype, is_numeric_dtype_name
+
+SAMPLE_VALUES = 1_000  # non-null values per column the patterns are tested on
+MATCH_SHARE = 0.95  # share of sampled values a pattern must match
+FREE_TEXT_WORDS = 5  # median words per value for free text
+CATEGORY_RATIO = 0.5  # distinct share of the sample below which strings are categorical
+
+# Patterns are compiled once and applied to a whole sample with the vectorized .str methods.
+_HASH_RE = re.compile(
+    r"[0-9a-fA-F]{32}|[0-9a-fA-F]{40}|[0-9a-fA-F]{64}"
+    r"|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+)
+_NUMBER_RE = re.compile(r"[-+(]?[$€£¥]?\s?(\d{1,3}(,\d{3})+|\d+)(\.\d+)?\)?\s?(%|[kKmMbB])?|[-+]?\.\d+")
+_DATETIME_RE = re.compile(
+    r"\d{4}[-/.]\d{1,2}[-/.]\d{1,2}([ T]\d{1,2}:\d{2}(:\d{2}(\.\d+)?)?\s?(Z|[AaPp][Mm]|[+-]\d{2}:?\d{2})?)?"
+    r"|\d{1,2}[-/.]\d{1,2}[-/.]\d{2,4}([ T]\d{1,2}:\d{2}(:\d{2})?\s?([AaPp][Mm])?)?"
+    r"|\d{1,2}\s[A-Za-z]{3,9}\.?,?\s\d{4}|[A-Za-z]{3,9}\.?\s\d{1,2},?\s\d{4}"
+    r"|\d{1,2}:\d{2}(:\d{2})?\s?([AaPp][Mm])?"
+)
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(\.[\w-]+)*\.[A-Za-z]{2,}")
+_URL_RE = re.compile(r"(https?|ftp)://\S+|www\.\S+\.\S+")
+_WORD_RE = re.compile(r"\S+")
+_BOOL_STRINGS = {"true", "false", "yes", "no", "y", "n", "t", "f"}
+
+# Checked in order; the first pattern matching MATCH_SHARE of the sample wins.
+_PATTERNS = (
+    ("hashed_id", _HASH_RE),
+    ("numeric_string", _NUMBER_RE),
+    ("datetime", _DATETIME_RE),
+    ("email", _EMAIL_RE),
+    ("url", _URL_RE),
+)
+# Types the reports give advice for (numeric / boolean / categorical need none).
+NOTABLE_TYPES = ("datetime", "free_text", "email", "url", "boolean_string", "numeric_string", "hashed_id")
+
+
+def classify_values(values: pd.Series, dtype: str) -> str:
+    """Semantic type of one column from a sample of its non-null values and its pandas dtype."""
+    resolved = as_dtype(dtype)
+    if resolved is not None and pd.api.types.is_bool_dtype(resolved):
+        return "boolean"
+    if is_numeric_dtype_name(resolved):
+        return "numeric"
+    if dtype.startswith(("datetime", "timestamp")) or (resolved is not None and pd.api.types.is_datetime64_any_dtype(resolved)):
+        return "datetime"
+    vals = values.astype(str).str.strip()
+    vals = vals[vals != ""]
+    if vals.empty:
+        return "empty"
+
+    lowered = vals.str.lower()
+    if lowered.isin(_BOOL_STRINGS).mean() >= MATCH_SHARE and lowered.nunique() <= 2:
+        return "boolean_string"
+    for name, pattern in _PATTERNS:
+        if vals.str.fullmatch(pattern).mean() >= MATCH_SHARE:
+            return name
+    if vals.str.count(_WORD_RE).median() >= FREE_TEXT_WORDS:
+        return "free_text"
+    return "categorical" if vals.nunique() <= CATEGORY_RATIO * len(vals) else "short_text"
+
+
+def infer_semantic_types(
+    df: pd.DataFrame, dtypes: Optional[Dict[str, str]] = None, sample_values: int = SAMPLE_VALUES, seed: int = 0
+) -> Dict[str, str]:
+    """
+    {column: semantic type} from a bounded row sample, so cost does not grow with the row count.
+    `dtypes` overrides df's dtypes (e.g. the widened dtypes of a chunked profile).
+    """
+    if len(df) > 4 * sample_values:
+        # Oversample rows so sparse columns still get enough non-null values.
+        rows = np.random.default_rng(seed).choice(len(df), 4 * sample_values, replace=False)
+        df = df.iloc[np.sort(rows)]
+    out = {}
+    for c in df.columns:
+        dtype = (dtypes or {}).get(str(c)) or str(df[c].dtype)
+        out[str(c)] = classify_values(df[c].dropna().head(sample_values), dtype)
+    return out
+
+
+def group_by_type(types: Dict[str, str]) -> Dict[str, List[str]]:
+    """{type: [columns]} for the types listed in NOTABLE_TYPES."""
+    groups: Dict[str, List[str]] = {}
+    for c, t in types.items():
+        if t in NOTABLE_TYPES:
+            groups.setdefault(t, []).append(c)
+    return groups
+
+
+class ValueSampler:
+    """
+    Bounded uniform sample of each non-numeric column's non-null values over a stream of chunks
+    (bottom-k of random keys, so samplers from different chunks or files merge).
+    """
+
+    def __init__(self, sample_values: int = SAMPLE_VALUES, seed: int = 0):
+        self.k = sample_values
+        self._rng = np.random.default_rng(seed)
+        self.values: Dict[str, pd.Series] = {}
+        self.keys: Dict[str, np.ndarray] = {}
+
+    def _merge(self, c: str, values: pd.Series, keys: np.ndarray) -> None:
+        if c in self.values:
+            values = pd.concat([self.values[c], values], ignore_index=True)
+            keys = np.concatenate([self.keys[c], keys])
+        if len(keys) > self.k:
+            keep = np.argpartition(keys, self.k)[: self.k]
+            values, keys = values.iloc[keep].reset_index(drop=True), keys[keep]
+        self.values[c], self.keys[c] = values, keys
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        for c in chunk.columns:
+            s = chunk[c]
+            if is_numeric_dtype_name(s.dtype) or pd.api.types.is_bool_dtype(s.dtype):
+                continue
+            s = s.dropna().astype(str).reset_index(drop=True)
+            self._merge(str(c), s, self._rng.random(len(s)))
+
+    def merge(self, other: "ValueSampler") -> "ValueSampler":
+        for c, values in other.values.items():
+            self._merge(c, values, other.keys[c])
+        return self
+
+    def result(self, dtypes: Dict[str, str]) -> Dict[str, str]:
+        empty = pd.Series([], dtype=object)
+        return {c: classify_values(self.values.get(c, empty), d) for c, d in dtypes.items()}
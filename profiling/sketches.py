@@ -0,0 +1,199 @@
+import numpy as np
+import pandas as pd
+
+HLL_P_DEFAULT = 14  # 16384 registers, ~0.81% standard error, 16 KB per column
+EXACT_DISTINCT_MAX_ROWS = 200_000  # below this, distinct counts are exact
+EXACT_DISTINCT_BUDGET = 2_000_000  # exact distinct hashes kept across all columns of a streamed profile (16 MB)
+
+
+def as_dtype(dtype):
+    """pandas dtype object for a dtype or its name ("int64", "Int64", "double[pyarrow]", ...), else None."""
+    if not isinstance(dtype, str):
+        return dtype
+    try:
+        return pd.api.types.pandas_dtype(dtype)
+    except (TypeError, ValueError):
+        return None
+
+
+def is_numeric_dtype_name(dtype) -> bool:
+    """
+    Numeric dtype (or dtype name), including nullable ("Int64", "Float64") and Arrow
+    ("int64[pyarrow]", "double[pyarrow]") dtypes; bool and object are not numeric.
+    """
+    dtype = as_dtype(dtype)
+    if dtype is None:
+        return False
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+def normalize_for_hash(s: pd.Series) -> pd.Series:
+    """
+    Equal cells must hash equally even when chunks/files parsed a column with different dtypes
+    (int64 in one chunk, float64 in another because of a missing value).
+    """
+    if is_numeric_dtype_name(s.dtype):
+        return s.astype("float64") + 0.0  # -0.0 == 0.0 for pandas, but their bits (and hashes) differ
+    if pd.api.types.is_bool_dtype(s.dtype):
+        # numpy, nullable and Arrow booleans hash alike
+        return s.astype(object).where(s.notna(), None)
+    return s.astype(str).where(s.notna(), None)
+
+
+def value_hashes(s: pd.Series) -> np.ndarray:
+    """64-bit hashes of the non-null values of a column (vectorized)."""
+    vals = normalize_for_hash(s).dropna()
+    return pd.util.hash_pandas_object(vals, index=False).to_numpy()
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct counter over 64-bit hashes.
+    Relative standard error is 1.04 / sqrt(2^p); sketches with the same p merge by register-wise max,
+    so per-chunk or per-file sketches combine into the sketch of the union.
+    """
+
+    def __init__(self, p: int = HLL_P_DEFAULT):
+        self.p = p
+        self.m = 1 << p
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / np.sqrt(self.m)
+
+    def add_hashes(self, h: np.ndarray) -> None:
+        if len(h) == 0:
+            return
+        h = np.asarray(h, dtype=np.uint64)
+        bits = 64 - self.p
+        idx = (h >> np.uint64(bits)).astype(np.int64)
+        w = h & np.uint64((1 << bits) - 1)
+        # rho = position of the leftmost 1-bit in the remaining `bits`-wide word (bits+1 if all zero).
+        # w < 2^50 converts to float64 exactly, so log2 gives the exact bit length.
+        rho = np.full(len(h), bits + 1, dtype=np.uint8)
+        nz = w > 0
+        rho[nz] = (bits - np.floor(np.log2(w[nz].astype(np.float64)))).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rho)
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.p != self.p:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self) -> float:
+        # Ertl's improved estimator ("New cardinality estimation algorithms for HyperLogLog
+        # sketches", 2017): no empirical bias tables and no switch-over bias between linear
+        # counting and the raw estimate.
+        m, q = self.m, 64 - self.p
+        counts = np.bincount(self.registers, minlength=q + 2).astype(np.float64)
+        if counts[0] == m:
+            return 0.0
+        z = m * _tau(1 - counts[q + 1] / m)
+        for k in range(q, 0, -1):
+            z = 0.5 * (z + counts[k])
+        z += m * _sigma(counts[0] / m)
+        return float(m * m / (2 * np.log(2)) / z)
+
+
+def _sigma(x: float) -> float:
+    if x == 1.0:
+        return float("inf")
+    y, z = 1.0, x
+    while True:
+        x *= x
+        z_old = z
+        z += x * y
+        y += y
+        if z == z_old:
+            return z
+
+
+def _tau(x: float) -> float:
+    if x == 0.0 or x == 1.0:
+        return 0.0
+    y, z = 1.0, 1 - x
+    while True:
+        x = np.sqrt(x)
+        z_old = z
+        y *= 0.5
+        z -= (1 - x) ** 2 * y
+        if z == z_old:
+            return z / 3
+
+
+def _insert_new(exact: np.ndarray, h: np.ndarray) -> np.ndarray:
+    """Sorted distinct `exact` plus the values of `h` it lacks; the array is only rebuilt for new values."""
+    u = np.unique(h)
+    if not len(exact):
+        return u
+    pos = np.searchsorted(exact, u)
+    present = exact[np.minimum(pos, len(exact) - 1)] == u
+    if present.all():
+        return exact
+    return np.insert(exact, pos[~present], u[~present])
+
+
+class DistinctCounter:
+    """
+    Exact distinct count (sorted unique hashes) while the column is small, switching to a
+    HyperLogLog sketch once more than `exact_max` distinct values are held. Mergeable either way.
+    Memory is at most max(8 * exact_max, 2**p) bytes.
+    """
+
+    def __init__(self, exact_max: int = EXACT_DISTINCT_MAX_ROWS, p: int = HLL_P_DEFAULT):
+        self.exact_max = exact_max
+        self.p = p
+        self.exact = np.empty(0, dtype=np.uint64)
+        self.hll = None
+        self.seen = 0
+
+    @property
+    def approximate(self) -> bool:
+        return self.hll is not None
+
+    def _to_hll(self):
+        self.hll = HyperLogLog(self.p)
+        self.hll.add_hashes(self.exact)
+        self.exact = np.empty(0, dtype=np.uint64)
+
+    def add_hashes(self, h: np.ndarray) -> None:
+        self.seen += len(h)
+        if self.hll is None:
+            self.exact = _insert_new(self.exact, h)
+            if len(self.exact) > self.exact_max:
+                self._to_hll()
+        else:
+            self.hll.add_hashes(h)
+
+    def merge(self, other: "DistinctCounter") -> "DistinctCounter":
+        self.seen += other.seen
+        if self.hll is None and other.hll is not None:
+            self._to_hll()
+        if self.hll is not None:
+            if other.hll is not None:
+                self.hll.merge(other.hll)
+            else:
+                self.hll.add_hashes(other.exact)
+        else:
+            self.exact = _insert_new(self.exact, other.exact)
+            if len(self.exact) > self.exact_max:
+                self._to_hll()
+        return self
+
+    def count(self) -> int:
+        if self.hll is None:
+            return int(len(self.exact))
+        # A sketch can overshoot slightly; never report more distinct values than values seen.
+        return int(min(round(self.hll.estimate()), self.seen))
+
+
+def approx_nunique(df: pd.DataFrame, p: int = HLL_P_DEFAULT) -> dict:
+    """Per-column HyperLogLog distinct counts for an in-memory frame."""
+    out = {}
+    for c in df.columns:
+        hll = HyperLogLog(p)
+        hll.add_hashes(value_hashes(df[c]))
+        out[c] = int(min(round(hll.estimate()), int(df[c].notna().sum())))
+    return out
@@ -0,0 +1,231 @@
+import json
+import os
+import tempfile
+import zipfile
+from itertools import combinations
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from profiling.duplicates import row_hashes
+from profiling.leakage import CLASS_MAX
+from profiling.sketches import is_numeric_dtype_name
+
+SPLIT_NAMES = ("train", "val", "test")
+SPLIT_METHODS = ("random", "stratified", "grouped", "time")
+STRATA_BINS = 10  # quantile bins for stratifying on a numeric target with more than CLASS_MAX values
+
+
+def split_overlaps(hashes: Dict[str, np.ndarray]) -> List[dict]:
+    """Rows of one split whose content hash also appears in another split (e.g. test rows seen in train)."""
+    out = []
+    for a, b in combinations(SPLIT_NAMES, 2):
+        if a not in hashes or b not in hashes:
+            continue
+        shared = np.isin(hashes[b], np.unique(hashes[a]))
+        out.append({
+            "splits": f"{a} ∩ {b}",
+            "rows": int(shared.sum()),
+            "pct": round(float(shared.mean()) * 100, 3) if len(shared) else 0.0,  # share of the second split
+        })
+    return out
+
+
+def _time_keys(s: pd.Series) -> np.ndarray:
+    """Sortable float per row (NaN when missing/unparseable): numbers as-is, anything else parsed as a datetime."""
+    if is_numeric_dtype_name(s.dtype):
+        return s.to_numpy(dtype=np.float64, na_value=np.nan)
+    t = s if pd.api.types.is_datetime64_any_dtype(s.dtype) else pd.to_datetime(s, errors="coerce", utc=True, format="mixed")
+    if getattr(t.dt, "tz", None) is not None:
+        t = t.dt.tz_convert("UTC").dt.tz_localize(None)
+    keys = t.to_numpy(dtype="datetime64[ns]").astype(np.int64).astype(np.float64)
+    keys[t.isna().to_numpy()] = np.nan
+    return keys
+
+
+def _strata(keys: np.ndarray, numeric: bool):
+    """
+    Stratum key per row and a note (or None). A target with at most CLASS_MAX values stratifies on
+    its values; a numeric one with more on STRATA_BINS quantile bins (missing values form their own
+    stratum); a text one with more cannot be stratified (returns None keys: random split).
+    """
+    n_values = len(np.unique(keys))
+    if n_values <= CLASS_MAX:
+        return keys, None
+    if not numeric:
+        return None, f"{n_values:,} distinct values is too many to stratify on; used a random split"
+    valid = ~np.isnan(keys)
+    edges = np.unique(np.quantile(keys[valid], np.linspace(0, 1, STRATA_BINS + 1)[1:-1])) if valid.any() else []
+    bins = np.searchsorted(edges, keys, side="right").astype(np.float64)
+    bins[~valid] = np.nan
+    return bins, f"numeric target with {n_values:,} distinct values: stratified on {len(edges) + 1} quantile bins"
+
+
+def _cut(position: np.ndarray, fractions: Sequence[float]) -> np.ndarray:
+    """Split index (0/1/2) for positions in [0, 1)."""
+    bounds = np.cumsum(fractions)[:-1] / sum(fractions)
+    return np.searchsorted(bounds, position, side="right").astype(np.int8)
+
+
+def _assign(method: str, keys: Optional[np.ndarray], n: int, fractions: Sequence[float], rng) -> np.ndarray:
+    """Vectorized split labels for n rows; `keys` are class/group hashes or time keys, per method."""
+    if method in ("random", "stratified"):
+        # Sort by (class, random key) and cut each class block by its own size: exact per-class proportions.
+        codes = np.zeros(n, dtype=np.int64) if method == "random" else np.unique(keys, return_inverse=True)[1]
+        order = np.lexsort((rng.random(n), codes))
+        sizes = np.bincount(codes)
+        starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        sorted_codes = codes[order]
+        rank = np.arange(n) - starts[sorted_codes]
+        labels = np.empty(n, dtype=np.int8)
+        labels[order] = _cut(rank / sizes[sorted_codes], fractions)
+        return labels
+    if method == "grouped":
+        # Whole groups go to one split; groups are shuffled and cut by cumulative row share.
+        uniq, inverse, sizes = np.unique(keys, return_inverse=True, return_counts=True)
+        perm = rng.permutation(len(uniq))
+        start = np.empty(len(uniq))
+        start[perm] = (np.cumsum(sizes[perm]) - sizes[perm]) / max(n, 1)
+        return _cut(start, fractions)[inverse]
+    # Time: cut the sorted valid timestamps by row rank. Each edge is the timestamp of the last row
+    # of the earlier split, and rows tied with it stay in that split (so a split can come out smaller
+    # or empty). Rows without a usable timestamp stay in train.
+    valid = ~np.isnan(keys)
+    ordered = np.sort(keys[valid])
+    labels = np.zeros(n, dtype=np.int8)
+    if len(ordered):
+        cuts = np.round(np.cumsum(fractions)[:-1] / sum(fractions) * len(ordered)).astype(np.int64)
+        edges = np.where(cuts > 0, ordered[np.clip(cuts - 1, 0, len(ordered) - 1)], -np.inf)
+        labels[valid] = np.searchsorted(edges, keys[valid], side="left").astype(np.int8)
+    return labels
+
+
+def plan_splits(
+    chunks: Iterable[pd.DataFrame],
+    method: str,
+    fractions: Sequence[float] = (0.7, 0.15, 0.15),
+    column: Optional[str] = None,
+    seed: int = 0,
+    dedupe: bool = False,
+    progress: Optional[Callable[[int], None]] = None,
+):
+    """
+    One pass over the chunks keeps 8-byte row hashes plus one 8-byte key per row (class/group hash or
+    timestamp), never rows. Returns (labels, report): labels[i] is 0/1/2 (train/val/test) or -1 for a
+    dropped duplicate; the report has split sizes, cross-split row-hash overlap and method details.
+    """
+    if method not in SPLIT_METHODS:
+        raise ValueError(f"Unknown split method: {method}")
+    if method != "random" and not column:
+        raise ValueError(f"The {method} split needs a column.")
+    hashes, keys, n = [], [], 0
+    datetime_keys = numeric_strata = False
+    for chunk in chunks:
+        chunk = chunk.rename(columns=str)
+        if not hashes and method == "time":
+            datetime_keys = not is_numeric_dtype_name(chunk[column].dtype)
+        if not hashes and method == "stratified":
+            numeric_strata = is_numeric_dtype_name(chunk[column].dtype)
+        # Same digest as the chunked profiler, so overlaps agree with its duplicate counts.
+        hashes.append(row_hashes(chunk, subset=sorted(chunk.columns), normalize=True))
+        if method == "time":
+            keys.append(_time_keys(chunk[column]))
+        elif numeric_strata:
+            keys.append(pd.to_numeric(chunk[column], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan))
+        elif method != "random":
+            keys.append(row_hashes(chunk, subset=[column], normalize=True))
+        n += len(chunk)
+        if progress is not None:
+            progress(n)
+
+    h = np.concatenate(hashes) if hashes else np.empty(0, dtype=np.uint64)
+    k = np.concatenate(keys) if keys else None
+    rng = np.random.default_rng(seed)
+    strata_note = None
+    if method == "stratified" and n:
+        strata, strata_note = _strata(k, numeric_strata)
+        labels = _assign("stratified" if strata is not None else "random", strata, n, fractions, rng)
+        if strata is not None:
+            k = strata  # classes below are counted per stratum (quantile bin)
+    else:
+        labels = _assign(method, k, n, fractions, rng)
+
+    dropped = 0
+    if dedupe and n:
+        _, first = np.unique(h, return_index=True)
+        keep = np.zeros(n, dtype=bool)
+        keep[first] = True
+        dropped = int(n - keep.sum())
+        labels[~keep] = -1
+
+    report = {
+        "method": method,
+        "column": column,
+        "seed": seed,
+        "fractions": [round(f / sum(fractions), 4) for f in fractions],
+        "rows": {name: int((labels == i).sum()) for i, name in enumerate(SPLIT_NAMES)},
+        "dropped_duplicates": dropped,
+        "overlap": split_overlaps({name: h[labels == i] for i, name in enumerate(SPLIT_NAMES)}),
+    }
+    # Splits that were asked for but got no rows (e.g. ties on the time column swallowed them).
+    report["empty_splits"] = [
+        name for name, f in zip(SPLIT_NAMES, fractions) if f > 0 and report["rows"][name] == 0
+    ]
+    if method in ("stratified", "grouped"):
+        uniq, inverse = np.unique(k, return_inverse=True)
+        per_split = [np.unique(inverse[labels == i]) for i in range(len(SPLIT_NAMES))]
+        report["groups" if method == "grouped" else "classes"] = int(len(uniq))
+        if method == "grouped":
+            shared = sum(len(np.intersect1d(a, b)) for a, b in combinations(per_split, 2))
+            report["groups_in_several_splits"] = int(shared)
+        else:
+            report["classes_missing_from_a_split"] = int(sum(len(uniq) - len(p) for p in per_split))
+            report["strata_note"] = strata_note
+    if method == "time":
+        report["rows_without_time"] = int(np.isnan(k).sum())
+        report["time_ranges"] = {}
+        for i, name in enumerate(SPLIT_NAMES):
+            t = k[(labels == i) & ~np.isnan(k)]
+            bounds = [t.min(), t.max()] if len(t) else None
+            if bounds and datetime_keys:
+                bounds = [pd.Timestamp(int(b)).isoformat() for b in bounds]
+            report["time_ranges"][name] = [float(b) for b in bounds] if bounds and not datetime_keys else bounds
+    return labels, report
+
+
+def export_splits(
+    chunks: Iterable[pd.DataFrame],
+    labels: np.ndarray,
+    path: str,
+    report: Optional[dict] = None,
+    progress: Optional[Callable[[int], None]] = None,
+) -> str:
+    """
+    Second pass: appends each chunk's rows to per-split CSV files on disk, then stores them in a
+    zip at `path` (plus split_report.json). Memory stays at one chunk; the zip is written
+    entry by entry from the files, never assembled in memory.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix="draftwise_splits_", dir=os.path.dirname(path) or None) as workdir:
+        files = {name: os.path.join(workdir, f"{name}.csv") for name in SPLIT_NAMES}
+        started = set()
+        offset = 0
+        for chunk in chunks:
+            part = labels[offset:offset + len(chunk)]
+            offset += len(chunk)
+            for i, name in enumerate(SPLIT_NAMES):
+                rows = chunk[part == i]
+                if len(rows) or name not in started:
+                    rows.to_csv(files[name], mode="a", header=name not in started, index=False)
+                    started.add(name)
+            if progress is not None:
+                progress(offset)
+
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for name in SPLIT_NAMES:
+                if name in started:
+                    zf.write(files[name], f"{name}.csv")
+            if report is not None:
+                zf.writestr("split_report.json", json.dumps(report, indent=2, default=str))
+    return path
@@ -0,0 +1,169 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from profiling.sketches import is_numeric_dtype_name
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+HIST_BINS = 20
+SAMPLE_ROWS = 20_000  # uniform row sample behind quantiles and histogram shapes
+SAMPLE_ROWS_MIN = 1_000  # floor when a cell budget shrinks the sample for wide frames
+SAMPLE_CELLS_STREAMED = 2_000_000  # numeric sample cells kept by the streaming profilers (16 MB)
+TOPK_CAPACITY = 64  # Misra-Gries counters per categorical column
+TOPK_REPORT = 5
+STATS_CHUNK_ROWS = 200_000
+
+
+def _sig(x, digits: int = 4):
+    """Round to significant digits for compact storage; NaN/inf -> None."""
+    if x is None or not np.isfinite(x):
+        return None
+    return float(f"{x:.{digits}g}")
+
+
+class ColumnStats:
+    """
+    Mergeable per-column statistics over a stream of chunks.
+
+    Numeric columns: count, min, max, mean and std (moments merged with Chan's parallel formula,
+    all columns of a chunk in one NumPy pass), plus approximate quantiles and fixed-bin histograms
+    from a bounded uniform row sample (bottom-k of random keys, so samples merge too). With
+    sample_cells, the sample shrinks to sample_cells / numeric columns rows (at least SAMPLE_ROWS_MIN)
+    so wide frames keep a fixed budget.
+    Other columns: Misra-Gries heavy hitters (top values; counts are lower bounds, exact when a
+    column has at most TOPK_CAPACITY distinct values).
+    """
+
+    def __init__(self, sample_rows: int = SAMPLE_ROWS, seed: int = 0, sample_cells: Optional[int] = None):
+        self.k = sample_rows
+        self.sample_cells = sample_cells
+        self._rng = np.random.default_rng(seed)
+        self.count: Dict[str, int] = {}
+        self.mean: Dict[str, float] = {}
+        self.m2: Dict[str, float] = {}
+        self.min: Dict[str, float] = {}
+        self.max: Dict[str, float] = {}
+        self.topk: Dict[str, Dict] = {}
+        self._sample: Optional[pd.DataFrame] = None
+        self._keys = np.empty(0)
+
+    def _merge_moments(self, c: str, n: int, mean: float, m2: float, lo: float, hi: float) -> None:
+        n0 = self.count.get(c, 0)
+        if n == 0:
+            self.count.setdefault(c, 0)
+            return
+        if n0 == 0:
+            self.count[c], self.mean[c], self.m2[c], self.min[c], self.max[c] = n, mean, m2, lo, hi
+            return
+        tot = n0 + n
+        delta = mean - self.mean[c]
+        self.mean[c] += delta * n / tot
+        self.m2[c] += m2 + delta * delta * n0 * n / tot
+        self.count[c] = tot
+        self.min[c] = min(self.min[c], lo)
+        self.max[c] = max(self.max[c], hi)
+
+    def _merge_topk(self, c: str, counts: Dict) -> None:
+        cur = self.topk.setdefault(c, {})
+        for v, n in counts.items():
+            cur[v] = cur.get(v, 0) + n
+        if len(cur) > TOPK_CAPACITY:
+            cut = sorted(cur.values(), reverse=True)[TOPK_CAPACITY]
+            self.topk[c] = {v: n - cut for v, n in cur.items() if n > cut}
+
+    def _merge_sample(self, sample: pd.DataFrame, keys: np.ndarray) -> None:
+        if self._sample is not None:
+            sample = pd.concat([self._sample, sample], ignore_index=True)
+            keys = np.concatenate([self._keys, keys])
+        if len(keys) > self.k:
+            keep = np.argpartition(keys, self.k)[: self.k]
+            sample, keys = sample.iloc[keep].reset_index(drop=True), keys[keep]
+        self._sample, self._keys = sample, keys
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        chunk = chunk.rename(columns=str)
+        num = [c for c in chunk.columns if is_numeric_dtype_name(chunk[c].dtype)]
+        if num and len(chunk):
+            if self.sample_cells and self._sample is None:
+                self.k = max(SAMPLE_ROWS_MIN, min(self.k, self.sample_cells // len(num)))
+            block = chunk[num].to_numpy(dtype=np.float64, na_value=np.nan)
+            with np.errstate(all="ignore"):
+                n = (~np.isnan(block)).sum(axis=0)
+                mean = np.nansum(block, axis=0) / np.maximum(n, 1)
+                m2 = np.nansum((block - mean) ** 2, axis=0)
+                lo = np.where(n > 0, np.nanmin(np.where(np.isnan(block), np.inf, block), axis=0), np.nan)
+                hi = np.where(n > 0, np.nanmax(np.where(np.isnan(block), -np.inf, block), axis=0), np.nan)
+            for i, c in enumerate(num):
+                self._merge_moments(c, int(n[i]), float(mean[i]), float(m2[i]), float(lo[i]), float(hi[i]))
+
+            keys = self._rng.random(len(chunk))
+            if self._sample is not None and len(self._keys) >= self.k:
+                # Only rows that can still enter the bottom-k sample need to be copied.
+                take = keys < self._keys.max()
+            else:
+                take = np.ones(len(chunk), dtype=bool)
+            sel = pd.DataFrame(block[take], columns=num)
+            self._merge_sample(sel, keys[take])
+
+        for c in chunk.columns:
+            if c not in num:
+                vc = chunk[c].value_counts(dropna=True)  # sorted, most frequent first
+                if len(vc) > TOPK_CAPACITY:
+                    # Misra-Gries summary of the chunk itself: keeps the merge cost independent of cardinality.
+                    vc = vc.iloc[:TOPK_CAPACITY] - vc.iloc[TOPK_CAPACITY]
+                    vc = vc[vc > 0]
+                self._merge_topk(c, dict(zip(vc.index.astype(str), vc.to_numpy().tolist())))
+
+    def merge(self, other: "ColumnStats") -> "ColumnStats":
+        for c, n in other.count.items():
+            if n:
+                self._merge_moments(c, n, other.mean[c], other.m2[c], other.min[c], other.max[c])
+            else:
+                self.count.setdefault(c, 0)
+        for c, counts in other.topk.items():
+            self._merge_topk(c, counts)
+        if other._sample is not None:
+            self._merge_sample(other._sample, other._keys)
+        return self
+
+    def result(self, columns: Optional[List[str]] = None) -> Dict[str, dict]:
+        """Compact per-column summary. `columns` restricts/orders the output (e.g. profile order)."""
+        out = {}
+        cols = columns if columns is not None else list(dict.fromkeys(list(self.count) + list(self.topk)))
+        sample = self._sample if self._sample is not None else pd.DataFrame()
+        for c in cols:
+            if c in self.count and c not in self.topk:
+                n = self.count[c]
+                if not n:
+                    out[c] = {"kind": "numeric", "count": 0}
+                    continue
+                vals = sample[c].to_numpy() if c in sample.columns else np.empty(0)
+                vals = vals[~np.isnan(vals)]
+                lo, hi = self.min[c], self.max[c]
+                hist = []
+                if len(vals):
+                    counts, _ = np.histogram(vals, bins=HIST_BINS, range=(lo, hi) if hi > lo else None)
+                    hist = np.round(counts * (n / len(vals))).astype(int).tolist()
+                out[c] = {
+                    "kind": "numeric",
+                    "count": n,
+                    "min": _sig(lo),
+                    "max": _sig(hi),
+                    "mean": _sig(self.mean[c]),
+                    "std": _sig(np.sqrt(self.m2[c] / (n - 1))) if n > 1 else 0.0,
+                    "q": [_sig(v) for v in np.quantile(vals, QUANTILES)] if len(vals) else [],
+                    "hist": hist,
+                }
+            elif c in self.topk:
+                top = sorted(self.topk[c].items(), key=lambda x: x[1], reverse=True)[:TOPK_REPORT]
+                out[c] = {"kind": "categorical", "top": [[v[:60], int(n)] for v, n in top]}
+        return out
+
+
+def column_stats(df: pd.DataFrame, chunk_rows: int = STATS_CHUNK_ROWS) -> Dict[str, dict]:
+    """ColumnStats over an in-memory frame (fed in slices, so temporary blocks stay bounded)."""
+    acc = ColumnStats()
+    for i in range(0, max(len(df), 1), chunk_rows):
+        acc.update(df.iloc[i:i + chunk_rows])
+    return acc.result([str(c) for c in df.columns])
@@ -0,0 +1,175 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from profiling.leakage import CLASS_MAX
+from profiling.sketches import is_numeric_dtype_name
+from profiling.stats import STATS_CHUNK_ROWS, ColumnStats, _sig
+
+TOP_FEATURES = 10  # features reported for per-class missingness / separation
+TOP_CLASSES = 50
+
+
+class TargetProfiler:
+    """
+    Mergeable target analysis over a stream of chunks.
+
+    Per chunk, every feature's null flags, numeric sums, squared sums and counts are aggregated per
+    target class with a single groupby; the per-class totals merge across chunks. Once the target
+    shows more than CLASS_MAX distinct values, per-class counting stops (memory stays bounded): a
+    numeric target is then treated as a regression target and only its distribution (ColumnStats)
+    is kept.
+    """
+
+    def __init__(self, target: str, class_max: int = CLASS_MAX):
+        self.target = target
+        self.class_max = class_max
+        self.n_rows = 0
+        self.missing_target = 0
+        self.numeric = True
+        self.class_counts: Dict[str, int] = {}
+        self.per_class: Optional[pd.DataFrame] = None  # index: class, columns: (stat, feature)
+        self.too_many_classes = False
+        self.values = ColumnStats()
+
+    def _labels(self, y: pd.Series):
+        """(codes, labels) for the non-null targets; numeric classes get the same label in every chunk."""
+        if self.numeric and is_numeric_dtype_name(y.dtype):
+            codes, uniques = pd.factorize(y.to_numpy(dtype=np.float64))
+            # Exact value as the key ("2", "0.5", "1000001"), never a rounded rendering.
+            return codes, [str(int(u)) if u.is_integer() else repr(float(u)) for u in uniques]
+        self.numeric = False
+        codes, uniques = pd.factorize(y)
+        return codes, [str(u) for u in uniques]
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        chunk = chunk.rename(columns=str)
+        y = chunk[self.target]
+        valid = y.notna().to_numpy()
+        self.n_rows += len(chunk)
+        self.missing_target += int((~valid).sum())
+        if self.numeric and is_numeric_dtype_name(y.dtype):
+            self.values.update(chunk[[self.target]])
+
+        if self.too_many_classes:
+            self.numeric = self.numeric and is_numeric_dtype_name(y.dtype)
+            return
+        codes, labels = self._labels(y[valid])
+        for label, n in zip(labels, np.bincount(codes, minlength=len(labels)).tolist()):
+            self.class_counts[label] = self.class_counts.get(label, 0) + n
+        if len(self.class_counts) > self.class_max:
+            self._stop_counting()
+            return
+        if not len(codes):
+            return
+
+        feats = chunk.loc[valid, [c for c in chunk.columns if c != self.target]]
+        nums = [c for c in feats.columns if is_numeric_dtype_name(feats[c].dtype)]
+        x = feats[nums].astype(np.float64)
+        block = pd.concat({"null": feats.isna(), "n": x.notna(), "sum": x, "sq": x * x}, axis=1)
+        agg = block.groupby(codes).sum()
+        agg.index = [labels[i] for i in agg.index]
+        self.per_class = agg if self.per_class is None else self.per_class.add(agg, fill_value=0)
+
+    def _stop_counting(self) -> None:
+        self.too_many_classes = True
+        self.class_counts, self.per_class = {}, None
+
+    def merge(self, other: "TargetProfiler") -> "TargetProfiler":
+        self.n_rows += other.n_rows
+        self.missing_target += other.missing_target
+        self.numeric = self.numeric and other.numeric
+        self.values.merge(other.values)
+        if self.too_many_classes or other.too_many_classes:
+            self._stop_counting()
+            return self
+        for label, n in other.class_counts.items():
+            self.class_counts[label] = self.class_counts.get(label, 0) + n
+        if len(self.class_counts) > self.class_max:
+            self._stop_counting()
+        elif other.per_class is not None:
+            self.per_class = other.per_class if self.per_class is None else self.per_class.add(other.per_class, fill_value=0)
+        return self
+
+    def _missing_by_class(self, counts: pd.Series) -> List[dict]:
+        """Features whose missing rate differs most between classes (informative missingness)."""
+        if "null" not in self.per_class.columns.get_level_values(0):
+            return []
+        rates = self.per_class["null"].div(counts, axis=0) * 100
+        spread = (rates.max() - rates.min()).sort_values(ascending=False)
+        spread = spread[(spread > 0) & (rates.max() > 0)]
+        return [
+            {"feature": f, "spread_pct": round(float(spread[f]), 2), "missing_pct": rates[f].round(2).to_dict()}
+            for f in spread.index[:TOP_FEATURES]
+        ]
+
+    def _feature_by_class(self) -> List[dict]:
+        """
+        Numeric features ranked by how far apart the class means are, in pooled within-class standard
+        deviations: sqrt(sum over classes of (sq - sum^2 / n) / (N - K)).
+        """
+        if "n" not in self.per_class.columns.get_level_values(0):
+            return []
+        n, s, sq = self.per_class["n"], self.per_class["sum"], self.per_class["sq"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = s / n
+            within = (sq - s * s / n).where(n > 0).sum()
+            dof = n.sum() - (n > 0).sum()
+            pooled_var = (within / dof).where(dof > 0)
+            separation = (means.max() - means.min()) / np.sqrt(pooled_var)
+        separation = separation.replace([np.inf, -np.inf], np.nan).dropna().sort_values(ascending=False)
+        return [
+            {
+                "feature": f,
+                "separation": round(float(separation[f]), 3),
+                "mean_by_class": {c: _sig(v) for c, v in means[f].items()},
+            }
+            for f in separation.index[:TOP_FEATURES]
+        ]
+
+    def result(self) -> dict:
+        out = {
+            "column": self.target,
+            "rows": self.n_rows,
+            "missing_target": self.missing_target,
+            "missing_target_pct": round(self.missing_target / self.n_rows * 100, 2) if self.n_rows else 0.0,
+        }
+        if self.numeric and self.too_many_classes:
+            out["task"] = "regression"
+            out["distribution"] = self.values.result([self.target]).get(self.target, {})
+            return out
+        out["task"] = "classification"
+        if self.too_many_classes:
+            # High-cardinality text target: classes were not counted past class_max.
+            out["n_classes"] = None
+            out["classes_over"] = self.class_max
+            out["classes"] = []
+            return out
+
+        ranked = sorted(self.class_counts.items(), key=lambda x: x[1], reverse=True)
+        n_valid = sum(self.class_counts.values())
+        out["n_classes"] = len(ranked)
+        if not n_valid:
+            out["classes"] = []
+            out["note"] = "no rows with a non-missing target"
+            return out
+        out["classes"] = [
+            {"class": c, "count": n, "pct": round(n / n_valid * 100, 2)} for c, n in ranked[:TOP_CLASSES]
+        ]
+        if ranked:
+            out["imbalance_ratio"] = round(ranked[0][1] / max(ranked[-1][1], 1), 2)
+            out["majority_baseline_accuracy"] = round(ranked[0][1] / n_valid, 4)
+        if self.per_class is not None:
+            counts = pd.Series(self.class_counts).reindex(self.per_class.index)
+            out["missing_by_class"] = self._missing_by_class(counts)
+            out["feature_by_class"] = self._feature_by_class()
+        return out
+
+
+def target_analysis(df: pd.DataFrame, target: str, chunk_rows: int = STATS_CHUNK_ROWS) -> dict:
+    """TargetProfiler over an in-memory frame (fed in slices, so temporary blocks stay bounded)."""
+    prof = TargetProfiler(target)
+    for i in range(0, max(len(df), 1), chunk_rows):
+        prof.update(df.iloc[i:i + chunk_rows])
+    return prof.result()
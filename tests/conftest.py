@@ -0,0 +1,23 @@
+import os
+import sys
+
+# The app runs from the repository root with namespace packages (profiling/, core/, ...).
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture
+def stub_llm(monkeypatch, tmp_path):
+    """gemini_client wired to the offline stub, with a fresh cache, limiter and single-flight table."""
+    from llm import cache, gemini_client
+    from llm.singleflight import SingleFlight
+
+    monkeypatch.setenv("DRAFTWISE_LLM_PROVIDER", "stub")
+    monkeypatch.setenv("DRAFTWISE_CACHE_PATH", str(tmp_path / "responses.sqlite3"))
+    monkeypatch.setattr(cache, "_cache", None)
+    monkeypatch.setattr(gemini_client, "_provider", None)
+    monkeypatch.setattr(gemini_client, "_limiter", None)
+    monkeypatch.setattr(gemini_client, "_retry_count", 0)
+    monkeypatch.setattr(gemini_client, "_flights", SingleFlight())
+    return gemini_client
@@ -0,0 +1,73 @@
+import time
+
+from llm.cache import ResponseCache, cache_key
+from llm.providers import StubProvider
+
+
+class CountingStub(StubProvider):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def generate(self, prompt, model, **kwargs):
+        self.calls += 1
+        return super().generate(prompt, model, **kwargs)
+
+
+def test_cache_key_ignores_trailing_whitespace_but_not_the_model():
+    assert cache_key("m", "a  \nb\n\n") == cache_key("m", "a\nb")
+    assert cache_key("m", "a") != cache_key("n", "a")
+
+
+def test_expired_entries_are_misses_and_deleted(tmp_path):
+    cache = ResponseCache(str(tmp_path / "c.sqlite3"), max_bytes=1 << 20, ttl_s=0.05)
+    cache.put("k", "m", "text")
+    assert cache.get("k") == "text"
+    time.sleep(0.1)
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_size_limit_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(str(tmp_path / "c.sqlite3"), max_bytes=30, ttl_s=3600)
+    for key in ("a", "b", "c"):
+        cache.put(key, "m", key * 10)
+        time.sleep(0.01)
+    assert cache.get("a") == "a" * 10  # "b" is now the least recently used
+    cache.put("d", "m", "d" * 10)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("d") is not None
+    assert cache.stats()["bytes"] <= 30
+    assert cache.evictions == 1
+
+
+def test_clear_drops_every_entry(tmp_path):
+    cache = ResponseCache(str(tmp_path / "c.sqlite3"), max_bytes=1 << 20, ttl_s=3600)
+    cache.put("a", "m", "x")
+    cache.clear()
+    assert cache.get("a") is None
+
+
+def test_use_cache_false_bypasses_the_lookup_but_stores_the_answer(stub_llm, monkeypatch):
+    provider = CountingStub()
+    monkeypatch.setattr(stub_llm, "_provider", provider)
+
+    first = stub_llm.generate_text("Write a section.", family="section")
+    assert stub_llm.generate_text("Write a section.", family="section") == first
+    assert provider.calls == 1
+
+    assert stub_llm.generate_text("Write a section.", use_cache=False, family="section") == first
+    assert provider.calls == 2
+    stats = stub_llm.cache_stats()
+    assert (stats["hits"], stats["entries"]) == (1, 1)
+
+
+def test_cache_can_be_disabled(stub_llm, monkeypatch):
+    monkeypatch.setenv("DRAFTWISE_CACHE", "0")
+    provider = CountingStub()
+    monkeypatch.setattr(stub_llm, "_provider", provider)
+    stub_llm.generate_text("Same prompt.")
+    stub_llm.generate_text("Same prompt.")
+    assert provider.calls == 2
+    assert stub_llm.cache_stats() == {}
@@ -0,0 +1,50 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+from pyarrow import feather  # noqa: E402
+
+from profiling.columnar import columnar_metadata, iter_columnar_chunks, read_columnar  # noqa: E402
+
+
+@pytest.fixture
+def lz4_feather(tmp_path):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "a": rng.integers(0, 100, 2_500),
+        "b": np.where(rng.random(2_500) < 0.1, np.nan, rng.normal(size=2_500)),
+        "c": rng.choice(["x", "y", "z"], 2_500),
+    })
+    path = tmp_path / "data.feather"
+    feather.write_feather(df, path, compression="lz4", chunksize=1_000)
+    return str(path), df
+
+
+def test_ipc_metadata_reads_schema_and_row_count(lz4_feather):
+    path, df = lz4_feather
+    meta = columnar_metadata(path, "ipc")
+    assert meta["n_rows"] == len(df)
+    assert meta["columns"] == ["a", "b", "c"]
+    assert meta["dtypes"]["a"] == "int64"
+
+
+def test_ipc_chunks_stream_selected_columns_in_requested_order(lz4_feather):
+    path, df = lz4_feather
+    total, chunks = iter_columnar_chunks(path, "ipc", columns=["c", "a"], chunk_rows=700)
+    chunks = list(chunks)
+    assert total == len(df)
+    assert max(len(c) for c in chunks) <= 700
+    out = pd.concat(chunks, ignore_index=True)
+    assert list(out.columns) == ["c", "a"]
+    pd.testing.assert_frame_equal(out, df[["c", "a"]], check_dtype=False)
+
+
+def test_ipc_read_from_upload_buffer_selects_columns(lz4_feather):
+    path, df = lz4_feather
+    with open(path, "rb") as f:
+        upload = io.BytesIO(f.read())
+    out = read_columnar(upload, "ipc", columns=["b"])
+    pd.testing.assert_frame_equal(out, df[["b"]])
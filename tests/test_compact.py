@@ -0,0 +1,56 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from profiling.compact import downcast_numerics, read_csv_compact
+from profiling.progressive import iter_profile_groups
+
+
+def _csv(n=3_000, seed=0) -> bytes:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "small": rng.integers(-100, 100, n),
+        "wide": rng.integers(0, 100_000, n),
+        "half": rng.integers(0, 8, n) / 2,
+        "precise": rng.normal(size=n),
+        "city": rng.choice(["Oslo", "Rome", "Lima"], n),
+    })
+    df.loc[::9, "half"] = np.nan
+    return df.to_csv(index=False).encode()
+
+
+def _profile(df):
+    profile = {}
+    for _, part in iter_profile_groups(df):
+        profile.update(part)
+    return profile
+
+
+@pytest.mark.parametrize(
+    "backend, expected",
+    [
+        ("numpy_nullable", {"small": "Int8", "wide": "Int32", "half": "Float32", "precise": "Float64"}),
+        ("pyarrow", {"small": "int8[pyarrow]", "wide": "int32[pyarrow]", "half": "float[pyarrow]", "precise": "double[pyarrow]"}),
+    ],
+)
+def test_downcast_keeps_the_dtype_family(backend, expected):
+    df = downcast_numerics(pd.read_csv(io.BytesIO(_csv()), dtype_backend=backend))
+    assert {c: str(df[c].dtype) for c in expected} == expected
+
+
+def test_pyarrow_compact_read_downcasts_and_profiles_like_plain_read():
+    plain = pd.read_csv(io.BytesIO(_csv()))
+    df, report = read_csv_compact(io.BytesIO(_csv()), use_pyarrow=True)
+    assert report["engine"] == "pyarrow"
+    assert str(df["small"].dtype) == "int8[pyarrow]"
+    assert report["after_bytes"] < report["before_bytes"]
+
+    expected, got = _profile(plain), _profile(df)
+    assert got["num_cols"] == expected["num_cols"]
+    assert got["semantic_types"] == expected["semantic_types"]
+    for c in ("small", "wide", "half", "precise"):
+        assert got["column_stats"][c]["kind"] == "numeric"
+        for k in ("count", "min", "max", "mean"):
+            assert got["column_stats"][c][k] == expected["column_stats"][c][k]
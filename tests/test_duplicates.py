@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from profiling.duplicates import duplicate_summary, near_duplicates, row_hashes
+
+
+def _frames():
+    rng = np.random.default_rng(0)
+    n = 400
+    base = pd.DataFrame({
+        "x": rng.choice([1.5, -0.0, 0.0, np.nan], n),
+        "k": pd.array(rng.choice([1, 2, None], n), dtype="Int64"),
+        "s": pd.Series(rng.choice(["a", "b", None], n), dtype=object),
+        "flag": rng.choice([True, False], n),
+        "t": pd.to_datetime(rng.choice(["2024-01-01", "2024-06-01", None], n)),
+    })
+    mixed = pd.DataFrame({
+        "m": pd.Series(rng.choice(np.array([1, "1", 2.0, None, "x", np.nan], dtype=object), n), dtype=object),
+        "y": rng.integers(0, 3, n),
+    })
+    all_null = base.assign(empty=np.nan, empty_obj=pd.Series([None] * n, dtype=object))
+    return {"nan_and_nullable": base, "mixed_object": mixed, "all_null_columns": all_null}
+
+
+@pytest.mark.parametrize("name", ["nan_and_nullable", "mixed_object", "all_null_columns"])
+def test_duplicate_count_matches_pandas(name):
+    df = _frames()[name]
+    dups = duplicate_summary(row_hashes(df))
+    assert dups["dup_rows"] == int(df.duplicated().sum())
+    for g in dups["dup_groups"]:
+        row = df.iloc[[g["row"]]]
+        assert int((df.astype(object).fillna("NA") == row.astype(object).fillna("NA").values).all(axis=1).sum()) == g["count"]
+
+
+@pytest.mark.parametrize("name", ["nan_and_nullable", "mixed_object", "all_null_columns"])
+def test_subset_duplicates_match_pandas(name):
+    df = _frames()[name]
+    subset = list(df.columns[:2])
+    assert near_duplicates(df, subset)["dup_rows"] == int(df.duplicated(subset=subset).sum())
+
+
+def test_all_null_frame_is_one_group():
+    df = pd.DataFrame({"a": [np.nan] * 5, "b": pd.Series([None] * 5, dtype=object)})
+    dups = duplicate_summary(row_hashes(df))
+    assert dups["dup_rows"] == int(df.duplicated().sum()) == 4
+    assert dups["dup_groups"] == [{"row": 0, "count": 5}]
@@ -0,0 +1,20 @@
+from profiling.frame_cache import SessionLRU
+
+
+def test_session_lru_evicts_least_recently_used():
+    evicted = []
+    memo = SessionLRU(2, evicted.append)
+    memo["a"], memo["b"] = 1, 2
+    assert memo["a"] == 1  # touch "a" so "b" is now the oldest
+    memo["c"] = 3
+    assert list(memo) == ["a", "c"]
+    assert evicted == [2]
+
+
+def test_session_lru_get_refreshes_and_defaults():
+    memo = SessionLRU(2)
+    memo["a"], memo["b"] = 1, 2
+    assert memo.get("a") == 1
+    assert memo.get("missing", {}) == {}
+    memo["c"] = 3
+    assert "b" not in memo and "a" in memo
@@ -0,0 +1,113 @@
+import time
+
+import pytest
+
+from llm.gemini_client import LLMUnavailableError, _RateLimiter
+from llm.providers import StubProvider, TransientProviderError
+
+
+class ScriptedStub(StubProvider):
+    """Raises the scripted errors in order, then answers like the stub."""
+
+    def __init__(self, errors=()):
+        super().__init__()
+        self.errors = list(errors)
+        self.calls = 0
+        self.timeouts = []
+
+    def generate(self, prompt, model, usage=None, timeout_s=None, max_output_tokens=None):
+        self.calls += 1
+        self.timeouts.append(timeout_s)
+        if self.errors:
+            raise self.errors.pop(0)
+        return super().generate(prompt, model, usage=usage, timeout_s=timeout_s, max_output_tokens=max_output_tokens)
+
+
+@pytest.fixture
+def fast_retries(stub_llm, monkeypatch):
+    monkeypatch.setenv("DRAFTWISE_CACHE", "0")
+    monkeypatch.setattr(stub_llm, "BACKOFF_BASE_S", 0.01)
+    return stub_llm
+
+
+def test_limiter_refuses_work_it_cannot_schedule_before_the_deadline():
+    limiter = _RateLimiter(rpm=1, tpm=1_000)
+    limiter.acquire(10, deadline=time.monotonic() + 1)
+    t0 = time.monotonic()
+    with pytest.raises(LLMUnavailableError):
+        limiter.acquire(10, deadline=time.monotonic() + 1)  # next request slot is 60 s away
+    assert time.monotonic() - t0 < 0.5
+
+
+def test_limiter_waits_for_tokens_to_refill():
+    limiter = _RateLimiter(rpm=600, tpm=6_000)  # 100 tokens/s
+    limiter.acquire(6_000, deadline=time.monotonic() + 1)
+    t0 = time.monotonic()
+    limiter.acquire(20, deadline=time.monotonic() + 2)
+    assert 0.1 < time.monotonic() - t0 < 1.0
+    assert limiter.stats()["waits"] == 1
+
+
+def test_limiter_release_returns_reserved_tokens():
+    limiter = _RateLimiter(rpm=600, tpm=1_000)
+    limiter.acquire(1_000, deadline=time.monotonic() + 1)
+    limiter.release(800)
+    t0 = time.monotonic()
+    limiter.acquire(800, deadline=time.monotonic() + 1)
+    assert time.monotonic() - t0 < 0.1
+
+
+def test_transient_errors_are_retried(fast_retries, monkeypatch):
+    provider = ScriptedStub([TransientProviderError("busy"), TimeoutError("slow")])
+    monkeypatch.setattr(fast_retries, "_provider", provider)
+    assert fast_retries.generate_text("Prompt.")
+    assert provider.calls == 3
+    assert fast_retries.limiter_stats()["retries"] == 2
+
+
+def test_non_retryable_errors_propagate_unchanged(fast_retries, monkeypatch):
+    provider = ScriptedStub([ValueError("bad request")])
+    monkeypatch.setattr(fast_retries, "_provider", provider)
+    with pytest.raises(ValueError, match="bad request"):
+        fast_retries.generate_text("Prompt.")
+    assert provider.calls == 1
+
+
+def test_retries_are_capped(fast_retries, monkeypatch):
+    monkeypatch.setenv("DRAFTWISE_LLM_MAX_RETRIES", "2")
+    provider = ScriptedStub([TransientProviderError("busy")] * 5)
+    monkeypatch.setattr(fast_retries, "_provider", provider)
+    with pytest.raises(LLMUnavailableError):
+        fast_retries.generate_text("Prompt.")
+    assert provider.calls == 3
+
+
+def test_deadline_bounds_a_hung_request(fast_retries, monkeypatch):
+    monkeypatch.setenv("DRAFTWISE_LLM_DEADLINE_S", "0.5")
+    monkeypatch.setenv("DRAFTWISE_STUB_LATENCY_MS", "60000")
+    t0 = time.monotonic()
+    with pytest.raises(LLMUnavailableError):
+        fast_retries.generate_text("Prompt.")
+    assert time.monotonic() - t0 < 1.5
+
+
+def test_each_attempt_gets_the_remaining_time_as_its_timeout(fast_retries, monkeypatch):
+    monkeypatch.setenv("DRAFTWISE_LLM_DEADLINE_S", "30")
+    provider = ScriptedStub([TransientProviderError("busy")])
+    monkeypatch.setattr(fast_retries, "_provider", provider)
+    fast_retries.generate_text("Prompt.")
+    first, second = provider.timeouts
+    assert 29 < first <= 30 and second < first
+
+
+def test_output_reservation_is_settled_against_reported_usage(fast_retries, monkeypatch):
+    monkeypatch.setenv("DRAFTWISE_TPM", "20000")
+    monkeypatch.setattr(fast_retries, "_provider", ScriptedStub())
+    rec = {}
+    text = fast_retries._call_with_retries(
+        lambda t: fast_retries._generate_once("Prompt.", "m", rec, t), "Prompt.", time.monotonic() + 5, rec
+    )
+    assert rec["tokens_reserved"] >= fast_retries.MAX_OUTPUT_TOKENS_DEFAULT
+    fast_retries._settle_tokens(rec, text)
+    used = rec["tokens_in"] + rec["tokens_out"]
+    assert abs(fast_retries.limiter_stats()["tokens_available"] - (20_000 - used)) <= 50
@@ -0,0 +1,76 @@
+import threading
+import time
+
+import pytest
+
+from core.jobs import JobCancelled, JobManager
+
+
+def _wait_done(manager, job_id, timeout=5.0):
+    t0 = time.monotonic()
+    while not manager.get(job_id).done:
+        assert time.monotonic() - t0 < timeout, "job did not finish"
+        time.sleep(0.01)
+    return manager.get(job_id)
+
+
+@pytest.fixture
+def manager():
+    return JobManager(workers=1)
+
+
+def test_submit_runs_the_job_and_keeps_its_progress(manager):
+    def body(job):
+        job.emit("step 1\n")
+        job.publish("half", 21)
+        return job.parts["half"] * 2
+
+    job = _wait_done(manager, manager.submit(body, label="answer", meta={"slot": "x"}))
+    assert (job.status, job.result, job.partial) == ("done", 42, "step 1\n")
+    assert job.meta == {"slot": "x"} and job.finished is not None
+
+
+def test_errors_are_kept_on_the_job(manager):
+    def body(job):
+        raise ValueError("boom")
+
+    job = _wait_done(manager, manager.submit(body, label="fails"))
+    assert job.status == "error"
+    assert isinstance(job.error, ValueError)
+
+
+def test_cancel_stops_a_running_job_that_checks_the_flag(manager):
+    started = threading.Event()
+
+    def body(job):
+        started.set()
+        while True:
+            if job.cancelled:
+                raise JobCancelled()
+            time.sleep(0.01)
+
+    job_id = manager.submit(body, label="loop")
+    assert started.wait(2)
+    manager.cancel(job_id)
+    assert _wait_done(manager, job_id).status == "cancelled"
+
+
+def test_cancel_drops_a_queued_job_without_running_it(manager):
+    release = threading.Event()
+    ran = []
+    blocker = manager.submit(lambda job: release.wait(5), label="blocker")
+    queued = manager.submit(lambda job: ran.append(1), label="queued")
+
+    manager.cancel(queued)
+    assert manager.get(queued).status == "cancelled"
+    release.set()
+    _wait_done(manager, blocker)
+    assert ran == []
+
+
+def test_pop_collects_a_job_once(manager):
+    job_id = manager.submit(lambda job: "text", label="collect")
+    _wait_done(manager, job_id)
+    assert manager.pop(job_id).result == "text"
+    assert manager.pop(job_id) is None
+    assert manager.get(job_id) is None
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from profiling.leakage import _post_outcome_name, leakage_scan
+
+
+def _frame(n=5_000, seed=0):
+    rng = np.random.default_rng(seed)
+    y = rng.integers(0, 2, n)
+    return pd.DataFrame({
+        "y": y,
+        "leak2": np.where(y == 1, 5.0, -5.0) + rng.normal(size=n),
+        "noise": rng.normal(size=n),
+        "row_id": np.arange(n),
+    })
+
+
+def test_continuous_leak_is_checked_even_when_listed_as_likely_id():
+    df = _frame()
+    # The profile's likely_id lists every near-unique column, including continuous floats.
+    result = leakage_scan(df, "y", likely_id=["leak2", "noise", "row_id"])
+    flagged = {f["column"]: f["reasons"] for f in result["flagged"]}
+    assert set(flagged) == {"leak2"}
+    reasons = " ".join(flagged["leak2"])
+    assert "target entropy" in reasons and "predicts target alone" in reasons and "|r|" in reasons
+    assert "identifier" not in reasons
+    assert result["id_leaks"] == []
+
+
+def test_sequential_id_that_tracks_the_target_is_an_id_leak():
+    df = _frame().sort_values("y", kind="stable").reset_index(drop=True)
+    df["row_id"] = np.arange(len(df))
+    result = leakage_scan(df.drop(columns="leak2"), "y", likely_id=["row_id"])
+    assert result["id_leaks"] == ["row_id"]
+
+
+@pytest.mark.parametrize(
+    "column, target, expected",
+    [
+        ("list_price", "sale_price", False),
+        ("post_code", "label", False),
+        ("status_id", "label", False),
+        ("loan_status", "label", True),
+        ("final_grade", "label", True),
+        ("days_to_close", "label", True),
+        ("sale_price_log", "sale_price", True),
+        ("predictedSalePrice", "sale_price", True),
+    ],
+)
+def test_post_outcome_names_need_whole_token_affixes(column, target, expected):
+    assert _post_outcome_name(column, target) is expected
+
+
+@pytest.mark.parametrize("df", [
+    pd.DataFrame({"y": [np.nan] * 10, "x": range(10), "s": list("abcdefghij")}),
+    pd.DataFrame({"y": pd.Series([], dtype=float), "x": pd.Series([], dtype=float)}),
+    pd.DataFrame({"y": pd.Series([None] * 10, dtype=object), "x": range(10)}),
+], ids=["all-missing", "no-rows", "all-missing-text"])
+def test_target_without_values_returns_empty_result_with_note(df):
+    result = leakage_scan(df, "y")
+    assert result["rows_used"] == 0
+    assert result["flagged"] == [] and result["top_associations"] == []
+    assert "non-missing target" in result["note"]
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from profiling.multifile import profile_shards, split_role
+
+
+@pytest.mark.parametrize(
+    "name, role",
+    [
+        ("train.csv", "train"),
+        ("data/valid.parquet", "val"),
+        ("kaggle_test.zip/data/train.csv", "train"),
+        ("train_test_split.zip/valid.csv", "val"),
+        ("archive.zip/test/part-0001.csv", "test"),
+        ("holdout.zip/part-0001.csv", "test"),
+        ("archive.zip/data/part-0001.csv", None),
+    ],
+)
+def test_split_role_prefers_the_member_over_the_archive(name, role):
+    assert split_role(name) == role
+
+
+def test_profile_shards_reports_rows_shared_between_splits(tmp_path):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"a": rng.integers(0, 1_000_000, 300), "b": rng.normal(size=300)})
+    shards = []
+    for name, part in [("train", df.iloc[:200]), ("test", pd.concat([df.iloc[200:], df.iloc[:10]]))]:
+        path = tmp_path / f"{name}.csv"
+        part.to_csv(path, index=False)
+        shards.append((f"kaggle_test.zip/{name}.csv", str(path)))
+    profile, _ = profile_shards(shards, max_workers=2)
+    assert profile["shape"][0] == 310
+    assert [s["split"] for s in profile["shards"]] == ["train", "test"]
+    overlap = {o["splits"]: o["rows"] for o in profile["split_overlap"]}
+    assert overlap["train ∩ test"] == 10
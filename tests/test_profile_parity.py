@@ -0,0 +1,61 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from profiling.chunked import profile_csv_chunked
+from profiling.progressive import iter_profile_groups
+
+CHUNK_ROWS = 700
+PARITY_KEYS = ("shape", "dtypes", "missing_pct", "dup_rows", "nunique", "semantic_types")
+
+
+def _csv_bytes() -> bytes:
+    rng = np.random.default_rng(0)
+    n = 3_000
+    df = pd.DataFrame({
+        "id": np.arange(n),
+        "age": rng.integers(18, 90, n).astype(float),
+        "score": rng.normal(size=n).round(3),
+        "city": rng.choice(["Paris", "Lima", "Oslo", "Pune"], n),
+        "label": rng.choice(["yes", "no"], n),  # text for pandas, BOOLEAN for DuckDB's sniffer
+        "signup": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, n), unit="D"),
+    })
+    df.loc[rng.random(n) < 0.1, "age"] = np.nan  # int-valued column that is float only where missing
+    df.loc[rng.random(n) < 0.05, "city"] = None
+    df.loc[2_500:, "age"] = 40.0  # a late chunk without missing values
+    df.loc[:9, "score"] = [-0.0, 0.0] * 5  # one distinct value for pandas and SQL
+    df = pd.concat([df, df.iloc[[3, 3, 1_200, 2_900]]], ignore_index=True)  # exact duplicate rows
+    return df.to_csv(index=False).encode("utf-8")
+
+
+def _in_memory_profile(data: bytes) -> dict:
+    profile = {}
+    for _, part in iter_profile_groups(pd.read_csv(io.BytesIO(data))):
+        profile.update(part)
+    return profile
+
+
+def _assert_same(a: dict, b: dict):
+    for key in PARITY_KEYS:
+        assert a[key] == b[key], key
+
+
+def test_chunked_profile_matches_in_memory_profile():
+    data = _csv_bytes()
+    chunked, _, _ = profile_csv_chunked(io.BytesIO(data), chunk_rows=CHUNK_ROWS)
+    _assert_same(chunked, _in_memory_profile(data))
+
+
+def test_duckdb_profile_matches_in_memory_profile():
+    pytest.importorskip("duckdb")
+    from profiling.duck import DuckDataset
+
+    data = _csv_bytes()
+    ds = DuckDataset(io.BytesIO(data), "csv")
+    try:
+        duck = ds.profile()
+    finally:
+        ds.close()
+    _assert_same(duck, _in_memory_profile(data))
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+from profiling.sampling import cluster_ratio_interval, sample_profile
+
+
+def _clustered_frame(seed, n_distinct=20_000):
+    """Mostly unique rows plus a few rows copied many times; returns (frame, true duplicate rows)."""
+    rng = np.random.default_rng(seed)
+    copies = np.where(rng.random(n_distinct) < 0.05, rng.geometric(0.05, n_distinct), 1)
+    b = rng.normal(size=n_distinct)
+    b[rng.random(n_distinct) < 0.1] = np.nan
+    base = pd.DataFrame({"a": rng.integers(0, 1 << 40, n_distinct), "b": b})
+    df = base.loc[base.index.repeat(copies)].sample(frac=1, random_state=seed).reset_index(drop=True)
+    return df, len(df) - n_distinct
+
+
+def _profile(df, sample_rows=2_000, chunk_rows=20_000):
+    chunks = (df.iloc[i:i + chunk_rows] for i in range(0, len(df), chunk_rows))
+    profile, _, _ = sample_profile(chunks, total_rows=len(df), sample_rows=sample_rows)
+    return profile
+
+
+def test_duplicate_interval_covers_truth_on_clustered_copies():
+    trials, covered = 40, 0
+    for seed in range(trials):
+        df, true_dups = _clustered_frame(seed)
+        lo, hi = _profile(df)["estimates"]["dup_rows_ci"]
+        covered += lo <= true_dups <= hi
+    assert covered >= 0.85 * trials
+
+
+def test_missing_interval_covers_truth_on_clustered_copies():
+    trials, covered = 40, 0
+    for seed in range(trials):
+        df, _ = _clustered_frame(seed)
+        lo, hi = _profile(df)["estimates"]["missing_pct_ci"]["b"]
+        covered += lo <= df["b"].isna().mean() * 100 <= hi
+    assert covered >= 0.85 * trials
+
+
+def test_low_cardinality_data_keeps_one_row_per_distinct_digest():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"a": rng.integers(0, 30, 400_000), "b": rng.integers(0, 30, 400_000)})
+    profile, _, prof = sample_profile([df.iloc[i:i + 50_000] for i in range(0, len(df), 50_000)], sample_rows=1_000)
+    assert len(prof._sample) == df.drop_duplicates().shape[0] <= 900
+    assert profile["estimates"]["exact_sample"]
+    assert profile["dup_rows"] == int(df.duplicated().sum())
+    assert len(prof.sample) == 1_000
+
+
+def test_unsaturated_sample_counts_duplicates_exactly():
+    df, true_dups = _clustered_frame(0, n_distinct=500)
+    profile = _profile(df, sample_rows=10_000)
+    assert profile["estimates"]["exact_sample"]
+    assert profile["dup_rows"] == true_dups
+    assert profile["estimates"]["dup_rows_ci"] == (true_dups, true_dups)
+
+
+def test_no_copies_in_sample_still_gives_a_positive_upper_bound():
+    copies = np.ones(1_000, dtype=np.int64)
+    rate, lo, hi = cluster_ratio_interval(copies - 1, copies)
+    assert rate == lo == 0.0
+    assert 0.0 < hi < 0.01
+
+
+def test_interval_widens_with_cluster_size():
+    # Same sampled-row duplicate share, but concentrated in one big cluster vs spread over many pairs.
+    spread = np.array([2] * 100 + [1] * 800)
+    lumped = np.array([101] + [1] * 899)
+    _, lo_s, hi_s = cluster_ratio_interval(spread - 1, spread)
+    _, lo_l, hi_l = cluster_ratio_interval(lumped - 1, lumped)
+    assert hi_l - lo_l > hi_s - lo_s
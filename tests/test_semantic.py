@@ -0,0 +1,42 @@
+import io
+
+import pandas as pd
+import pytest
+
+from profiling.semantic import classify_values, infer_semantic_types
+from profiling.sketches import is_numeric_dtype_name, value_hashes
+
+CSV = "amount,rate,flag,city,when\n1,1.5,true,Oslo,2024-01-01\n,2.5,false,Rome,2024-01-02\n3,,true,Oslo,2024-01-03\n"
+
+
+@pytest.mark.parametrize("name", ["int64", "float32", "Int64", "Float64", "int64[pyarrow]", "double[pyarrow]"])
+def test_numeric_dtype_names(name):
+    assert is_numeric_dtype_name(name)
+    assert is_numeric_dtype_name(pd.api.types.pandas_dtype(name))
+
+
+@pytest.mark.parametrize("name", ["bool", "boolean", "bool[pyarrow]", "object", "category", "string[pyarrow]", "datetime64[ns]", "mixed"])
+def test_non_numeric_dtype_names(name):
+    assert not is_numeric_dtype_name(name)
+
+
+@pytest.mark.parametrize("backend", [None, "numpy_nullable", "pyarrow"])
+def test_semantic_types_do_not_depend_on_the_dtype_backend(backend):
+    df = pd.read_csv(io.StringIO(CSV), **({"dtype_backend": backend} if backend else {}))
+    types = infer_semantic_types(df)
+    assert types["amount"] == "numeric" and types["rate"] == "numeric"
+    assert types["flag"] == "boolean"
+    assert types["when"] == "datetime"
+
+
+def test_numbers_stored_as_text_are_still_numeric_strings():
+    values = pd.Series(["$1,200", "$35", "$4,000.50"] * 10)
+    assert classify_values(values, "object") == "numeric_string"
+
+
+def test_boolean_hashes_match_across_backends():
+    hashes = [
+        value_hashes(pd.read_csv(io.StringIO(CSV), **kw)["flag"]).tolist()
+        for kw in ({}, {"dtype_backend": "numpy_nullable"}, {"dtype_backend": "pyarrow"})
+    ]
+    assert hashes[0] == hashes[1] == hashes[2]
@@ -0,0 +1,77 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from llm.providers import StubProvider
+from llm.singleflight import SingleFlight
+
+
+class SlowCountingStub(StubProvider):
+    def __init__(self, delay_s=0.3):
+        super().__init__()
+        self.delay_s = delay_s
+        self.calls = 0
+        self._count_lock = threading.Lock()
+
+    def generate(self, prompt, model, **kwargs):
+        with self._count_lock:
+            self.calls += 1
+        self._wait(self.delay_s, kwargs.get("timeout_s"))
+        return super().generate(prompt, model, **kwargs)
+
+
+def test_followers_share_the_leaders_result():
+    flights = SingleFlight()
+    call, leader = flights.begin("k", "plan")
+    follower_call, follower_leads = flights.begin("k")
+    assert leader and not follower_leads and follower_call is call
+    flights.finish("k", call, result="text")
+    assert flights.wait(follower_call, timeout=1) == "text"
+    assert flights.stats()["coalesced_total"] == 1
+    assert flights.stats()["waiters_by_key"] == {"plan": 1}
+    # Once finished the key is free again: the next caller leads a new call.
+    assert flights.begin("k")[1]
+
+
+def test_followers_get_the_leaders_error():
+    flights = SingleFlight()
+    call, _ = flights.begin("k")
+    follower, _ = flights.begin("k")
+    flights.finish("k", call, error=ValueError("boom"))
+    with pytest.raises(ValueError, match="boom"):
+        flights.wait(follower, timeout=1)
+
+
+def test_wait_times_out_while_the_leader_is_still_running():
+    flights = SingleFlight()
+    flights.begin("k")
+    follower, _ = flights.begin("k")
+    with pytest.raises(TimeoutError):
+        flights.wait(follower, timeout=0.01)
+
+
+def test_concurrent_identical_requests_make_one_upstream_call(stub_llm, monkeypatch):
+    monkeypatch.setenv("DRAFTWISE_CACHE", "0")  # only single-flight can deduplicate here
+    provider = SlowCountingStub()
+    monkeypatch.setattr(stub_llm, "_provider", provider)
+
+    with ThreadPoolExecutor(4) as pool:
+        texts = list(pool.map(lambda _: stub_llm.generate_text("Same prompt.", family="plan"), range(4)))
+
+    assert provider.calls == 1
+    assert len(set(texts)) == 1 and texts[0]
+    stats = stub_llm.flight_stats()
+    assert stats["coalesced_total"] == 3
+    assert stats["in_flight"] == 0
+
+
+def test_regenerate_does_not_join_a_cached_flight(stub_llm, monkeypatch):
+    monkeypatch.setenv("DRAFTWISE_CACHE", "0")
+    provider = SlowCountingStub()
+    monkeypatch.setattr(stub_llm, "_provider", provider)
+
+    with ThreadPoolExecutor(2) as pool:
+        list(pool.map(lambda use_cache: stub_llm.generate_text("Same prompt.", use_cache=use_cache), [True, False]))
+
+    assert provider.calls == 2
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from profiling.sketches import DistinctCounter, HyperLogLog, value_hashes
+
+
+def _hashes(n, seed=0):
+    return np.random.default_rng(seed).integers(0, 1 << 63, n).astype(np.uint64)
+
+
+def test_distinct_counter_stays_exact_below_its_budget_across_chunks():
+    h = _hashes(5_000)
+    d = DistinctCounter(exact_max=10_000)
+    for part in np.array_split(np.concatenate([h, h[:2_000]]), 7):
+        d.add_hashes(part)
+    assert not d.approximate
+    assert d.count() == 5_000
+    assert np.all(np.diff(d.exact.astype(np.float64)) > 0)
+
+
+def test_distinct_counter_switches_on_distinct_values_not_rows():
+    d = DistinctCounter(exact_max=100)
+    for _ in range(50):
+        d.add_hashes(np.arange(100, dtype=np.uint64))  # 5000 rows, 100 distinct
+    assert not d.approximate and d.count() == 100
+    d.add_hashes(np.array([1_000], dtype=np.uint64))
+    assert d.approximate
+
+
+def test_distinct_counter_merge_matches_single_pass():
+    a, b = DistinctCounter(exact_max=10_000), DistinctCounter(exact_max=10_000)
+    a.add_hashes(_hashes(3_000, seed=1))
+    b.add_hashes(_hashes(3_000, seed=2))
+    b.add_hashes(_hashes(1_000, seed=1))
+    assert a.merge(b).count() == 6_000
+
+
+@pytest.mark.parametrize("n", [10_000, 100_000, 1_000_000])
+def test_hyperloglog_error_is_within_three_standard_errors(n):
+    # Distinct string ids hashed the way the profilers hash cells, each value seen twice.
+    values = pd.Series(np.arange(n)).astype(str)
+    hll = HyperLogLog()
+    hll.add_hashes(value_hashes(pd.concat([values, values.iloc[::-1]])))
+    assert abs(hll.estimate() - n) / n <= 3 * 1.04 / np.sqrt(hll.m)
+
+
+@pytest.mark.parametrize("n", [10_000, 100_000, 1_000_000])
+def test_merged_hyperloglog_matches_the_error_bound_of_one_pass(n):
+    parts = np.array_split(value_hashes(pd.Series(np.arange(n, dtype=np.float64))), 5)
+    merged = HyperLogLog()
+    for part in parts:
+        sketch = HyperLogLog()
+        sketch.add_hashes(part)
+        merged.merge(sketch)
+    assert abs(merged.estimate() - n) / n <= 3 * merged.relative_error
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+from profiling.splits import plan_splits
+
+
+def _time_split(values, fractions=(0.7, 0.15, 0.15)):
+    labels, report = plan_splits([pd.DataFrame({"t": values, "i": np.arange(len(values))})], "time", fractions, "t")
+    return labels, report
+
+
+def test_time_split_without_ties_cuts_by_row_rank():
+    _, report = _time_split(np.arange(100))
+    assert report["rows"] == {"train": 70, "val": 15, "test": 15}
+    assert report["empty_splits"] == []
+
+
+def test_constant_time_column_stays_in_train_and_warns():
+    _, report = _time_split(np.full(100, 2020))
+    assert report["rows"] == {"train": 100, "val": 0, "test": 0}
+    assert report["empty_splits"] == ["val", "test"]
+
+
+def test_tied_timestamps_stay_together_in_the_earlier_split():
+    years = np.repeat([2019, 2020, 2021], [40, 30, 30])
+    labels, report = _time_split(years)
+    assert report["rows"] == {"train": 70, "val": 30, "test": 0}
+    assert report["empty_splits"] == ["test"]
+    for year in (2019, 2020, 2021):
+        assert len(np.unique(labels[years == year])) == 1
+
+
+def test_ties_never_straddle_a_cut():
+    rng = np.random.default_rng(0)
+    days = pd.Series(pd.to_datetime("2024-01-01") + pd.to_timedelta(rng.integers(0, 20, 1_000), unit="D"))
+    labels, report = _time_split(days.dt.strftime("%Y-%m-%d"))
+    for day in days.unique():
+        assert len(np.unique(labels[(days == day).to_numpy()])) == 1
+    ranges = report["time_ranges"]
+    assert ranges["train"][1] < ranges["val"][0] < ranges["test"][0]
+
+
+def test_stratified_split_keeps_class_proportions():
+    y = np.repeat(["a", "b"], [800, 200])
+    labels, report = plan_splits([pd.DataFrame({"y": y, "i": np.arange(1_000)})], "stratified", column="y")
+    assert report["rows"] == {"train": 700, "val": 150, "test": 150}
+    assert (labels[y == "b"] == 2).sum() == 30
+
+
+def test_continuous_target_is_stratified_on_quantile_bins():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"price": rng.normal(size=1_000), "x": np.arange(1_000)})
+    labels, report = plan_splits([df], "stratified", (70, 15, 15), "price")
+    assert report["rows"] == {"train": 700, "val": 150, "test": 150}
+    assert "quantile bins" in report["strata_note"]
+    # Each split spans the whole target range, not just its low or high end.
+    for i in range(3):
+        part = df["price"][labels == i]
+        assert part.min() < -1 and part.max() > 1
+
+
+def test_high_cardinality_text_target_falls_back_to_random_with_note():
+    df = pd.DataFrame({"name": [f"n{i}" for i in range(1_000)], "x": np.arange(1_000)})
+    _, report = plan_splits([df], "stratified", (70, 15, 15), "name")
+    assert report["rows"] == {"train": 700, "val": 150, "test": 150}
+    assert "random split" in report["strata_note"]
+
+
+def test_few_classes_stratify_on_values_without_note():
+    df = pd.DataFrame({"y": np.repeat([0, 1], [800, 200]), "x": np.arange(1_000)})
+    labels, report = plan_splits([df], "stratified", (70, 15, 15), "y")
+    assert report["strata_note"] is None
+    assert (df["y"][labels == 2] == 1).sum() == 30
@@ -0,0 +1,67 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from profiling.chunked import ChunkedProfiler
+from profiling.progressive import iter_profile_groups
+from profiling.stats import column_stats
+from profiling.target import target_analysis
+
+
+def _csv(n=2_000, seed=0):
+    rng = np.random.default_rng(seed)
+    y = rng.integers(0, 2, n)
+    df = pd.DataFrame({
+        "y": y,
+        "count": rng.integers(0, 100, n),
+        "score": np.round(rng.normal(size=n) + 2 * y, 3),
+        "city": rng.choice(["Oslo", "Rome", "Lima"], n),
+    })
+    df.loc[::7, "score"] = np.nan
+    return df.to_csv(index=False)
+
+
+@pytest.mark.parametrize("backend", ["numpy_nullable", "pyarrow"])
+def test_column_stats_match_numpy_backend(backend):
+    text = _csv()
+    expected = column_stats(pd.read_csv(io.StringIO(text)))
+    got = column_stats(pd.read_csv(io.StringIO(text), dtype_backend=backend))
+    for c in ("count", "score"):
+        assert got[c]["kind"] == "numeric"
+        assert {k: got[c][k] for k in ("count", "min", "max", "mean", "std", "q")} == {
+            k: expected[c][k] for k in ("count", "min", "max", "mean", "std", "q")
+        }
+        assert sum(got[c]["hist"]) == expected[c]["count"]
+    assert got["city"]["kind"] == "categorical"
+
+
+def test_pyarrow_frame_profiles_like_numpy_frame():
+    text = _csv()
+    profiles = []
+    for kw in ({}, {"dtype_backend": "pyarrow"}):
+        profile = {}
+        for _, part in iter_profile_groups(pd.read_csv(io.StringIO(text), **kw)):
+            profile.update(part)
+        profiles.append(profile)
+    numpy_profile, arrow_profile = profiles
+    assert arrow_profile["num_cols"] == numpy_profile["num_cols"] == ["y", "count", "score"]
+    assert arrow_profile["semantic_types"] == numpy_profile["semantic_types"]
+    assert arrow_profile["dup_rows"] == numpy_profile["dup_rows"]
+
+
+def test_chunked_profiler_on_pyarrow_chunks():
+    chunks = pd.read_csv(io.StringIO(_csv()), dtype_backend="pyarrow", chunksize=500)
+    prof = ChunkedProfiler()
+    for chunk in chunks:
+        prof.update(chunk)
+    result = prof.result()
+    assert result["column_stats"]["score"]["kind"] == "numeric"
+    assert "score" in result["num_cols"]
+
+
+def test_target_feature_summaries_on_pyarrow_frame():
+    df = pd.read_csv(io.StringIO(_csv()), dtype_backend="pyarrow")
+    features = {f["feature"] for f in target_analysis(df, "y")["feature_by_class"]}
+    assert {"count", "score"} <= features
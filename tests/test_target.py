@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from profiling.target import TargetProfiler, target_analysis
+
+
+def test_close_numeric_classes_stay_distinct():
+    df = pd.DataFrame({"y": [1_000_001, 1_000_002] * 50, "x": np.arange(100.0)})
+    result = target_analysis(df, "y")
+    assert result["n_classes"] == 2
+    assert {c["class"] for c in result["classes"]} == {"1000001", "1000002"}
+
+
+def test_regression_target_keeps_bounded_class_counts():
+    rng = np.random.default_rng(0)
+    prof = TargetProfiler("y")
+    for _ in range(20):
+        prof.update(pd.DataFrame({"y": rng.normal(size=5_000), "x": rng.normal(size=5_000)}))
+    assert prof.class_counts == {} and prof.per_class is None
+    result = prof.result()
+    assert result["task"] == "regression" and result["distribution"]["count"] == 100_000
+
+
+def test_separation_uses_within_class_std():
+    rng = np.random.default_rng(0)
+    y = np.repeat([0, 1], 20_000)
+    # Class means 0 and 4, within-class std 1: the overall std (~2.2) would give ~1.8.
+    df = pd.DataFrame({"y": y, "x": rng.normal(size=len(y)) + 4 * y})
+    sep = target_analysis(df, "y")["feature_by_class"][0]
+    assert sep["feature"] == "x" and abs(sep["separation"] - 4) < 0.1
+
+
+def test_chunked_merge_matches_one_pass():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({"y": rng.choice(["a", "b", "c"], 3_000), "x": rng.normal(size=3_000)})
+    df.loc[df["y"].eq("b") & (rng.random(3_000) < 0.4), "x"] = np.nan
+    left, right = TargetProfiler("y"), TargetProfiler("y")
+    left.update(df.iloc[:1_000])
+    right.update(df.iloc[1_000:])
+    assert left.merge(right).result() == target_analysis(df, "y")
+
+
+def test_target_without_values_returns_empty_result_with_note():
+    for df in (
+        pd.DataFrame({"y": [np.nan] * 10, "x": range(10)}),
+        pd.DataFrame({"y": pd.Series([], dtype=float), "x": pd.Series([], dtype=float)}),
+    ):
+        result = target_analysis(df, "y")
+        assert result["classes"] == [] and result["n_classes"] == 0
+        assert "non-missing target" in result["note"]
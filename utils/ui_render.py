@@ -1,4 +1,8 @@
+import sys
+import time
 import streamlit as st
+from typing import Iterable
+from core.jobs import get_job_manager, stream_generation
 
 def render_compact(markdown_text: str, details_title: str = "Show full details"):
     """
@@ -36,4 +40,187 @@ def render_compact(markdown_text: str, details_title: str = "Show full details")
     st.markdown(tldr_block)
 
     with st.expander(details_title, expanded=False):
-        st.markdown(remaining)
\ No newline at end of file
+        st.markdown(remaining)
+
+
+def render_stream(chunks: Iterable[str], cursor: str = " ▌") -> str:
+    """
+    Writes partial markdown into the page while chunks arrive and returns the final
+    stripped text (same value the blocking generate_text would have returned).
+    The placeholder is cleared at the end; callers render the stored result as usual.
+    """
+    box = st.empty()
+    text = ""
+    for chunk in chunks:
+        text += chunk
+        box.markdown(text + cursor)
+    box.empty()
+    return text.strip()
+
+
+# -----------------------------
+# Inputs that survive tab switches
+# -----------------------------
+# Only the active workspace tab renders, and Streamlit drops the state of widgets that are not
+# rendered in a run, so inputs are mirrored into session state and restored when their tab reopens.
+def _remember(key: str) -> None:
+    st.session_state.setdefault("kept_widgets", {})[key] = st.session_state[key]
+
+
+def keep(key: str, options=None, **initial) -> dict:
+    """
+    Widget kwargs (key, on_change and the initial value) that restore the widget's last value when
+    its tab is shown again. Pass the usual initial value as value=, default=, or index= with options=.
+    """
+    (name, value), = initial.items()
+    kept = st.session_state.get("kept_widgets", {})
+    if key in kept:
+        if name != "index":
+            value = kept[key]
+        elif kept[key] in options:
+            value = list(options).index(kept[key])
+    return {"key": key, "on_change": _remember, "args": (key,), name: value}
+
+
+def kept_uploader(label: str, key: str, **kwargs):
+    """
+    st.file_uploader whose file(s) stay available after switching tabs: the uploader comes back
+    empty, so the last upload is returned (with a note) until the user uploads another or clears it.
+    """
+    store = st.session_state.setdefault("kept_uploads", {})
+    # The widget's key only survives in session state while the widget keeps being rendered.
+    rendered_before = key in st.session_state
+    value = st.file_uploader(label, key=key, **kwargs)
+    if value:
+        store[key] = value
+        st.session_state.pop(f"{key}_restored", None)
+        return value
+    if key not in store:
+        return value
+    if rendered_before and not st.session_state.get(f"{key}_restored"):
+        store.pop(key)  # the user removed the file from the uploader
+        return value
+    st.session_state[f"{key}_restored"] = True
+    files = store[key] if isinstance(store[key], list) else [store[key]]
+    c1, c2 = st.columns([4, 1])
+    with c1:
+        st.caption("Using the earlier upload: " + ", ".join(f.name for f in files))
+    with c2:
+        if st.button("Clear", key=f"{key}_clear", use_container_width=True):
+            store.pop(key)
+            st.session_state.pop(f"{key}_restored", None)
+            st.rerun()
+    return store[key]
+
+
+# -----------------------------
+# Background jobs (survive reruns)
+# -----------------------------
+def start_job(slot: str, fn, label: str, meta: dict = None) -> str:
+    """
+    Submits fn(job) to the process-wide worker pool and remembers the job id under `slot`
+    in session state. A job already running in the same slot is cancelled first.
+    """
+    jobs = st.session_state.setdefault("jobs", {})
+    manager = get_job_manager()
+    if jobs.get(slot):
+        manager.cancel(jobs[slot])
+    jobs[slot] = manager.submit(fn, label=label, meta=meta)
+    return jobs[slot]
+
+
+def start_generation_job(slot: str, prompt: str, label: str, family: str, use_cache: bool = True, meta: dict = None) -> str:
+    # Tag the call log with the page module that asked for it, not the worker thread.
+    module = sys._getframe(1).f_globals.get("__name__", "?")
+    return start_job(
+        slot,
+        lambda job: stream_generation(job, prompt, family=family, module=module, use_cache=use_cache),
+        label=label,
+        meta=meta,
+    )
+
+
+def poll_job(slot: str, on_done) -> bool:
+    """
+    Call on every run where `slot` may have work. While the job runs, shows a live panel that
+    refreshes itself without blocking the rest of the page and returns True.
+    When it has finished, calls on_done(result, meta) once in the script thread (so results land
+    in st.session_state.artifacts), reports errors/cancellation, and returns False.
+    """
+    jobs = st.session_state.setdefault("jobs", {})
+    job_id = jobs.get(slot)
+    manager = get_job_manager()
+    job = manager.get(job_id) if job_id else None
+    if job is None:
+        jobs.pop(slot, None)
+        _show_notices(slot)
+        return False
+
+    handlers = st.session_state.setdefault("job_handlers", {})
+    if job.done:
+        jobs.pop(slot, None)
+        handlers.pop(slot, None)
+        manager.pop(job_id)
+        if job.status == "done":
+            on_done(job.result, job.meta)
+        elif job.status == "error":
+            st.error(f"AI request failed: {job.error}")
+        else:
+            st.info(f"{job.label} cancelled.")
+        _show_notices(slot)
+        return False
+
+    # Remembered so collect_finished_jobs() can store the result while another tab is open.
+    handlers[slot] = on_done
+    _job_panel(job_id)
+    return True
+
+
+def job_notice(slot: str, kind: str, text: str) -> None:
+    """
+    Queues an st.<kind>(text) message from an on_done handler; poll_job(slot) shows it, so the
+    message lands in the tab that owns the job even when collect_finished_jobs() stored the result.
+    """
+    st.session_state.setdefault("job_notices", {}).setdefault(slot, []).append((kind, text))
+
+
+def _show_notices(slot: str) -> None:
+    for kind, text in st.session_state.setdefault("job_notices", {}).pop(slot, []):
+        getattr(st, kind)(text)
+
+
+def collect_finished_jobs() -> None:
+    """
+    Hands every successfully finished job to the on_done its tab registered in poll_job(), whichever
+    tab is active, so artifacts (sidebar progress, Writing Studio context) never wait for the user to
+    reopen the tab that started it. Errors and cancellations are left for that tab's poll_job() to report.
+    """
+    jobs = st.session_state.setdefault("jobs", {})
+    handlers = st.session_state.setdefault("job_handlers", {})
+    manager = get_job_manager()
+    for slot, job_id in list(jobs.items()):
+        job = manager.get(job_id)
+        if job is None or job.status != "done" or slot not in handlers:
+            continue
+        jobs.pop(slot, None)
+        on_done = handlers.pop(slot)
+        manager.pop(job_id)
+        on_done(job.result, job.meta)
+
+
+@st.fragment(run_every=1.0)
+def _job_panel(job_id: str):
+    job = get_job_manager().get(job_id)
+    if job is None or job.done:
+        # Full rerun so poll_job() can hand the result to the page.
+        st.rerun()
+    with st.container(border=True):
+        c1, c2 = st.columns([4, 1])
+        with c1:
+            st.caption(f"⏳ {job.label}… ({job.status}, {int(time.time() - job.created)} s)")
+        with c2:
+            if st.button("Cancel", key=f"cancel_job_{job_id}", use_container_width=True):
+                get_job_manager().cancel(job_id)
+                st.rerun()
+        if job.partial:
+            st.markdown(job.partial + " ▌")